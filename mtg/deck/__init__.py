@@ -8,26 +8,30 @@
 
 """
 import contextlib
-import itertools
+import contextvars
+import hashlib
 import logging
 import re
 from abc import ABC, abstractmethod
 from collections import Counter
+from dataclasses import dataclass
 from enum import Enum, auto
-from functools import cached_property
+from functools import cached_property, lru_cache
 from operator import attrgetter, itemgetter
-from typing import Any, Iterable, Iterator, Self
+from types import TracebackType
+from typing import Any, Callable, Iterable, Iterator, Self, Type
+
+import numpy as np
 
 from mtg import Json
 from mtg.scryfall import (
-    COMMANDER_FORMATS, Card, Color,
-    MULTIFACE_SEPARATOR as SCRYFALL_MULTIFACE_SEPARATOR, aggregate,
-    all_formats, find_by_cardmarket_id, find_by_collector_number,
-    find_by_mtgo_id, find_by_name, find_by_oracle_id,
-    find_by_scryfall_id, find_by_tcgplayer_id, find_sets,
-    query_api_for_card)
+    ARENA_FORMATS, COLOR_BITS, COMMANDER_FORMATS, Card, Color,
+    MULTIFACE_SEPARATOR as SCRYFALL_MULTIFACE_SEPARATOR, Rarity,
+    alchemy_rebalances, all_formats, arena_cards, card_columns, deck_legal_formats, find_by_cardmarket_id,
+    find_by_collector_number, find_by_mtgo_id, find_by_name, find_by_oracle_id,
+    find_by_scryfall_id, find_by_tcgplayer_id, prefetch_card_names, query_api_for_card, set_index)
 from mtg.utils import ParsingError, from_iterable, getid, getrepr, remove_furigana, type_checker
-from mtg.utils.json import to_json
+from mtg.utils.json import json_digest, to_json
 from mtg.utils.scrape import get_netloc_domain
 
 _log = logging.getLogger(__name__)
@@ -377,25 +381,228 @@ def sanitize_deck_source(src: str) -> str:
 # this means some more complicated formats like Oathbreaker are not fully supported (e.g a Deck
 # knows nothing about signature spells) to not over-complicate things (by either going into an
 # inheritance hierarchy or bloating the generic API beyond comprehension)
+Playset = tuple[Card, int]
+
+
+def to_playsets(cards: Iterable[Card]) -> tuple[Playset, ...]:
+    """Collapse ``cards`` into name-sorted (card, quantity) pairs.
+    """
+    return tuple(sorted(Counter(cards).items(), key=lambda p: p[0].name))
+
+
+def from_playsets(playsets: Iterable[Playset]) -> list[Card]:
+    """Expand (card, quantity) pairs back into a flat list of cards.
+    """
+    return [card for card, qty in playsets for _ in range(qty)]
+
+
+DECK_TYPES = (
+    "artifact", "battle", "creature", "enchantment", "instant", "land", "planeswalker", "sorcery")
+
+
+@dataclass(frozen=True)
+class DeckStats:
+    """Statistics of a deck as counts of card copies per value of the most important card
+    attributes.
+    """
+    size: int
+    types: Counter  # see: DECK_TYPES
+    rarities: Counter  # Rarity members
+    cmc_histogram: Counter  # mana values rounded up (as by Card.cmc), 0 stands for none
+    total_price: float
+    priced_count: int
+    total_price_tix: float
+    priced_tix_count: int
+    races: Counter
+    classes: Counter
+    colors: Counter  # Color members
+    color_identities: Counter  # Color members
+
+    @property
+    def avg_cmc(self) -> float:
+        count = sum(qty for cmc, qty in self.cmc_histogram.items() if cmc)
+        if not count:
+            return 0
+        return sum(cmc * qty for cmc, qty in self.cmc_histogram.items()) / count
+
+    @property
+    def total_rarity_weight(self) -> float:
+        return sum(rarity.weight * qty for rarity, qty in self.rarities.items())
+
+    @property
+    def avg_rarity_weight(self) -> float:
+        return self.total_rarity_weight / self.size
+
+    @property
+    def avg_price(self) -> float | None:
+        return self.total_price / self.priced_count if self.priced_count else None
+
+    @property
+    def avg_price_tix(self) -> float | None:
+        return self.total_price_tix / self.priced_tix_count if self.priced_tix_count else None
+
+    @property
+    def color(self) -> Color:
+        return Color.from_letters(*{l for color in self.colors for l in color.value})
+
+    @property
+    def color_identity(self) -> Color:
+        return Color.from_letters(*{l for color in self.color_identities for l in color.value})
+
+    @classmethod
+    def from_playsets(cls, playsets: Iterable[Playset]) -> Self:
+        """Compute statistics in a single pass over ``playsets``.
+        """
+        size, types, rarities, cmc_histogram = 0, Counter(), Counter(), Counter()
+        total_price, priced_count, total_price_tix, priced_tix_count = 0.0, 0, 0.0, 0
+        colors, color_identities = Counter(), Counter()
+        for card, qty in playsets:
+            size += qty
+            for type_ in DECK_TYPES:
+                if getattr(card, f"is_{type_}"):
+                    types[type_] += qty
+            rarities[card.rarity] += qty
+            cmc_histogram[card.cmc or 0] += qty  # keep in line with deck_stats()
+            if card.price:
+                total_price += card.price * qty
+                priced_count += qty
+            if card.price_tix:
+                total_price_tix += card.price_tix * qty
+                priced_tix_count += qty
+            colors[card.color] += qty
+            color_identities[card.color_identity] += qty
+        races, classes = cls._count_subtypes(playsets)
+        return cls(
+            size, types, rarities, cmc_histogram, total_price, priced_count, total_price_tix,
+            priced_tix_count, races, classes, colors, color_identities)
+
+    @staticmethod
+    def _count_subtypes(playsets: Iterable[Playset]) -> tuple[Counter, Counter]:
+        races, classes = Counter(), Counter()
+        for card, qty in playsets:
+            for race in card.races:
+                races[race] += qty
+            for class_ in card.classes:
+                classes[class_] += qty
+        return races, classes
+
+
+def _color_from_bits(bits: int) -> Color:
+    return Color.from_letters(*[l for l, bit in COLOR_BITS.items() if bits & bit])
+
+
+def _counters(matrix: np.ndarray, labels: list) -> list[Counter]:
+    return [
+        Counter({labels[col]: int(row[col]) for col in np.flatnonzero(row)}) for row in matrix]
+
+
+def deck_stats(decks: Iterable["Deck"]) -> list[DeckStats]:
+    """Compute statistics of ``decks`` in one batch vectorized against the columnar card store.
+
+    Races and classes aren't part of the store and are still counted per playset. Decks with
+    cards unknown to the store are computed the regular way. The results are cached on the decks
+    (as their ``stats``).
+    """
+    decks, columns = [*decks], card_columns()
+    rows, qtys, owners, fallback = [], [], [], set()
+    for i, deck in enumerate(decks):
+        deck_rows = [columns.row(card) for card, _ in deck.playsets]
+        if any(row is None for row in deck_rows):
+            fallback.add(i)
+            continue
+        rows += deck_rows
+        qtys += [qty for _, qty in deck.playsets]
+        owners += [i] * len(deck_rows)
+
+    rows = np.array(rows, dtype=np.int64)
+    qtys, owners, n = np.array(qtys, dtype=np.int64), np.array(owners, dtype=np.int64), len(decks)
+
+    def tally(codes: np.ndarray, size: int) -> np.ndarray:
+        matrix = np.zeros((n, size), dtype=np.int64)
+        np.add.at(matrix, (owners, codes), qtys)
+        return matrix
+
+    def total(values: np.ndarray) -> np.ndarray:
+        return np.bincount(owners, weights=values * qtys, minlength=n)
+
+    sizes = np.bincount(owners, weights=qtys, minlength=n).astype(np.int64)
+    types = np.stack([columns.has_any_type(t)[rows] for t in DECK_TYPES], axis=1)
+    type_counts = np.zeros((n, len(DECK_TYPES)), dtype=np.int64)
+    np.add.at(type_counts, owners, types * qtys[:, None])
+    rarities = tally(columns["rarity"][rows].astype(np.int64), len(columns.vocabs["rarity"]))
+    # the store keeps raw mana values, these get rounded up the way Card.cmc does it
+    cmcs = np.ceil(np.nan_to_num(columns["cmc"][rows])).astype(np.int64)
+    cmc_histogram = tally(cmcs, int(cmcs.max(initial=0)) + 1)
+    # prices are stored in single precision, hence rounding back to cents
+    prices = np.round(np.nan_to_num(columns["price"][rows]).astype(np.float64), 2)
+    prices_tix = np.round(np.nan_to_num(columns["price_tix"][rows]).astype(np.float64), 2)
+    total_prices, priced_counts = total(prices), total(prices != 0)
+    total_prices_tix, priced_tix_counts = total(prices_tix), total(prices_tix != 0)
+    color_bits = range(1 << len(COLOR_BITS))
+    colors = tally(columns["colors"][rows].astype(np.int64), len(color_bits))
+    identities = tally(columns["color_identity"][rows].astype(np.int64), len(color_bits))
+
+    rarity_labels = [Rarity(r) for r in columns.vocabs["rarity"]]
+    color_labels = [_color_from_bits(bits) for bits in color_bits]
+    type_counters = _counters(type_counts, [*DECK_TYPES])
+    rarity_counters = _counters(rarities, rarity_labels)
+    cmc_counters = _counters(cmc_histogram, [*range(cmc_histogram.shape[1])])
+    color_counters = _counters(colors, color_labels)
+    identity_counters = _counters(identities, color_labels)
+    results = []
+    for i, deck in enumerate(decks):
+        if i in fallback:
+            stats = DeckStats.from_playsets(deck.playsets)
+        else:
+            races, classes = DeckStats._count_subtypes(deck.playsets)
+            stats = DeckStats(
+                int(sizes[i]), type_counters[i], rarity_counters[i], cmc_counters[i],
+                float(total_prices[i]), int(priced_counts[i]), float(total_prices_tix[i]),
+                int(priced_tix_counts[i]), races, classes, color_counters[i],
+                identity_counters[i])
+        deck.__dict__["stats"] = stats  # prime the cached property
+        results.append(stats)
+    return results
+
+
 class Deck:
     """A deck of Magic: the Gathering cards suitable for Constructed formats.
+
+    Maindeck and sideboard are kept as name-sorted (card, quantity) playsets. The flat card lists
+    exposed by ``maindeck``, ``sideboard`` and ``cards`` are built on demand from them.
     """
     MIN_MAINDECK_SIZE = 60
     MAX_SIDEBOARD_SIZE = 15
     MIN_AGGRO_CMC = 2.3  # arbitrary
     MAX_CONTROL_CREATURES_COUNT = 10  # arbitrary
 
+    @property
+    def maindeck_playsets(self) -> tuple[Playset, ...]:
+        return self._maindeck_playsets
+
+    @property
+    def sideboard_playsets(self) -> tuple[Playset, ...]:
+        return self._sideboard_playsets
+
     @property
     def maindeck(self) -> list[Card]:
-        return self._maindeck
+        return from_playsets(self._maindeck_playsets)
 
     @property
     def sideboard(self) -> list[Card]:
-        return self._sideboard
+        return from_playsets(self._sideboard_playsets)
+
+    @property
+    def maindeck_size(self) -> int:
+        return sum(qty for _, qty in self._maindeck_playsets)
+
+    @property
+    def sideboard_size(self) -> int:
+        return sum(qty for _, qty in self._sideboard_playsets)
 
     @property
     def has_sideboard(self) -> bool:
-        return bool(self.sideboard)
+        return bool(self._sideboard_playsets)
 
     @property
     def commander(self) -> Card | None:
@@ -409,117 +616,141 @@ class Deck:
     def companion(self) -> Card | None:
         return self._companion
 
+    @property
+    def commanders(self) -> list[Card]:
+        return [c for c in (self.commander, self.partner_commander) if c]
+
+    @property
+    def playsets(self) -> list[Playset]:
+        """Return (card, quantity) pairs of commanders, maindeck and sideboard (in that order).
+        """
+        return [
+            *((c, 1) for c in self.commanders), *self._maindeck_playsets,
+            *self._sideboard_playsets]
+
     @property
     def cards(self) -> list[Card]:
-        commanders = [self.commander] if self.commander else []
-        if self.partner_commander:
-            commanders.append(self.partner_commander)
-        return [*commanders, *self.maindeck, *self.sideboard]
+        return from_playsets(self.playsets)
+
+    @cached_property
+    def stats(self) -> DeckStats:
+        """Return statistics of this deck computed lazily in a single pass over its playsets.
+        """
+        return DeckStats.from_playsets(self.playsets)
 
     @property
     def color(self) -> Color:
-        return Color.from_cards(*self.cards)
+        return self.stats.color
 
     @property
     def color_identity(self) -> Color:
-        return Color.from_cards(*self.cards, identity=True)
+        return self.stats.color_identity
+
+    def _typed(self, type_: str) -> list[Card]:
+        if not self.stats.types[type_]:
+            return []
+        return from_playsets((c, qty) for c, qty in self.playsets if getattr(c, f"is_{type_}"))
+
+    def _of_rarity(self, rarity: Rarity) -> list[Card]:
+        if not self.stats.rarities[rarity]:
+            return []
+        return from_playsets((c, qty) for c, qty in self.playsets if c.rarity is rarity)
 
     @property
     def artifacts(self) -> list[Card]:
-        return [card for card in self.cards if card.is_artifact]
+        return self._typed("artifact")
 
     @property
     def battles(self) -> list[Card]:
-        return [card for card in self.cards if card.is_battle]
+        return self._typed("battle")
 
     @property
     def creatures(self) -> list[Card]:
-        return [card for card in self.cards if card.is_creature]
+        return self._typed("creature")
 
     @property
     def enchantments(self) -> list[Card]:
-        return [card for card in self.cards if card.is_enchantment]
+        return self._typed("enchantment")
 
     @property
     def instants(self) -> list[Card]:
-        return [card for card in self.cards if card.is_instant]
+        return self._typed("instant")
 
     @property
     def lands(self) -> list[Card]:
-        return [card for card in self.cards if card.is_land]
+        return self._typed("land")
 
     @property
     def planeswalkers(self) -> list[Card]:
-        return [card for card in self.cards if card.is_planeswalker]
+        return self._typed("planeswalker")
 
     @property
     def sorceries(self) -> list[Card]:
-        return [card for card in self.cards if card.is_sorcery]
+        return self._typed("sorcery")
 
     @property
     def commons(self) -> list[Card]:
-        return [card for card in self.cards if card.is_common]
+        return self._of_rarity(Rarity.COMMON)
 
     @property
     def uncommons(self) -> list[Card]:
-        return [card for card in self.cards if card.is_uncommon]
+        return self._of_rarity(Rarity.UNCOMMON)
 
     @property
     def rares(self) -> list[Card]:
-        return [card for card in self.cards if card.is_rare]
+        return self._of_rarity(Rarity.RARE)
 
     @property
     def mythics(self) -> list[Card]:
-        return [card for card in self.cards if card.is_mythic]
+        return self._of_rarity(Rarity.MYTHIC)
 
     @property
     def total_rarity_weight(self) -> float:
-        return sum(card.rarity.weight for card in self.cards)
+        return self.stats.total_rarity_weight
 
     @property
     def avg_rarity_weight(self):
-        return self.total_rarity_weight / len(self.cards)
+        return self.stats.avg_rarity_weight
 
     @property
     def avg_cmc(self) -> float:
-        manas = [card.cmc for card in self.cards if card.cmc]
-        if not manas:
-            return 0
-        return sum(manas) / len(manas)
+        return self.stats.avg_cmc
 
     @property
     def total_price(self) -> float:
-        return sum(c.price for c in self.cards if c.price)
+        return self.stats.total_price
 
     @property
     def avg_price(self) -> float | None:
-        cards = [card for card in self.cards if card.price]
-        return self.total_price / len(cards) if cards else None
+        return self.stats.avg_price
 
     @property
     def total_price_tix(self) -> float:
-        return sum(c.price_tix for c in self.cards if c.price_tix)
+        return self.stats.total_price_tix
 
     @property
     def avg_price_tix(self) -> float | None:
-        cards = [card for card in self.cards if card.price_tix]
-        return self.total_price_tix / len(cards) if cards else None
+        return self.stats.avg_price_tix
 
     @property
     def sets(self) -> list[str]:
         return sorted({c.set for c in self.cards if not c.is_basic_land})
 
+    @property
+    def legal_formats(self) -> list[str]:
+        return deck_legal_formats(self.cards)
+
     @property
     def races(self) -> Counter:
-        return Counter(itertools.chain(*[c.races for c in self.cards]))
+        return self.stats.races
 
     @property
     def classes(self) -> Counter:
-        return Counter(itertools.chain(*[c.classes for c in self.cards]))
+        return self.stats.classes
 
     @property
     def is_bo3(self) -> bool:
-        return self.has_sideboard and len(self.sideboard) > 7
+        return self.sideboard_size > 7
 
     @property
     def is_bo1(self) -> bool:
@@ -563,7 +794,7 @@ class Deck:
         if self.avg_cmc < self.MIN_AGGRO_CMC:
             return Archetype.AGGRO
         else:
-            if len(self.creatures) < self.MAX_CONTROL_CREATURES_COUNT:
+            if self.stats.types["creature"] < self.MAX_CONTROL_CREATURES_COUNT:
                 return Archetype.CONTROL
             return Archetype.MIDRANGE
 
@@ -598,11 +829,8 @@ class Deck:
     @cached_property
     def latest_set(self) -> str | None:
         set_codes = {c.set for c in self.cards if not c.is_basic_land}
-        sets = find_sets(lambda s: s.code in set_codes and s.is_expansion)
-        if not sets:
-            return None
-        sets = sorted(sets, key=attrgetter("released_at"))
-        return [s.code for s in sets][-1]
+        latest = set_index().latest(*set_codes, predicate=attrgetter("is_expansion"))
+        return latest.code if latest else None
 
     @classmethod
     def url_to_source(cls, url: str | None) -> str:
@@ -650,53 +878,53 @@ class Deck:
         self._metadata = metadata or {}
 
         self._max_playset_count = 1 if commander is not None else 4
-        playsets = aggregate(*maindeck)
-        for playset in playsets.values():
-            self._validate_playset(playset)
-        self._maindeck = [*itertools.chain(
-            *sorted(playsets.values(), key=lambda l: l[0].name))]
+        self._maindeck_playsets = to_playsets(maindeck)
+        for card, qty in self._maindeck_playsets:
+            self._validate_playset(card, qty)
 
-        if (len(self.maindeck) + len(commanders)) < self.MIN_MAINDECK_SIZE:
+        if (self.maindeck_size + len(commanders)) < self.MIN_MAINDECK_SIZE:
             raise InvalidDeck(
-                f"Invalid deck size: {len(self.maindeck) + len(commanders)} "
+                f"Invalid deck size: {self.maindeck_size + len(commanders)} "
                 f"< {self.MIN_MAINDECK_SIZE}")
 
-        self._sideboard = []
+        self._sideboard_playsets = ()
         if sideboard:
             if not self.companion:
                 if comp := from_iterable(sideboard, lambda c: c.is_companion):
                     self._companion = comp
-            sideboard_playsets = aggregate(*sideboard)
-            self._sideboard = [*itertools.chain(
-                *sorted(sideboard_playsets.values(), key=lambda l: l[0].name))]
-            if len(self.sideboard) > self.MAX_SIDEBOARD_SIZE:
+            self._sideboard_playsets = to_playsets(sideboard)
+            if self.sideboard_size > self.MAX_SIDEBOARD_SIZE:
                 self._cut_sideboard(sideboard)
-            temp_playsets = aggregate(*self.cards)
-            for playset in temp_playsets.values():
-                self._validate_playset(playset)
+            totals = Counter(dict(self._maindeck_playsets))
+            for card, qty in self._sideboard_playsets:
+                totals[card] += qty
+            for cmd in commanders:
+                totals[cmd] += 1
+            for card, qty in totals.items():
+                self._validate_playset(card, qty)
+
+        self._cards_digest = self._digest_cards()
+        self._fingerprint: str | None = None
 
     def _cut_sideboard(self, input_sideboard: list[Card]) -> None:
         _log.warning(
-            f"Oversized sideboard ({len(self.sideboard)}) cut down to regular size "
+            f"Oversized sideboard ({self.sideboard_size}) cut down to regular size "
             f"({self.MAX_SIDEBOARD_SIZE})")
         sideboard = input_sideboard[:self.MAX_SIDEBOARD_SIZE]
         if self.companion and self.companion not in sideboard:
             sideboard[-1] = self.companion
-        sideboard_playsets = aggregate(*sideboard)
-        self._sideboard = [*itertools.chain(
-            *sorted(sideboard_playsets.values(), key=lambda l: l[0].name))]
+        self._sideboard_playsets = to_playsets(sideboard)
 
-    def _validate_playset(self, playset: list[Card]) -> None:
-        card = playset[0]
+    def _validate_playset(self, card: Card, quantity: int) -> None:
         if card.is_basic_land or card.allowed_multiples is Ellipsis:
             pass
         else:
             max_playset = self._max_playset_count if card.allowed_multiples is None \
                 else card.allowed_multiples
-            if len(playset) > max_playset:
+            if quantity > max_playset:
                 raise InvalidDeck(
                     f"Too many occurrences of {card.name!r}: "
-                    f"{len(playset)} > {max_playset}")
+                    f"{quantity} > {max_playset}")
 
     def __repr__(self) -> str:
         reprs = [("name", self.name)] if self.name else []
@@ -710,15 +938,16 @@ class Deck:
         ]
         if self.avg_price:
             reprs += [("avg_price", f"${self.avg_price:.2f}")]
+        types = self.stats.types
         reprs += [
-            ("artifacts", len(self.artifacts)),
-            ("battles", len(self.battles)),
-            ("creatures", len(self.creatures)),
-            ("enchantments", len(self.enchantments)),
-            ("instants", len(self.instants)),
-            ("lands", len(self.lands)),
-            ("planeswalkers", len(self.planeswalkers)),
-            ("sorceries", len(self.sorceries)),
+            ("artifacts", types["artifact"]),
+            ("battles", types["battle"]),
+            ("creatures", types["creature"]),
+            ("enchantments", types["enchantment"]),
+            ("instants", types["instant"]),
+            ("lands", types["land"]),
+            ("planeswalkers", types["planeswalker"]),
+            ("sorceries", types["sorcery"]),
         ]
         if self.commander:
             reprs.append(("commander", str(self.commander)))
@@ -726,13 +955,38 @@ class Deck:
             reprs.append(("companion", str(self.companion)))
         return getrepr(self.__class__, *reprs)
 
+    def _digest_cards(self) -> str:
+        sections = [
+            ("commander", [(c, 1) for c in self.commanders]),
+            ("companion", [(self.companion, 1)] if self.companion else []),
+            ("maindeck", self._maindeck_playsets),
+            ("sideboard", self._sideboard_playsets),
+        ]
+        hash_ = hashlib.blake2b(digest_size=16)
+        for section, playsets in sections:
+            for card_id, qty in sorted((card.id, qty) for card, qty in playsets):
+                hash_.update(f"{section}:{card_id}:{qty};".encode("utf-8"))
+        return hash_.hexdigest()
+
+    @property
+    def fingerprint(self) -> str:
+        """Return a canonical fingerprint of this deck.
+
+        It's a digest of cards (as sorted card ID, quantity and section triples) computed on
+        construction, combined with a digest of metadata computed on first use (and recomputed
+        after metadata update).
+        """
+        if self._fingerprint is None:
+            self._fingerprint = f"{self._cards_digest}-{json_digest(self.metadata)}"
+        return self._fingerprint
+
     def __eq__(self, other: Self) -> bool:
         if not isinstance(other, Deck):
             return False
-        return self.json == other.json
+        return self.fingerprint == other.fingerprint
 
     def __hash__(self) -> int:
-        return hash(self.json)
+        return hash(self.fingerprint)
 
     def __lt__(self, other: Self) -> bool:
         if not isinstance(other, Deck):
@@ -744,14 +998,14 @@ class Deck:
 
     def update_metadata(self, **data: Any) -> None:
         self._metadata.update(data)
+        self._fingerprint = None
 
     @staticmethod
-    def _to_playset_line(playset: list[Card], extended=False) -> str:
-        card = playset[0]
+    def _to_playset_line(card: Card, quantity=1, extended=False) -> str:
         card_name = card.name.replace(
             SCRYFALL_MULTIFACE_SEPARATOR,
             ARENA_MULTIFACE_SEPARATOR) if card.is_multifaced else card.name
-        line = f"{len(playset)} {card_name}"
+        line = f"{quantity} {card_name}"
         if extended:
             line += f" ({card.set.upper()}) {card.collector_number}"
         return line
@@ -761,32 +1015,22 @@ class Deck:
         if about and self.metadata.get("name"):
             lines += ["About", f'Name {self.metadata["name"]}', ""]
         if self.commander:
-            playset = aggregate(self.commander)[self.commander]
-            lines += ["Commander", self._to_playset_line(playset, extended=extended)]
-            if self.partner_commander:
-                playset = aggregate(self.partner_commander)[self.partner_commander]
-                lines += [self._to_playset_line(playset, extended=extended)]
-            lines += [""]
+            lines += [
+                "Commander",
+                *[self._to_playset_line(c, extended=extended) for c in self.commanders], ""]
         if self.companion:
-            playset = aggregate(self.companion)[self.companion]
-            lines += ["Companion", self._to_playset_line(playset, extended=extended), ""]
-        deck_playsets = sorted(
-            (playset for playset in aggregate(*self.maindeck).values()),
-            key=lambda l: l[0].name)
+            lines += ["Companion", self._to_playset_line(self.companion, extended=extended), ""]
         lines += [
             "Deck",
-            *[self._to_playset_line(playset, extended=extended) for playset
-              in deck_playsets]
+            *[self._to_playset_line(card, qty, extended=extended) for card, qty
+              in self._maindeck_playsets]
         ]
-        if self.sideboard:
-            side_playsets = sorted(
-                (playset for playset in aggregate(*self.sideboard).values()),
-                key=lambda l: l[0].name)
+        if self._sideboard_playsets:
             lines += [
                 "",
                 "Sideboard",
-                *[self._to_playset_line(playset, extended=extended) for playset
-                  in side_playsets]
+                *[self._to_playset_line(card, qty, extended=extended) for card, qty
+                  in self._sideboard_playsets]
             ]
         return "\n".join(lines)
 
@@ -886,6 +1130,161 @@ class CardNotFound(ParsingError):
     """
 
 
+# (name, (set code, collector number), Scryfall ID, Oracle ID, TCGPlayer ID, Cardmarket ID,
+# MTGO ID, foreign flag) as passed to `DeckParser.find_card()` (with the name sanitized)
+type CardKey = tuple[
+    str, tuple[str, str] | None, str, str, int | None, int | None, int | None, bool]
+
+
+class CardResolver:
+    """Card resolution session memoizing outcomes of card lookups by their identifier tuples.
+
+    Both hits and misses are memoized, the latter with their failure reasons (re-raised as
+    `CardNotFound` on repeated lookups), so a card that failed once (e.g. a misspelled name in
+    every decklist of a tournament) isn't looked up again for the duration of the session.
+
+    Used as a context manager, a resolver becomes the current one for all parsers (see:
+    `current_card_resolver()`) and restores the previous one on exit.
+    """
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def negative_hits(self) -> int:
+        return self._negative_hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def failures(self) -> dict[Any, str]:
+        """Return failure reasons of memoized misses.
+        """
+        return dict(self._failures)
+
+    def __init__(self) -> None:
+        self._resolved: dict[Any, Card] = {}
+        self._failures: dict[Any, str] = {}
+        self._hits, self._negative_hits, self._misses = 0, 0, 0
+        self._tokens: list[contextvars.Token] = []
+
+    def __enter__(self) -> Self:
+        self._tokens.append(_card_resolver.set(self))
+        return self
+
+    def __exit__(
+            self, exc_type: Type[BaseException] | None, exc_val: BaseException | None,
+            exc_tb: TracebackType | None) -> None:
+        _card_resolver.reset(self._tokens.pop())
+
+    def resolve(self, key: Any, lookup: Callable[[], Card]) -> Card:
+        """Return a card designated by ``key``, calling ``lookup`` only if it's not memoized.
+
+        Raises:
+            CardNotFound on failure (memoized or not)
+        """
+        if (card := self._resolved.get(key)) is not None:
+            self._hits += 1
+            return card
+        if (reason := self._failures.get(key)) is not None:
+            self._negative_hits += 1
+            raise CardNotFound(reason)
+        self._misses += 1
+        try:
+            card = lookup()
+        except CardNotFound as cnf:
+            self._failures[key] = str(cnf)
+            raise
+        self._resolved[key] = card
+        return card
+
+    def resolve_many(self, *keys: CardKey) -> dict[CardKey, Card | CardNotFound]:
+        """Resolve cards designated by ``keys`` in one batch.
+
+        Names of not yet memoized keys that miss the local lookup are prefetched in bulk first
+        (see: `mtg.scryfall.prefetch_card_names()`), so individual lookups don't need to make
+        their own API calls.
+
+        Returns:
+            a mapping of keys to cards or errors
+        """
+        keys = [*dict.fromkeys(keys)]
+        # foreign names are looked up separately, by language-aware API queries
+        missed = [
+            key[0] for key in keys
+            if key not in self._resolved and key not in self._failures and not key[-1]
+            and not find_by_name(key[0], query_api=False)]
+        if missed:
+            prefetch_card_names(*missed)
+        results = {}
+        for key in keys:
+            try:
+                results[key] = self.resolve(key, lambda: DeckParser.find_card_by_key(key))
+            except CardNotFound as cnf:
+                results[key] = cnf
+        return results
+
+    def log_stats(self) -> None:
+        total = self.hits + self.negative_hits + self.misses
+        if total:
+            _log.info(
+                f"Card resolver answered {self.hits + self.negative_hits}/{total} lookup(s) "
+                f"({(self.hits + self.negative_hits) * 100 / total:.2f}%) from its memo "
+                f"({self.negative_hits} of them negative) holding {len(self._resolved)} "
+                f"card(s) and {len(self._failures)} failure(s)")
+
+
+_card_resolver: contextvars.ContextVar[CardResolver | None] = contextvars.ContextVar(
+    "card_resolver", default=None)
+
+
+def current_card_resolver() -> CardResolver | None:
+    """Return the current card resolution session (if any).
+    """
+    return _card_resolver.get()
+
+
+def card_resolution_session() -> CardResolver | contextlib.nullcontext:
+    """Return a context manager entering a new card resolution session, or a no-op one if a
+    session is already current.
+    """
+    return contextlib.nullcontext() if current_card_resolver() else CardResolver()
+
+
+_alchemy_normalization: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "alchemy_normalization", default=False)
+
+
+@contextlib.contextmanager
+def alchemy_rebalance_normalization() -> Iterator[None]:
+    """Return a context manager within which decks parsed in Arena formats get cards that
+    aren't legal in their format swapped for their Alchemy rebalanced (or original)
+    counterparts.
+
+    This changes decklists (and so decklist IDs) of such decks, so it's meant only for newly
+    scraped ones.
+    """
+    token = _alchemy_normalization.set(True)
+    try:
+        yield
+    finally:
+        _alchemy_normalization.reset(token)
+
+
+def resolve_card(key: Any, lookup: Callable[[], Card]) -> Card:
+    """Return a card designated by ``key`` through the current card resolution session (or
+    directly via ``lookup``, if there's none).
+
+    Raises:
+        CardNotFound on failure
+    """
+    if (resolver := current_card_resolver()) is not None:
+        return resolver.resolve(key, lookup)
+    return lookup()
+
+
 # TODO: use Python's 'inflection' lib to handle key variants (#418)
 SANITIZED_FORMATS = {
     "1v1 commander": "commander",
@@ -1018,6 +1417,22 @@ class DeckParser(ABC):
                 self._set_commander(c)
             self._sideboard = []
 
+    @classmethod
+    def card_key(
+            cls, name: str,
+            set_and_collector_number: tuple[str, str] | None = None,
+            scryfall_id="",
+            oracle_id="",
+            tcgplayer_id: int | None = None,
+            cardmarket_id: int | None = None,
+            mtgo_id: int | None = None,
+            foreign=False) -> CardKey:
+        """Return identifiers tuple of a card lookup (as accepted by `find_card()`).
+        """
+        return (
+            cls.sanitize_card_name(name), set_and_collector_number, scryfall_id, oracle_id,
+            tcgplayer_id, cardmarket_id, mtgo_id, foreign)
+
     @classmethod
     def find_card(
             cls, name: str,
@@ -1030,13 +1445,29 @@ class DeckParser(ABC):
             foreign=False) -> Card:
         """Find a MtG card designated by ``name`` and (optionally) other parameters.
 
+        Lookups are memoized (both hits and misses) by the current card resolution session, if
+        any (see: `CardResolver`).
+
         Raises:
             CardNotFound on failure
 
         Returns:
             a Card object
         """
-        name = cls.sanitize_card_name(name)
+        key = cls.card_key(
+            name, set_and_collector_number, scryfall_id, oracle_id, tcgplayer_id, cardmarket_id,
+            mtgo_id, foreign)
+        return resolve_card(key, lambda: cls.find_card_by_key(key))
+
+    @staticmethod
+    def find_card_by_key(key: CardKey) -> Card:
+        """Find a MtG card designated by ``key`` bypassing the current card resolution session.
+
+        Raises:
+            CardNotFound on failure
+        """
+        (name, set_and_collector_number, scryfall_id, oracle_id, tcgplayer_id, cardmarket_id,
+         mtgo_id, foreign) = key
         if set_and_collector_number:
             if card := find_by_collector_number(*set_and_collector_number):
                 # don't assume set/collector number data is always correct in the input data
@@ -1074,6 +1505,7 @@ class DeckParser(ABC):
         return [card] * quantity
 
     @staticmethod
+    @lru_cache(maxsize=16_384)
     def sanitize_card_name(text: str) -> str:
         text = text.replace("’", "'").replace("‑", "-").replace("꞉", ":")
         if "/" in text:
@@ -1107,9 +1539,24 @@ class DeckParser(ABC):
         """
         raise NotImplementedError
 
+    def _normalize_alchemy_rebalances(self) -> None:
+        # Arena swaps cards for their Alchemy rebalances (or back) depending on format, but
+        # decklists don't always reflect it
+        rebalances, pool = alchemy_rebalances(), arena_cards(rebalanced=True)
+        self._maindeck = rebalances.normalize(self._maindeck, self.fmt, pool)
+        self._sideboard = rebalances.normalize(self._sideboard, self.fmt, pool)
+        self._commander, self._partner_commander, self._companion = [
+            rebalances.normalize([card], self.fmt, pool)[0] if card else None
+            for card in (self._commander, self._partner_commander, self._companion)]
+
     def _build_deck(self) -> Deck | None:
         """Build a Deck object from the parsed deck data and return it.
+
+        Within `alchemy_rebalance_normalization()`, decks in Arena formats get their Alchemy
+        rebalances normalized.
         """
+        if self.fmt in ARENA_FORMATS and _alchemy_normalization.get():
+            self._normalize_alchemy_rebalances()
         return Deck(
             self._maindeck, self._sideboard, self._commander, self._partner_commander,
             self._companion, self._metadata)
@@ -1130,10 +1577,11 @@ class DeckParser(ABC):
             a Deck object or None
         """
         try:
-            self._pre_parse()
-            self._parse_metadata()
-            self._parse_deck()
-            return self._build_deck()
+            with card_resolution_session():
+                self._pre_parse()
+                self._parse_metadata()
+                self._parse_deck()
+                return self._build_deck()
         except suppressed_errors as err:
             _log.warning(f"Parsing failed with: {err!r}")
             return None
@@ -1219,3 +1667,14 @@ class DeckParser(ABC):
         top_words.sort(key=lambda w: len(w), reverse=True)
         fmt = top_words[0]
         return formats.get(fmt, fmt)
+
+
+def log_card_name_sanitizer_stats() -> None:
+    """Log hit rate of the card name sanitizer memo (see: `DeckParser.sanitize_card_name()`).
+    """
+    info = DeckParser.sanitize_card_name.cache_info()
+    total = info.hits + info.misses
+    if total:
+        _log.info(
+            f"Card name sanitizer memo answered {info.hits}/{total} lookup(s) "
+            f"({info.hits * 100 / total:.2f}%) holding {info.currsize}/{info.maxsize} name(s)")
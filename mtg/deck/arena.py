@@ -13,7 +13,9 @@ from typing import override
 import regex as re
 
 from mtg import Json
-from mtg.deck import ARENA_MULTIFACE_SEPARATOR, CardNotFound, DeckParser
+from mtg.deck import (
+    ARENA_MULTIFACE_SEPARATOR, CardKey, CardNotFound, DeckParser,
+    current_card_resolver, resolve_card)
 from mtg.scryfall import COMMANDER_FORMATS, Card, \
     MULTIFACE_SEPARATOR as SCRYFALL_MULTIFACE_SEPARATOR, query_api_for_card
 from mtg.utils import ParsingError, extract_int, getrepr, is_foreign, sanitize_whitespace
@@ -108,22 +110,30 @@ class PlaysetLine:
             pairs += [("setcode", self.set_code), ("collector_number", self.collector_number)]
         return getrepr(self.__class__, *pairs)
 
-    def _handle_foreign(self) -> list[Card] | None:
-        if is_foreign(self.name):
-            if card := query_api_for_card(self.name, foreign=True):
-                return DeckParser.get_playset(card, self.quantity)
-        return None
-
-    def to_playset(self) -> list[Card]:
+    @property
+    def card_key(self) -> CardKey:
         set_and_collector_number = (
             self.set_code, self.collector_number) if self.is_extended else None
+        return DeckParser.card_key(self.name, set_and_collector_number)
+
+    def _find_foreign(self) -> Card:
+        if not is_foreign(self.name):
+            raise CardNotFound(f"Not a foreign card name: {self.name!r}")
+        if card := query_api_for_card(self.name, foreign=True):
+            return card
+        raise CardNotFound(f"Unable to find foreign card {self.name!r}")
+
+    def to_playset(self) -> list[Card]:
+        key = self.card_key
         try:
-            return DeckParser.get_playset(DeckParser.find_card(
-                self.name, set_and_collector_number), self.quantity)
+            card = resolve_card(key, lambda: DeckParser.find_card_by_key(key))
         except CardNotFound as cnf:
-            if cards := self._handle_foreign():
-                return cards
-            raise cnf
+            # the foreign fallback (language detection plus an API call) is memoized separately
+            try:
+                card = resolve_card(("foreign", self.name), self._find_foreign)
+            except CardNotFound:
+                raise cnf
+        return DeckParser.get_playset(card, self.quantity)
 
 
 def _is_playset_line(line: str) -> bool:
@@ -132,6 +142,15 @@ def _is_playset_line(line: str) -> bool:
         PlaysetLine.EXTENDED_PATTERN.match(line))
 
 
+def get_card_names(*lines: str) -> list[str]:
+    """Return sanitized names of cards in those of ``lines`` that are playset lines (as they are
+    looked up when parsing).
+    """
+    return [
+        DeckParser.sanitize_card_name(PlaysetLine(line).name) for line in lines
+        if _is_playset_line(line)]
+
+
 def _is_inverted_playset_line(line: str) -> bool:
     return bool(PlaysetLine.INVERTED_PATTERN.match(line))
 
@@ -464,6 +483,11 @@ class ArenaParser(DeckParser):
         self._lines = decklists[0].splitlines()
         # this shouldn't be theoretically needed now with LineParser normalization
         self._handle_missing_commander_line()
+        # resolve the whole decklist in one batch, so parsing its lines hits the memo (outside
+        # of parse() there's no session to memoize in, so there's nothing to resolve ahead)
+        if resolver := current_card_resolver():
+            resolver.resolve_many(
+                *[PlaysetLine(l).card_key for l in self._lines if _is_playset_line(l)])
 
     @override
     def _parse_metadata(self) -> None:
@@ -13,7 +13,7 @@ from typing import Literal
 from mtg import OUTPUT_DIR, PathLike
 from mtg.deck import CardNotFound, Deck, DeckParser, Mode
 from mtg.deck.arena import ArenaParser, IllFormedArenaDecklist, is_arena_decklist
-from mtg.scryfall import Card, aggregate, set_cards
+from mtg.scryfall import Card, set_cards
 from mtg.utils import ParsingError, from_iterable
 from mtg.utils.files import getdir, getfile, sanitize_filename, truncate_path
 from mtg.utils.json import from_json as deserialize_json, to_json
@@ -164,9 +164,8 @@ class Exporter:
         dst.write_text(data, encoding="utf-8")
 
     @classmethod
-    def _to_forge_line(cls, playset: list[Card]) -> str:
-        card = playset[0]
-        return cls.FORGE_LINE_TEMPLATE.format(len(playset), card.first_face_name, card.set.upper())
+    def _to_forge_line(cls, card: Card, quantity=1) -> str:
+        return cls.FORGE_LINE_TEMPLATE.format(quantity, card.first_face_name, card.set.upper())
 
     def _get_forge_metadata_lines(self) -> list[str]:
         lines = ["[metadata]"]
@@ -184,17 +183,11 @@ class Exporter:
         return lines
 
     def _build_forge(self) -> str:
-        commander = [
-            self._to_forge_line(playset) for playset in
-            aggregate(self._deck.commander).values()] if self._deck.commander else []
-        if self._deck.partner_commander:
-            commander += [self._to_forge_line(playset) for playset in aggregate(
-                self._deck.partner_commander).values()]
+        commander = [self._to_forge_line(card) for card in self._deck.commanders]
         maindeck = [
-            self._to_forge_line(playset) for playset in aggregate(*self._deck.maindeck).values()]
+            self._to_forge_line(card, qty) for card, qty in self._deck.maindeck_playsets]
         sideboard = [
-            self._to_forge_line(playset) for playset in
-            aggregate(*self._deck.sideboard).values()] if self._deck.sideboard else []
+            self._to_forge_line(card, qty) for card, qty in self._deck.sideboard_playsets]
         lines = self._get_forge_metadata_lines()
         if commander:
             lines += ["[Commander]", *commander]
@@ -217,11 +210,10 @@ class Exporter:
         dst.write_text(self._build_forge(), encoding="utf-8")
 
     @classmethod
-    def _to_xmage_line(cls, playset: list[Card], sideboard=False) -> str:
-        card = playset[0]
+    def _to_xmage_line(cls, card: Card, quantity=1, sideboard=False) -> str:
         template = cls.XMAGE_SIDEBOARD_LINE_TEMPLATE if sideboard else cls.XMAGE_LINE_TEMPLATE
         return template.format(
-            len(playset), card.set.upper(), card.collector_number, card.first_face_name)
+            quantity, card.set.upper(), card.collector_number, card.first_face_name)
 
     def _get_xmage_metadata_lines(self) -> list[str]:
         lines = [f"NAME:{self.name}"]
@@ -240,19 +232,15 @@ class Exporter:
     def _build_xmage(self) -> str:
         lines = self._get_xmage_metadata_lines()
         lines += [
-            self._to_xmage_line(playset) for playset in aggregate(*self._deck.maindeck).values()]
+            self._to_xmage_line(card, qty) for card, qty in self._deck.maindeck_playsets]
         commander = [
-            self._to_xmage_line(playset, sideboard=True) for playset in
-            aggregate(self._deck.commander).values()] if self._deck.commander else []
-        if self._deck.partner_commander:
-            commander += [self._to_xmage_line(playset, sideboard=True) for playset in aggregate(
-                self._deck.partner_commander).values()]
+            self._to_xmage_line(card, sideboard=True) for card in self._deck.commanders]
         if commander:
             lines += commander
         else:
             lines += [
-                self._to_xmage_line(playset, sideboard=True) for playset in
-                aggregate(*self._deck.sideboard).values()] if self._deck.sideboard else []
+                self._to_xmage_line(card, qty, sideboard=True) for card, qty
+                in self._deck.sideboard_playsets]
         return "\n".join(lines)
 
     def to_xmage(self, dstdir: PathLike = "") -> None:
@@ -19,7 +19,9 @@ from requests import ConnectionError, HTTPError, ReadTimeout
 from selenium.common.exceptions import ElementClickInterceptedException, TimeoutException
 
 from mtg import Json
-from mtg.deck import CardNotFound, Deck, DeckParser, InvalidDeck
+from mtg.deck import (
+    CardNotFound, Deck, DeckParser, InvalidDeck, alchemy_rebalance_normalization,
+    card_resolution_session)
 from mtg.deck.arena import ArenaParser
 from mtg.gstate import UrlsStateManager
 from mtg.utils import ParsingError, register_type, timed
@@ -264,10 +266,12 @@ class DeckScraper(NestedDeckParser):
         if throttled:
             throttle(*self.THROTTLING)
         try:
-            self._pre_parse()
-            self._parse_metadata()
-            self._parse_deck()
-            return self._build_deck()
+            # scraped decks are new ones, so normalizing them can't change any stored decklists
+            with card_resolution_session(), alchemy_rebalance_normalization():
+                self._pre_parse()
+                self._parse_metadata()
+                self._parse_deck()
+                return self._build_deck()
         except (InvalidDeck, CardNotFound) as err:
             _log.warning(f"Scraping failed with: {err!r}")
             return None
@@ -0,0 +1,265 @@
+"""
+
+    mtg.deck.similarity
+    ~~~~~~~~~~~~~~~~~~~
+    Find near-duplicate decklists with MinHash and locality-sensitive hashing.
+
+    @author: mazz3rr
+
+"""
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+
+from mtg import PathLike
+
+_log = logging.getLogger(__name__)
+
+_PRIME = (1 << 31) - 1  # Mersenne prime bounding the permuted hash values
+_SECTIONS = {"commander": "cmd", "companion": "cmp", "deck": "", "sideboard": "sb"}
+
+
+def decklist_shingles(decklist: str) -> set[str]:
+    """Turn an Arena/MTGO ``decklist`` into a set of shingles for Jaccard similarity.
+
+    Each copy of a card is a distinct shingle (e.g. '4 Shock' gives 'shock#1' to 'shock#4'), so
+    that playset size changes weigh in as much as card swaps. Cards outside maindeck are prefixed
+    with their section.
+    """
+    shingles, prefix = set(), ""
+    for line in decklist.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.lower() in _SECTIONS:
+            prefix = _SECTIONS[line.lower()]
+            continue
+        qty, _, name = line.partition(" ")
+        if not qty.isdigit() or not name:
+            continue  # 'About' section or noise
+        name = f"{prefix}:{name.casefold()}" if prefix else name.casefold()
+        shingles.update(f"{name}#{i}" for i in range(1, int(qty) + 1))
+    return shingles
+
+
+@lru_cache(maxsize=65_536)
+def _hash_shingle(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+class DeckSimilarityIndex:
+    """MinHash/LSH index of decklists keyed by their IDs.
+
+    Each decklist gets a MinHash signature estimating Jaccard similarity of its shingles (see:
+    `decklist_shingles()`). Signatures are split into bands and hashed into buckets, so only
+    decklists sharing a bucket are ever compared. With the defaults (16 bands of 4 rows), pairs at
+    0.8 similarity become candidates with over 99.9% probability and pairs at 0.3 with ca. 12%.
+
+    Decklists can be added and removed at any time. The index can be saved and loaded back, its
+    buckets being rebuilt on load.
+    """
+    NUM_PERM = 64
+    BANDS = 16
+    SEED = 426
+    DEFAULT_THRESHOLD = 0.8
+
+    @property
+    def keys(self) -> list[str]:
+        return [*self._keys]
+
+    @property
+    def num_perm(self) -> int:
+        return self._num_perm
+
+    @property
+    def bands(self) -> int:
+        return self._bands
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS) -> None:
+        if num_perm % bands:
+            raise ValueError(
+                f"Number of permutations ({num_perm}) must be divisible by bands ({bands})")
+        self._num_perm, self._bands, self._rows_per_band = num_perm, bands, num_perm // bands
+        rng = np.random.default_rng(self.SEED)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._signatures: list[np.ndarray] = []
+        self._buckets: list[defaultdict[int, list[int]]] = [
+            defaultdict(list) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def signature(self, decklist: str) -> np.ndarray:
+        """Return MinHash signature of ``decklist``.
+        """
+        shingles = decklist_shingles(decklist)
+        if not shingles:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint32)
+        hashes = np.fromiter((_hash_shingle(s) for s in shingles), dtype=np.uint64)
+        # a < 2^31 and hashes < 2^32, so no overflow
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(_PRIME)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_hashes(self, signature: np.ndarray) -> list[int]:
+        r = self._rows_per_band
+        return [hash(signature[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def _insert(self, key: str, signature: np.ndarray) -> None:
+        row = len(self._keys)
+        self._keys.append(key)
+        self._rows[key] = row
+        self._signatures.append(signature)
+        for buckets, band_hash in zip(self._buckets, self._band_hashes(signature)):
+            buckets[band_hash].append(row)
+
+    def add(self, key: str, decklist: str) -> bool:
+        """Add ``decklist`` under ``key`` (e.g. its decklist ID).
+
+        Returns:
+            `True` if added, `False` if the key was already indexed
+        """
+        if key in self._rows:
+            return False
+        self._insert(key, self.signature(decklist))
+        return True
+
+    def update(self, decklists: dict[str, str]) -> int:
+        """Add all not yet indexed ``decklists`` (a mapping of keys to decklists).
+
+        Returns:
+            number of decklists added
+        """
+        return sum(self.add(key, decklist) for key, decklist in decklists.items())
+
+    def remove(self, key: str) -> bool:
+        """Remove decklist indexed under ``key``.
+
+        The last indexed decklist takes over the row of the removed one, so that rows stay
+        contiguous.
+
+        Returns:
+            `True` if removed, `False` if the key wasn't indexed
+        """
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        for buckets, band_hash in zip(self._buckets, self._band_hashes(self._signatures[row])):
+            bucket = buckets[band_hash]
+            bucket.remove(row)
+            if not bucket:
+                del buckets[band_hash]
+        last = len(self._keys) - 1
+        if row != last:
+            moved_key, moved_signature = self._keys[last], self._signatures[last]
+            self._keys[row], self._signatures[row] = moved_key, moved_signature
+            self._rows[moved_key] = row
+            for buckets, band_hash in zip(self._buckets, self._band_hashes(moved_signature)):
+                bucket = buckets[band_hash]
+                bucket[bucket.index(last)] = row
+        self._keys.pop()
+        self._signatures.pop()
+        return True
+
+    def _similarity(self, signature: np.ndarray, row: int) -> float:
+        return float(np.count_nonzero(self._signatures[row] == signature)) / self.num_perm
+
+    def similarity(self, key: str, other_key: str) -> float:
+        """Return estimated Jaccard similarity of two indexed decklists.
+        """
+        return self._similarity(self._signatures[self._rows[key]], self._rows[other_key])
+
+    def _candidates(self, signature: np.ndarray) -> set[int]:
+        rows = set()
+        for buckets, band_hash in zip(self._buckets, self._band_hashes(signature)):
+            rows.update(buckets.get(band_hash, ()))
+        return rows
+
+    def similar(
+            self, key_or_decklist: str, threshold=DEFAULT_THRESHOLD,
+            limit: int | None = None) -> list[tuple[str, float]]:
+        """Return decklists similar to the one designated by ``key_or_decklist`` (either an indexed
+        key or a decklist text).
+
+        Returns:
+            (key, estimated similarity) pairs sorted from the most similar, the queried decklist
+            itself excluded
+        """
+        if (row := self._rows.get(key_or_decklist)) is not None:
+            signature = self._signatures[row]
+        else:
+            signature = self.signature(key_or_decklist)
+        results = [
+            (self._keys[r], sim) for r in self._candidates(signature)
+            if r != row and (sim := self._similarity(signature, r)) >= threshold]
+        results.sort(key=lambda p: (-p[1], p[0]))
+        return results[:limit] if limit is not None else results
+
+    def clusters(self, threshold=DEFAULT_THRESHOLD, min_size=2) -> list[list[str]]:
+        """Return clusters of near-duplicate decklists.
+
+        Within each bucket members are compared with its first member only and matches are
+        merged (with union-find) across all buckets. This keeps the work linear in the number of
+        bucket entries at the cost of clusters being only an approximation of full
+        single-linkage ones.
+
+        Returns:
+            lists of keys sorted by cluster size (descending)
+        """
+        parents = list(range(len(self._keys)))
+
+        def find(row: int) -> int:
+            while parents[row] != row:
+                parents[row] = parents[parents[row]]
+                row = parents[row]
+            return row
+
+        for buckets in self._buckets:
+            for rows in buckets.values():
+                if len(rows) < 2:
+                    continue
+                first, signature = rows[0], self._signatures[rows[0]]
+                for row in rows[1:]:
+                    if self._similarity(signature, row) >= threshold:
+                        parents[find(row)] = find(first)
+
+        groups = defaultdict(list)
+        for row, key in enumerate(self._keys):
+            groups[find(row)].append(key)
+        clusters = [sorted(g) for g in groups.values() if len(g) >= min_size]
+        clusters.sort(key=lambda c: (-len(c), c[0]))
+        return clusters
+
+    def save(self, path: PathLike) -> None:
+        """Save this index at ``path`` (as a NumPy .npz archive).
+        """
+        path = Path(path)
+        signatures = np.stack(self._signatures) if self._signatures else np.empty(
+            (0, self.num_perm), dtype=np.uint32)
+        meta = {"num_perm": self.num_perm, "bands": self.bands, "keys": self._keys}
+        with path.open("wb") as f:
+            np.savez(f, signatures=signatures, meta=np.array(json.dumps(meta)))
+        _log.info(f"Saved similarity index of {len(self):,} decklist(s) to '{path}'")
+
+    @classmethod
+    def load(cls, path: PathLike) -> Self:
+        """Load an index saved at ``path``.
+        """
+        with np.load(Path(path)) as archive:
+            meta, signatures = json.loads(str(archive["meta"])), archive["signatures"]
+        index = cls(meta["num_perm"], meta["bands"])
+        for key, signature in zip(meta["keys"], signatures):
+            index._insert(key, signature)
+        return index
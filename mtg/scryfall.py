@@ -10,41 +10,71 @@
     https://scryfall.com/docs/api/bulk-data for details) and falls back on calling Scryfall API
     only on lookup failures. As Oracle Cards data contains only the most recent version of
     cards with potentially multiple printings, this means that some printings-specific data may
-    be 'lost in translation' (e.g. during deck conversions).
+    be 'lost in translation' (e.g. during deck conversions). To prevent that, "Default Cards" (or
+    "All Cards") data can be downloaded optionally (see: `download_scryfall_printings_data()`)
+    and then printing-specific lookups fall back on an on-disk index of it.
 
     @author: mazz3rr
 
 """
+import bisect
+import hashlib
 import itertools
 import json
 import logging
+import marshal
 import math
+import mmap
+import os
+import pickle
 import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
 from asyncio.exceptions import TimeoutError as AsyncIoTimeoutError
-from collections import defaultdict, namedtuple
+from collections import Counter as PyCounter, OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import date
+from difflib import SequenceMatcher
 from enum import Enum
-from functools import cached_property, lru_cache
+from functools import lru_cache
+from pathlib import Path
 from pprint import pprint
 from types import EllipsisType
-from typing import Callable, Iterable, Self
+from typing import (
+    BinaryIO, Callable, Collection, Container, Generator, Iterable, Iterator, Protocol, Self)
 
+import numpy as np
+import requests
 import scrython
 from aiohttp.client_exceptions import ContentTypeError, ServerTimeoutError
 from tqdm import tqdm
 from unidecode import unidecode
 
-from mtg import DATA_DIR, Json
+from mtg import DATA_DIR, Json, __version__
 from mtg.mtgwiki import CLASSES, RACES
-from mtg.utils import from_iterable, getfloat, getint, getrepr, timed
+from mtg.utils import (
+    Counter, deep_sizeof, from_iterable, getfloat, getint, getrepr, timed, timestamp)
 from mtg.utils.files import download_file, getdir
-from mtg.utils.scrape import throttle
+from mtg.utils.scrape import REQUESTS_TIMEOUT, RateLimiter, throttle
 
 _log = logging.getLogger(__name__)
 CARDS_FILENAME = "scryfall_cards.json"
 SETS_FILENAME = "scryfall_sets.json"
+SETS_CHECKPOINT_FILENAME = "scryfall_sets.partial.jsonl"
+PRINTINGS_FILENAME = "scryfall_printings.json"
+SNAPSHOT_FILENAME = "scryfall_cards.snapshot"
+SNAPSHOT_VERSION = 6
+COLUMNS_DIRNAME = "scryfall_columns"
+SHARED_INDEX_DIRNAME = "scryfall_shared_index"
 API_QUERY_THROTTLE = 0.2
+API_URL = "https://api.scryfall.com"
+API_HEADERS = {"User-Agent": f"mtg/{__version__}", "Accept": "application/json"}
 
 
 class ScryfallError(ValueError):
@@ -52,37 +82,143 @@ class ScryfallError(ValueError):
     """
 
 
+def _download_oracle_cards() -> bool:
+    bd = scrython.BulkData()
+    data = bd.data()[0]  # retrieve 'Oracle Cards' data dict
+    url = data["download_uri"]
+    return download_file(url, file_name=CARDS_FILENAME, dst_dir=DATA_DIR)
+
+
 def download_scryfall_bulk_data() -> None:
     """Download Scryfall 'Oracle Cards' bulk data JSON.
+
+    All derived data is rebuilt from scratch. See `refresh_scryfall_bulk_data()` for an
+    incremental alternative.
+    """
+    _download_oracle_cards()
+    _build_cards_snapshot(DATA_DIR / CARDS_FILENAME)
+    api_cache().clear()
+    _invalidate_caches()
+
+
+def download_scryfall_printings_data(all_cards=False) -> None:
+    """Download Scryfall 'Default Cards' (or 'All Cards') bulk data JSON and index it.
+
+    This data features all card printings and is only needed for printing-specific lookups
+    (see: `PrintingsIndex`).
     """
+    bulk_type = "all_cards" if all_cards else "default_cards"
     bd = scrython.BulkData()
-    data = bd.data()[0]  # retrieve 'Oracle Cards' data dict
-    url = data["download_uri"]
-    download_file(url, file_name=CARDS_FILENAME, dst_dir=DATA_DIR)
+    data = from_iterable(bd.data(), lambda d: d["type"] == bulk_type)
+    if not data:
+        raise ScryfallError(f"No {bulk_type!r} bulk data available")
+    download_file(
+        data["download_uri"], file_name=PRINTINGS_FILENAME, dst_dir=DATA_DIR, parallel=4)
+    if index := printings_index():
+        index.close()
+    printings_index.cache_clear()
+    index = PrintingsIndex(DATA_DIR / PRINTINGS_FILENAME)
+    if not index.is_current:
+        index.build()
 
 
-@lru_cache  # pulling Scryfall data takes a few seconds
-def api_set(set_code: str) -> scrython.sets.Code | None:
-    try:
-        return scrython.sets.Code(code=set_code)
-    except scrython.ScryfallError:
-        return None
+_sessions = threading.local()
+
+
+def _api_get(url: str) -> Json:
+    # a session per thread as sessions aren't guaranteed to be thread-safe
+    if not hasattr(_sessions, "session"):
+        _sessions.session = requests.Session()
+    response = _sessions.session.get(url, headers=API_HEADERS, timeout=REQUESTS_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
 
 
-def download_scryfall_set_data() -> None:
-    """Ask Scryfall API for set data and dump it as .json files.
+def _fetch_sets_listing() -> dict[str, Json]:
+    """Return Scryfall's listing of all sets as a mapping of set codes to set data.
     """
-    progress = tqdm(
-        (api_set(code) for code in sorted(all_set_codes())), f"Downloading sets data...",
-        total=len(all_set_codes()))
+    listing, url = {}, f"{API_URL}/sets"
+    while url:
+        payload = _api_get(url)
+        listing.update((set_data["code"], set_data) for set_data in payload["data"])
+        url = payload.get("next_page") if payload.get("has_more") else None
+    return listing
+
+
+def _read_sets_checkpoint(checkpoint: Path) -> dict[str, Json]:
+    data = {}
+    with checkpoint.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                set_data = json.loads(line)
+            except json.JSONDecodeError:
+                break  # a line cut short by an interruption
+            data[set_data["code"]] = set_data
+    return data
+
+
+@timed("downloading Scryfall set data", precision=1)
+def download_scryfall_set_data(max_workers=4, interval=0.1) -> None:
+    """Ask Scryfall API for data on sets of the bulk data cards and dump it as a .json file.
+
+    Sets are requested concurrently (by a pool of ``max_workers`` threads with at least
+    ``interval`` seconds between consecutive requests). Each downloaded set is checkpointed to
+    disk right away, so an interrupted run resumes where it stopped. Sets with the same card
+    count and release date as per Scryfall's sets listing (one request) as in already
+    downloaded data are skipped.
+    """
+    dst, checkpoint = getdir(DATA_DIR) / SETS_FILENAME, DATA_DIR / SETS_CHECKPOINT_FILENAME
+    known = {}
+    if dst.exists():
+        known.update((set_data["code"], set_data) for set_data in iter_json_array(dst))
+    if checkpoint.exists():
+        resumed = _read_sets_checkpoint(checkpoint)
+        _log.info(f"Resuming set data download with {len(resumed)} set(s) checkpointed")
+        known.update(resumed)
+    listing = _fetch_sets_listing()
+
+    data, pending = {}, []
+    for code in sorted(all_set_codes()):
+        old, listed = known.get(code), listing.get(code)
+        if old and listed and all(old.get(k) == listed.get(k) for k in (
+                "card_count", "released_at")):
+            data[code] = old
+        else:
+            pending.append(code)
+
+    limiter, unchanged, downloaded = RateLimiter(interval), len(data), 0
 
-    data = []
-    for set_data in progress:
-        data.append(set_data.scryfallJson)
+    def fetch(set_code: str) -> Json | None:
+        limiter.wait()
+        try:
+            return _api_get(f"{API_URL}/sets/{set_code}")
+        except (requests.RequestException, ValueError) as err:
+            _log.warning(f"Scryfall set data query for {set_code!r} failed with: {err!r}")
+            return None
 
-    dst = DATA_DIR / SETS_FILENAME
-    with dst.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    with checkpoint.open("a", encoding="utf-8") as f, ThreadPoolExecutor(max_workers) as executor:
+        progress = tqdm(
+            zip(pending, executor.map(fetch, pending)), "Downloading sets data...",
+            total=len(pending))
+        for code, set_data in progress:
+            if set_data is None:
+                if code in known:  # better stale than missing
+                    data[code] = known[code]
+                continue
+            data[code], downloaded = set_data, downloaded + 1
+            f.write(json.dumps(set_data) + "\n")
+            f.flush()
+
+    tmp = dst.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump([data[code] for code in sorted(data)], f, indent=2)
+    os.replace(tmp, dst)
+    checkpoint.unlink()
+    _log.info(
+        f"Set data dumped at: '{dst}' ({downloaded} set(s) downloaded, {unchanged} unchanged, "
+        f"{len(pending) - downloaded} failed)")
+    sets.cache_clear()
+    set_index.cache_clear()
 
 
 MULTIFACE_SEPARATOR = " // "  # separates names of card's faces in multiface cards
@@ -213,25 +349,31 @@ class TypeLine:
         return self._text
 
     @property
-    def supertypes(self) -> list[str]:
-        return [t for t in self._types if t in self.SUPERTYPES]
+    def types(self) -> tuple[str, ...]:
+        """Return all types (supertypes and regular types) in the order of the type line.
+        """
+        return self._types
 
     @property
-    def regular_types(self) -> list[str]:
-        return [t for t in self._types if t not in self.SUPERTYPES]
+    def supertypes(self) -> tuple[str, ...]:
+        return self._supertypes
 
     @property
-    def subtypes(self) -> list[str]:
+    def regular_types(self) -> tuple[str, ...]:
+        return self._regular_types
+
+    @property
+    def subtypes(self) -> tuple[str, ...]:
         return self._subtypes
 
     @property
     def is_permanent(self) -> bool:
-        return all(p in self.PERMANENT_TYPES for p in self.regular_types)
+        return self._is_permanent
 
     @property
     def is_nonpermanent(self) -> bool:
         # type not being permanent doesn't mean it's 'non-permanent', e.g. 'dungeon' is neither
-        return all(p in self.NONPERMANENT_TYPES for p in self.regular_types)
+        return self._is_nonpermanent
 
     @property
     def is_artifact(self) -> bool:
@@ -262,26 +404,44 @@ class TypeLine:
         return "Sorcery" in self.regular_types
 
     @property
-    def races(self) -> list[str]:
-        return [t for t in self.subtypes if t in RACES]
+    def races(self) -> tuple[str, ...]:
+        return self._races
 
     @property
-    def classes(self) -> list[str]:
-        return [t for t in self.subtypes if t in CLASSES]
+    def classes(self) -> tuple[str, ...]:
+        return self._classes
+
+    def __init__(
+            self, text: str,
+            parsed: tuple[Iterable[str], Iterable[str]] | None = None) -> None:
+        """Initialize.
 
-    def __init__(self, text: str) -> None:
+        Args:
+            text: type line text
+            parsed: (types, subtypes) pair from an earlier parse of the same text (if available)
+        """
         if MULTIFACE_SEPARATOR in text:
             raise ValueError("Multiface type line")
         self._text = text
-        self._types, self._subtypes = self._parse()
-
-    def _parse(self) -> tuple[list[str], list[str]]:
+        types, subtypes = parsed if parsed is not None else self._parse()
+        self._types, self._subtypes = tuple(types), tuple(subtypes)
+        # everything is derived upfront (and immutable) as instances are shared (see:
+        # `parse_type_line()`)
+        self._supertypes = tuple(t for t in self._types if t in self.SUPERTYPES)
+        self._regular_types = tuple(t for t in self._types if t not in self.SUPERTYPES)
+        self._is_permanent = all(p in self.PERMANENT_TYPES for p in self._regular_types)
+        self._is_nonpermanent = all(p in self.NONPERMANENT_TYPES for p in self._regular_types)
+        self._races = tuple(t for t in self._subtypes if t in RACES)
+        self._classes = tuple(t for t in self._subtypes if t in CLASSES)
+
+    def _parse(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
         """Parse text into types and subtypes.
         """
         if self.SEPARATOR in self.text:
             types, subtypes = self.text.split(f" {self.SEPARATOR} ", maxsplit=1)
-            return types.split(), subtypes.split()
-        return self.text.split(), []
+            return tuple(sys.intern(t) for t in types.split()), tuple(
+                sys.intern(t) for t in subtypes.split())
+        return tuple(sys.intern(t) for t in self.text.split()), ()
 
 
 class LordSentence:
@@ -298,6 +458,10 @@ class LordSentence:
     """
     PATTERN = re.compile(r".*(\bget\s\+[\dX]/\+[\dX]\b).*")
 
+    @property
+    def text(self) -> str:
+        return self._text
+
     @property
     def prefix(self) -> str:
         return self._prefix
@@ -314,9 +478,16 @@ class LordSentence:
     def is_valid(self) -> bool:
         return bool(self.buff)
 
-    def __init__(self, text: str) -> None:
+    def __init__(self, text: str, parsed: tuple[str, str, str] | None = None) -> None:
+        """Initialize.
+
+        Args:
+            text: sentence text
+            parsed: (prefix, buff, suffix) triple from an earlier parse of the same text (if
+                available)
+        """
         self._text = text
-        self._prefix, self._buff, self._suffix = self._parse()
+        self._prefix, self._buff, self._suffix = parsed if parsed is not None else self._parse()
 
     def _parse(self) -> tuple[str, str, str]:
         match = self.PATTERN.match(self._text)
@@ -326,6 +497,36 @@ class LordSentence:
         return "", "", ""
 
 
+# parses shared by all cards (there's much fewer distinct type lines than cards and the parses
+# of the bulk data are precomputed in its snapshot)
+_type_lines: dict[str, TypeLine] = {}
+_lord_sentences: dict[str, tuple[LordSentence, ...]] = {}
+
+
+def parse_type_line(text: str) -> TypeLine:
+    """Return parsed type line ``text`` (each distinct one is parsed only once).
+    """
+    if (type_line := _type_lines.get(text)) is None:
+        type_line = _type_lines[text] = TypeLine(text)
+    return type_line
+
+
+def _parse_lord_sentences(oracle_text: str) -> tuple[LordSentence, ...]:
+    sentences = (LordSentence(sentence) for sentence in oracle_text.split("."))
+    return tuple(ls for ls in sentences if ls.is_valid)
+
+
+def parse_lord_sentences(oracle_text: str) -> tuple[LordSentence, ...]:
+    """Return valid lord sentences parsed from ``oracle_text`` (each distinct one is parsed
+    only once).
+    """
+    if not oracle_text:
+        return ()
+    if (sentences := _lord_sentences.get(oracle_text)) is None:
+        sentences = _lord_sentences[oracle_text] = _parse_lord_sentences(oracle_text)
+    return sentences
+
+
 # TODO: make Card inherit from CardFace
 @dataclass(frozen=True)
 class CardFace:
@@ -373,31 +574,30 @@ class CardFace:
         result = self.json.get("colors")
         return result if result else []
 
-    @lru_cache
     def parse_types(self) -> TypeLine | None:
-        return TypeLine(self.type_line) if self.type_line else None
+        return parse_type_line(self.type_line) if self.type_line else None
 
     @property
     def supertypes(self) -> list[str]:
-        return self.parse_types().supertypes if self.parse_types() else []
+        return list(self.parse_types().supertypes) if self.parse_types() else []
 
     @property
     def regular_types(self) -> list[str]:
-        return self.parse_types().regular_types if self.parse_types() else []
+        return list(self.parse_types().regular_types) if self.parse_types() else []
 
     @property
     def subtypes(self) -> list[str]:
-        return self.parse_types().subtypes if self.parse_types() else []
+        return list(self.parse_types().subtypes) if self.parse_types() else []
 
     @property
     def races(self) -> list[str]:
-        return self.parse_types().races if self.parse_types() else []
+        return list(self.parse_types().races) if self.parse_types() else []
 
     @property
     def classes(self) -> list[str]:
-        return self.parse_types().classes if self.parse_types() else []
+        return list(self.parse_types().classes) if self.parse_types() else []
 
-    @cached_property
+    @property
     def lord_sentences(self) -> list[LordSentence]:
         return Card.parse_lord_sentences(self.oracle_text)
 
@@ -720,12 +920,10 @@ class Card:
             ValueError on invalid format designation
         """
         fmt = fmt.lower()
-        if fmt not in self.formats:
+        if fmt not in self.legalities:
             raise ValueError(f"Invalid format: {fmt!r}. Can be only one of: '{self.formats}'")
 
-        if self.legalities[fmt] == "legal":
-            return True
-        return False
+        return self.legalities[fmt] == "legal"
 
     def is_banned_in(self, fmt: str) -> bool:
         """Returns `True` if this card is banned in format designated by `fmt`.
@@ -739,12 +937,10 @@ class Card:
             ValueError on invalid format designation
         """
         fmt = fmt.lower()
-        if fmt not in self.formats:
+        if fmt not in self.legalities:
             raise ValueError(f"Invalid format: {fmt!r}. Can be only one of: '{self.formats}'")
 
-        if self.legalities[fmt] == "banned":
-            return True
-        return False
+        return self.legalities[fmt] == "banned"
 
     def is_restricted_in(self, fmt: str) -> bool:
         """Returns `True` if this card is restricted in format designated by `fmt`.
@@ -758,12 +954,10 @@ class Card:
             ValueError on invalid format designation
         """
         fmt = fmt.lower()
-        if fmt not in self.formats:
+        if fmt not in self.legalities:
             raise ValueError(f"Invalid format: {fmt!r}. Can be only one of: '{self.formats}'")
 
-        if self.legalities[fmt] == "restricted":
-            return True
-        return False
+        return self.legalities[fmt] == "restricted"
 
     @property
     def legal_formats(self) -> list[str]:
@@ -782,17 +976,16 @@ class Card:
     def not_legal_anywhere(self) -> bool:
         return all(v == "not_legal" for v in self.legalities.values())
 
-    @lru_cache
     def parse_types(self) -> TypeLine | None:
         if self.is_multifaced:
             return None
-        return TypeLine(self.type_line)
+        return parse_type_line(self.type_line)
 
     @property
     def supertypes(self) -> list[str]:
         if self.is_multifaced:
             return sorted({t for face in self.card_faces for t in face.supertypes})
-        return self.parse_types().supertypes
+        return list(self.parse_types().supertypes)
 
     @property
     def is_legendary(self) -> bool:
@@ -806,7 +999,7 @@ class Card:
     def regular_types(self) -> list[str]:
         if self.is_multifaced:
             return sorted({t for face in self.card_faces for t in face.regular_types})
-        return self.parse_types().regular_types
+        return list(self.parse_types().regular_types)
 
     @property
     def is_artifact(self) -> bool:
@@ -848,7 +1041,7 @@ class Card:
     def subtypes(self) -> list[str]:
         if self.is_multifaced:
             return sorted({t for face in self.card_faces for t in face.subtypes})
-        return self.parse_types().subtypes
+        return list(self.parse_types().subtypes)
 
     @property
     def is_vehicle(self) -> bool:
@@ -874,13 +1067,13 @@ class Card:
     def races(self) -> list[str]:
         if self.is_multifaced:
             return sorted({t for face in self.card_faces for t in face.races})
-        return self.parse_types().races
+        return list(self.parse_types().races)
 
     @property
     def classes(self) -> list[str]:
         if self.is_multifaced:
             return sorted({t for face in self.card_faces for t in face.classes})
-        return self.parse_types().classes
+        return list(self.parse_types().classes)
 
     @property
     def is_permanent(self) -> bool:
@@ -910,29 +1103,18 @@ class Card:
     def is_alchemy_rebalance(self) -> bool:
         return self.name.startswith(ALCHEMY_REBALANCE_INDICATOR)
 
-    @cached_property
+    @property
     def alchemy_rebalance(self) -> Self | None:
         """Find Alchemy rebalanced version of this card and return it, or 'None' if there's no
         such card.
         """
-        if self.is_multifaced:
-            name = MULTIFACE_SEPARATOR.join(
-                f"{ALCHEMY_REBALANCE_INDICATOR}{cf.name}" for cf in self.card_faces)
-        else:
-            name = f"{ALCHEMY_REBALANCE_INDICATOR}{self.name}"
-        return find_by_name(name, query_api=False)
+        return alchemy_rebalances().rebalance(self)
 
-    @cached_property
+    @property
     def alchemy_rebalance_original(self) -> Self | None:
         """If this card is Alchemy rebalance, return the original card. Return 'None' otherwise.
         """
-        if not self.is_alchemy_rebalance:
-            return None
-        if self.is_multifaced:
-            name = MULTIFACE_SEPARATOR.join(cf.name[2:] for cf in self.card_faces)
-        else:
-            name = self.name[2:]
-        return find_by_name(name, query_api=False)
+        return alchemy_rebalances().original(self)
 
     @property
     def has_alchemy_rebalance(self) -> bool:
@@ -940,16 +1122,9 @@ class Card:
 
     @staticmethod
     def parse_lord_sentences(oracle_text: str) -> list[LordSentence]:
-        if not oracle_text:
-            return []
-        lord_sentences = []
-        for sentence in oracle_text.split("."):
-            lord_sentence = LordSentence(sentence)
-            if lord_sentence.is_valid:
-                lord_sentences.append(lord_sentence)
-        return lord_sentences
-
-    @cached_property
+        return list(parse_lord_sentences(oracle_text))
+
+    @property
     def lord_sentences(self) -> list[LordSentence]:
         sentences = []
         if self.is_multifaced:
@@ -1085,10 +1260,7 @@ def sets() -> set[SetData]:
     if not source.exists():
         raise FileNotFoundError(f"Scryfall sets data file is missing at: '{source}'")
 
-    with source.open() as f:
-        data = json.load(f)
-
-    return {SetData(set_data) for set_data in data}
+    return {SetData(set_data) for set_data in iter_json_array(source)}
 
 
 def find_sets(
@@ -1110,10 +1282,462 @@ def find_set(
 
 
 def find_set_by_code(*set_codes: str, data: Iterable[SetData] | None = None) -> SetData | None:
-    """Return a MtG set designated by provided code or `None`.
+    """Return a MtG set designated by provided code (the first found if many are provided) or
+    `None`.
     """
-    data = data or sets()
-    return find_set(lambda s: s.set_code in {sc.lower() for sc in set_codes}, data)
+    if not data:
+        return from_iterable(
+            (set_index().find(code) for code in set_codes), lambda s: s is not None)
+    set_codes = {sc.lower() for sc in set_codes}
+    return find_set(lambda s: s.code in set_codes, data)
+
+
+class SetIndex:
+    """Lookup index of MtG sets by code with sets ordered by release date.
+
+    Each set gets a release ordinal (its position in the release order), so that finding the
+    newest of many sets is a matter of comparing integers.
+    """
+    def __init__(self, data: Iterable[SetData]) -> None:
+        # dates in ISO format compare correctly as strings, codes break the ties
+        self._ordered = sorted(data, key=lambda s: (s.json.get("released_at") or "", s.code))
+        self._sets = {s.code: s for s in self._ordered}
+        self._ordinals = {s.code: i for i, s in enumerate(self._ordered)}
+
+    def __len__(self) -> int:
+        return len(self._ordered)
+
+    def __iter__(self) -> Iterator[SetData]:
+        return iter(self._ordered)
+
+    def find(self, set_code: str) -> SetData | None:
+        return self._sets.get(set_code.lower())
+
+    def ordinal(self, set_code: str) -> int | None:
+        """Return position of the set designated by ``set_code`` in the release order or `None`
+        if there's no such set.
+        """
+        return self._ordinals.get(set_code.lower())
+
+    def latest(
+            self, *set_codes: str,
+            predicate: Callable[[SetData], bool] | None = None) -> SetData | None:
+        """Return the most recently released of sets designated by ``set_codes`` (optionally,
+        only of those satisfying ``predicate``) or `None`.
+        """
+        latest, latest_ordinal = None, -1
+        for code in set_codes:
+            ordinal = self.ordinal(code)
+            if ordinal is None or ordinal <= latest_ordinal:
+                continue
+            set_data = self._ordered[ordinal]
+            if predicate and not predicate(set_data):
+                continue
+            latest, latest_ordinal = set_data, ordinal
+        return latest
+
+
+@lru_cache
+def set_index() -> SetIndex:
+    """Return the index of all Scryfall set data.
+    """
+    return SetIndex(sets())
+
+
+# (types, subtypes) pair (or `None` if there's no parsable type line) and lord sentences'
+# (text, prefix, buff, suffix) quadruples for each card face (or the card itself, if not
+# multifaced)
+type _CardParses = tuple[tuple[tuple[tuple[str, ...], tuple[str, ...]] | None, tuple[
+    tuple[str, str, str, str], ...]], ...]
+# snapshot record: (card JSON data, not legal anywhere flag, token flag, parses)
+type _SnapshotRecord = tuple[Json, bool, bool, _CardParses]
+
+
+def _parse_card(card_data: Json) -> _CardParses:
+    parses = []
+    for unit in card_data.get("card_faces") or [card_data]:
+        text, types = unit.get("type_line"), None
+        if text and MULTIFACE_SEPARATOR not in text:
+            type_line = parse_type_line(text)
+            types = type_line.types, type_line.subtypes
+        # not memoized, so the texts of the whole streamed bulk data don't pile up
+        lords = tuple(
+            (ls.text, ls.prefix, ls.buff, ls.suffix)
+            for ls in _parse_lord_sentences(unit.get("oracle_text") or ""))
+        parses.append((types, lords))
+    return tuple(parses)
+
+
+def _register_parses(card_data: Json, parses: _CardParses) -> None:
+    """Register precomputed ``parses`` of ``card_data``, so they don't need to be re-done.
+    """
+    for unit, (types, lords) in zip(card_data.get("card_faces") or [card_data], parses):
+        text = unit.get("type_line")
+        if types is not None and text not in _type_lines:
+            _type_lines[text] = TypeLine(text, types)
+        text = unit.get("oracle_text")
+        if text and text not in _lord_sentences:
+            _lord_sentences[text] = tuple(
+                LordSentence(sentence, parsed) for sentence, *parsed in lords)
+
+
+# keys of card data that are ever read (all others are dropped from the snapshot)
+_CARD_KEYS = frozenset({
+    "card_faces", "cardmarket_id", "cmc", "collector_number", "color_identity", "colors",
+    "games", "id", "keywords", "layout", "legalities", "loyalty", "mana_cost", "mtgo_id",
+    "name", "oracle_id", "oracle_text", "power", "prices", "rarity", "released_at", "reprint",
+    "set", "set_name", "set_type", "set_uri", "tcgplayer_id", "toughness", "type_line"})
+_CARD_FACE_KEYS = frozenset({
+    "colors", "loyalty", "mana_cost", "name", "oracle_id", "oracle_text", "power", "toughness",
+    "type_line"})
+_PRICE_KEYS = frozenset({"usd", "tix"})
+# keys of card data with values that repeat a lot across cards
+_INTERNED_KEYS = frozenset({
+    "layout", "loyalty", "mana_cost", "power", "rarity", "released_at", "set", "set_name",
+    "set_type", "set_uri", "toughness", "type_line"})
+_INTERNED_LIST_KEYS = frozenset({"color_identity", "colors", "games", "keywords"})
+
+
+def _intern(data: Json, keys: frozenset[str]) -> Json:
+    compact = {}
+    for key, value in data.items():
+        if key not in keys:
+            continue
+        if key in _INTERNED_KEYS and isinstance(value, str):
+            value = sys.intern(value)
+        elif key in _INTERNED_LIST_KEYS:
+            value = [sys.intern(item) for item in value]
+        elif key == "legalities":
+            value = {sys.intern(fmt): sys.intern(legality) for fmt, legality in value.items()}
+        elif key == "prices":
+            value = {sys.intern(k): v for k, v in value.items() if k in _PRICE_KEYS}
+        elif key == "card_faces":
+            value = [_intern(face, _CARD_FACE_KEYS) for face in value]
+        compact[sys.intern(key)] = value
+    return compact
+
+
+def _compact_card_data(card_data: Json) -> Json:
+    """Return ``card_data`` stripped of keys that are never read and with frequently repeated
+    string values interned.
+
+    Marshal preserves interning, so the repeated values of the whole card pool loaded from the
+    snapshot share single string objects.
+    """
+    return _intern(card_data, _CARD_KEYS)
+
+
+def _snapshot_record(card_data: Json) -> _SnapshotRecord:
+    card_data = _compact_card_data(card_data)
+    card = Card(card_data)
+    return card_data, card.not_legal_anywhere, card.is_token, _parse_card(card_data)
+
+
+def iter_json_array(source: Path, chunk_size=1 << 16) -> Generator[Json, None, None]:
+    """Parse a JSON array file at ``source`` one item at a time.
+
+    Only a single item (plus a read-ahead chunk of text) is held in memory at any moment.
+    """
+    decoder = json.JSONDecoder()
+    with source.open(encoding="utf-8") as f:
+        buffer, pos, eof = "", 0, False
+        started = False
+        while True:
+            # skip whitespace, array delimiters and separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and not started:
+                if buffer[pos] != "[":
+                    raise ScryfallError(f"Not a JSON array: '{source}'")
+                started, pos = True, pos + 1
+                continue
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                if pos >= len(buffer):
+                    raise json.JSONDecodeError("Buffer exhausted", buffer, pos)
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ScryfallError(f"Truncated JSON array: '{source}'")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield item
+
+
+def _source_key(source: Path, sha256: str | None = None) -> dict[str, int | str]:
+    """Return a key identifying the current state of bulk data ``source`` file.
+
+    SHA-256 of the file is only computed if not provided by the caller.
+    """
+    stat = source.stat()
+    if sha256 is None:
+        with source.open("rb") as f:
+            sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+    return {
+        "version": SNAPSHOT_VERSION,
+        "python": list(sys.version_info[:2]),  # marshal format is Python version-specific
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+    }
+
+
+def _content_key(key: dict[str, int | str]) -> dict[str, int | str]:
+    """Return the part of snapshot ``key`` that identifies the snapshot's content (i.e. without
+    the source file's stats that change on re-stamping).
+    """
+    return {k: v for k, v in key.items() if k not in ("size", "mtime_ns")}
+
+
+def _write_snapshot(key: dict[str, int | str], write_records: Callable[[BinaryIO], None]) -> None:
+    # a uniquely named temporary file replaces the snapshot only when complete, so readers
+    # never see a partial one and concurrent writers don't clobber each other's files
+    dst = getdir(DATA_DIR) / SNAPSHOT_FILENAME
+    with tempfile.NamedTemporaryFile(
+            dir=dst.parent, prefix=f"{dst.name}.", suffix=".tmp", delete=False) as f:
+        try:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            write_records(f)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, dst)
+
+
+def _dump_cards_snapshot(
+        key: dict[str, int | str], records: Iterable[_SnapshotRecord]) -> None:
+    """Dump ``records`` into a snapshot file, one at a time, so they can be streamed on load.
+    """
+    def write_records(f: BinaryIO) -> None:
+        for record in records:
+            marshal.dump(record, f)
+
+    _write_snapshot(key, write_records)
+
+
+def _iter_snapshot_records(source: Path) -> Generator[_SnapshotRecord, None, None]:
+    for card_data in iter_json_array(source):
+        yield _snapshot_record(card_data)
+
+
+@timed("building Scryfall cards snapshot", precision=1)
+def _build_cards_snapshot(source: Path) -> None:
+    """Parse bulk data JSON at ``source`` and compile it into a binary snapshot.
+
+    Filtering flags, type lines' and lord sentences' parses are precomputed, so that loading
+    from the snapshot doesn't need to parse any of that. The source is streamed, so only one
+    card is held in memory at a time.
+    """
+    _log.info(f"Building Scryfall cards snapshot from '{source}'...")
+    # the key needs to be computed upfront (the source is hashed in a separate pass anyway)
+    _dump_cards_snapshot(_source_key(source), _iter_snapshot_records(source))
+
+
+def _read_snapshot_key() -> dict[str, int | str] | None:
+    """Return the key of the current snapshot (without loading its records) or `None`.
+    """
+    snapshot = DATA_DIR / SNAPSHOT_FILENAME
+    if not snapshot.exists():
+        return None
+    try:
+        with snapshot.open("rb") as f:
+            return pickle.load(f)
+    except (EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _read_snapshot_records() -> Generator[_SnapshotRecord, None, None]:
+    with (DATA_DIR / SNAPSHOT_FILENAME).open("rb") as f:
+        pickle.load(f)  # skip the key
+        while True:
+            try:
+                yield marshal.load(f)
+            except EOFError:
+                return
+
+
+def _ensure_cards_snapshot(source: Path) -> None:
+    """Ensure there's a current binary snapshot of bulk data ``source``.
+
+    The snapshot is keyed on the source's size, modification time and SHA-256 hash. If size
+    and mtime don't match, but the hash does (e.g. the same data re-downloaded), the snapshot is
+    only re-stamped. Otherwise, or if there's no usable snapshot, it's rebuilt from the source.
+    """
+    key = _read_snapshot_key()
+    if key is None:
+        _build_cards_snapshot(source)
+        return
+    stat = source.stat()
+    if key.get("version") != SNAPSHOT_VERSION or key.get(
+            "python") != list(sys.version_info[:2]):
+        _log.info("Outdated Scryfall cards snapshot format")
+        _build_cards_snapshot(source)
+    elif key.get("size") != stat.st_size or key.get("mtime_ns") != stat.st_mtime_ns:
+        new_key = _source_key(source)
+        if new_key["sha256"] != key.get("sha256"):
+            _log.info("Scryfall bulk data changed since the last snapshot")
+            _build_cards_snapshot(source)
+        else:
+            with (DATA_DIR / SNAPSHOT_FILENAME).open("rb") as src:
+                pickle.load(src)  # skip the old key
+                _write_snapshot(new_key, lambda dst: shutil.copyfileobj(src, dst))
+
+
+def _iter_cards_snapshot(source: Path) -> Generator[_SnapshotRecord, None, None]:
+    """Stream card records from the binary snapshot of bulk data ``source`` (ensuring it's
+    current first).
+    """
+    _ensure_cards_snapshot(source)
+    try:
+        yield from _read_snapshot_records()
+    except (ValueError, TypeError) as err:
+        # a corrupted snapshot
+        _log.warning(f"Unable to load Scryfall cards snapshot: {err!r}")
+        (DATA_DIR / SNAPSHOT_FILENAME).unlink(missing_ok=True)
+        raise ScryfallError("Corrupted Scryfall cards snapshot (removed)") from err
+
+
+def _load_cards_snapshot(source: Path) -> list[_SnapshotRecord]:
+    """Load all card records from the binary snapshot of bulk data ``source``.
+    """
+    return [*_iter_cards_snapshot(source)]
+
+
+def build_cards_snapshot() -> None:
+    """Build the binary snapshot of the downloaded bulk data anew (e.g. for benchmarking).
+    """
+    _build_cards_snapshot(getdir(DATA_DIR) / CARDS_FILENAME)
+
+
+def iter_cards_snapshot() -> Generator[Json, None, None]:
+    """Stream card data of all cards (tokens and not-legal-anywhere ones included) from the
+    binary snapshot of the downloaded bulk data (ensuring it's current first).
+    """
+    for card_data, *_ in _iter_cards_snapshot(getdir(DATA_DIR) / CARDS_FILENAME):
+        yield card_data
+
+
+# fields that change all the time and are disregarded when diffing bulk data versions
+VOLATILE_FIELDS = ("prices", "edhrec_rank", "penny_rank")
+
+
+def _digest(card_data: Json) -> bytes:
+    """Return a digest of ``card_data`` content (disregarding volatile fields).
+    """
+    stable = {k: v for k, v in card_data.items() if k not in VOLATILE_FIELDS}
+    # not marshal, as its output depends on strings' interning and reference counts
+    text = json.dumps(stable, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class BulkDataChangelog:
+    """Cards added, removed and changed between two consecutive versions of Scryfall bulk data
+    (as lists of (ID, name) pairs).
+    """
+    added: list[tuple[str, str]]
+    removed: list[tuple[str, str]]
+    changed: list[tuple[str, str]]
+
+    def __str__(self) -> str:
+        return (f"{len(self.added)} card(s) added, {len(self.removed)} removed, "
+                f"{len(self.changed)} changed")
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.added and not self.removed and not self.changed
+
+    @property
+    def names(self) -> set[str]:
+        return {name for _, name in itertools.chain(self.added, self.removed, self.changed)}
+
+    @property
+    def json(self) -> Json:
+        return {
+            "added": [{"id": id_, "name": name} for id_, name in self.added],
+            "removed": [{"id": id_, "name": name} for id_, name in self.removed],
+            "changed": [{"id": id_, "name": name} for id_, name in self.changed],
+        }
+
+    def dump(self) -> Path:
+        dst = getdir(DATA_DIR) / f"scryfall_changelog_{timestamp()}.json"
+        dst.write_text(json.dumps(self.json, indent=2, ensure_ascii=False), encoding="utf-8")
+        _log.info(f"Scryfall bulk data changelog dumped at: '{dst}'")
+        return dst
+
+
+@timed("refreshing Scryfall bulk data", precision=1)
+def refresh_scryfall_bulk_data() -> BulkDataChangelog | None:
+    """Download fresh Scryfall 'Oracle Cards' bulk data and apply only the differences to the
+    persisted snapshot and indexes.
+
+    Cards are diffed by ID and a digest of their (non-volatile) content. Unchanged cards reuse
+    their precomputed snapshot flags, the columnar store is updated row-wise and only API cache
+    entries of the affected names get invalidated. The changes are logged and dumped as a
+    changelog.
+
+    Returns:
+        the changelog or `None` if there was no usable earlier version (and everything got
+        built from scratch)
+    """
+    source, key = DATA_DIR / CARDS_FILENAME, _read_snapshot_key()
+    if not source.exists() or key is None or key.get("version") != SNAPSHOT_VERSION or key.get(
+            "python") != list(sys.version_info[:2]):
+        download_scryfall_bulk_data()
+        return None
+
+    stat = source.stat()
+    if not _download_oracle_cards() and (stat.st_size, stat.st_mtime_ns) == (
+            key.get("size"), key.get("mtime_ns")):
+        _log.info("No changes in Scryfall bulk data")
+        return BulkDataChangelog([], [], [])
+
+    # (digest, name, not legal anywhere, token, parses) per card ID
+    previous = {
+        data["id"]: (_digest(data), data["name"], not_legal_anywhere, is_token, parses)
+        for data, not_legal_anywhere, is_token, parses in _read_snapshot_records()}
+    new_key = _source_key(source)
+    if new_key["sha256"] == key["sha256"]:
+        _ensure_cards_snapshot(source)  # only re-stamp
+        _log.info("No changes in Scryfall bulk data")
+        return BulkDataChangelog([], [], [])
+
+    added, changed, upserted, prices = [], [], [], {}
+
+    def records() -> Generator[_SnapshotRecord, None, None]:
+        for data in iter_json_array(source):
+            data = _compact_card_data(data)
+            prev = previous.pop(data["id"], None)
+            price_data = data.get("prices", {})
+            prices[data["id"]] = getfloat(price_data.get("usd")), getfloat(price_data.get("tix"))
+            if prev and prev[0] == _digest(data):
+                yield data, *prev[2:]
+                continue
+            record = _snapshot_record(data)
+            data = record[0]
+            (changed if prev else added).append((data["id"], data["name"]))
+            upserted.append(record)
+            yield record
+
+    _dump_cards_snapshot(new_key, records())
+    removed = [(id_, name) for id_, (_, name, *_) in previous.items()]
+    changelog = BulkDataChangelog(added, removed, changed)
+    _log.info(f"Scryfall bulk data refreshed: {changelog}")
+
+    try:
+        CardColumns.update(
+            DATA_DIR / COLUMNS_DIRNAME, new_key, upserted, [id_ for id_, _ in removed], prices)
+    except (OSError, KeyError, ValueError) as err:
+        # a missing or outdated store gets rebuilt lazily
+        _log.warning(f"Unable to update columnar card store: {err!r}")
+    api_cache().delete(*changelog.names)
+    _invalidate_caches()
+    changelog.dump()
+    return changelog
 
 
 @lru_cache
@@ -1133,6 +1757,11 @@ def bulk_data(legal_only=True, non_token_only=True) -> set[Card]:
             long are consider official. This strict metric excludes Alchemy cards though, so
             this function takes care to consider Alchemy sets as official even if Scryfall doesn't.
 
+        Card data is streamed from a binary snapshot compiled once per bulk data download (see:
+        `_ensure_cards_snapshot()`) instead of re-parsing the JSON on each load. Filtered out
+        cards are never retained. The default pool is indexed for lookups (see: `CardIndex`) in
+        the same pass.
+
     Args:
         legal_only: return only cards that are legal in at least one format, defaults to ``True``
         non_token_only: return only non-token cards, defaults to ``True``
@@ -1144,55 +1773,135 @@ def bulk_data(legal_only=True, non_token_only=True) -> set[Card]:
     if not source.exists():
         download_scryfall_bulk_data()
 
-    with source.open() as f:
-        data = json.load(f)
+    def ingest() -> Generator[Card, None, None]:
+        for card_data, not_legal_anywhere, is_token, parses in _iter_cards_snapshot(source):
+            if (legal_only and not_legal_anywhere) or (non_token_only and is_token):
+                continue
+            _register_parses(card_data, parses)
+            yield Card(card_data)
 
-    cards = {Card(card_data) for card_data in data}
+    if legal_only and non_token_only:
+        return set(card_index().ingest(ingest()))
+    return set(ingest())
 
-    if legal_only:
-        cards = {c for c in cards if not c.not_legal_anywhere}
 
-    if non_token_only:
-        cards = {c for c in cards if not c.is_token}
+@dataclass(frozen=True)
+class PoolStats:
+    """Statistics of a card pool as counts of cards per value of the most important card
+    attributes.
+    """
+    size: int
+    games: Counter
+    colors: Counter
+    set_codes: Counter
+    set_names: Counter
+    formats: Counter  # legal formats only
+    layouts: Counter
+    rarities: Counter
+    keywords: Counter
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Card]) -> Self:
+        """Compute statistics in a single pass over ``cards``.
+        """
+        size = 0
+        games, colors, set_codes, set_names = PyCounter(), PyCounter(), PyCounter(), PyCounter()
+        formats, layouts, rarities, keywords = PyCounter(), PyCounter(), PyCounter(), PyCounter()
+        for card in cards:
+            size += 1
+            games.update(card.games)
+            colors.update(card.colors)
+            set_codes[card.set] += 1
+            set_names[card.set_name] += 1
+            formats.update(fmt for fmt, legality in card.legalities.items() if legality == "legal")
+            layouts[card.layout] += 1
+            rarities[card.rarity.value] += 1
+            keywords.update(card.keywords)
+        return cls(
+            size, Counter(games), Counter(colors), Counter(set_codes), Counter(set_names),
+            Counter(formats), Counter(layouts), Counter(rarities), Counter(keywords))
+
+
+_POOL_STATS_CACHE_SIZE = 32
+_pool_stats_cache: OrderedDict[bytes, PoolStats] = OrderedDict()
 
-    return cards
+
+def _fingerprint(cards: Collection[Card]) -> bytes:
+    # a digest of sorted Scryfall IDs (repetitions included), as built-in hash() can collide
+    digest = hashlib.blake2b(digest_size=16)
+    for id_ in sorted(card.id for card in cards):
+        digest.update(id_.encode("utf-8") + b"\n")
+    return digest.digest()
+
+
+@lru_cache
+def _bulk_data_stats() -> PoolStats:
+    return PoolStats.from_cards(bulk_data())
+
+
+def pool_stats(data: Iterable[Card] | None = None) -> PoolStats:
+    """Return statistics of ``data`` card pool (or of the whole bulk data if not specified).
+
+    Results are memoized per the pool's fingerprint so that subsequent calls for the same
+    (even if re-created) pool cost only a digest pass. Statistics of the whole bulk data are
+    memoized until it changes and cost no digest pass at all.
+    """
+    if not data:
+        return _bulk_data_stats()
+    if not isinstance(data, Collection):
+        data = list(data)
+    key = _fingerprint(data)
+    if stats := _pool_stats_cache.get(key):
+        _pool_stats_cache.move_to_end(key)
+        return stats
+    stats = PoolStats.from_cards(data)
+    _pool_stats_cache[key] = stats
+    if len(_pool_stats_cache) > _POOL_STATS_CACHE_SIZE:
+        _pool_stats_cache.popitem(last=False)
+    return stats
+
+
+def log_bulk_data_footprint() -> tuple[int, int]:
+    """Log the memory footprint of the `bulk_data()` card pool compared to the same cards as
+    plainly parsed from the bulk data JSON (i.e. without dropped keys and interning).
+
+    Returns:
+        (plain footprint, actual footprint) in bytes
+    """
+    cards = bulk_data()
+    ids = {card.id for card in cards}
+    plain = [Card(data) for data in iter_json_array(DATA_DIR / CARDS_FILENAME) if data["id"] in ids]
+    before, after = deep_sizeof(plain), deep_sizeof(cards)
+    _log.info(
+        f"Bulk data card pool ({len(cards)} card(s)) takes {after / 1024 ** 2:.1f} MB instead "
+        f"of {before / 1024 ** 2:.1f} MB ({(before - after) * 100 / before:.1f}% less)")
+    return before, after
 
 
 def games(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of string designations for games that can be played with cards in Scryfall data.
     """
-    data = data or bulk_data()
-    result = set()
-    for card in data:
-        result.update(card.games)
-
-    return sorted(result)
+    return sorted(pool_stats(data).games)
 
 
 def colors(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of string designations for MtG colors in Scryfall data.
     """
-    data = data or bulk_data()
-    result = set()
-    for card in data:
-        result.update(card.colors)
-    return sorted(result)
+    return sorted(pool_stats(data).colors)
 
 
 def set_codes(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of string codes for MtG sets in Scryfall data (e.g. 'bro' for The Brothers'
     War).
     """
-    data = data or bulk_data()
-    return sorted({card.set for card in data})
+    return sorted(pool_stats(data).set_codes)
 
 
 def formats(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of string designations for MtG formats that are legal for cards in the data
     specified.
     """
-    data = data or bulk_data()
-    return sorted({*itertools.chain(*[c.legal_formats for c in data])})
+    return sorted(pool_stats(data).formats)
 
 
 @lru_cache
@@ -1219,32 +1928,25 @@ COMMANDER_FORMATS = [
 def layouts(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of Scryfall string designations for card layouts in ``data``.
     """
-    data = data or bulk_data()
-    return sorted({card.layout for card in data})
+    return sorted(pool_stats(data).layouts)
 
 
 def set_names(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of MtG set names in Scryfall data.
     """
-    data = data or bulk_data()
-    return sorted({card.set_name for card in data})
+    return sorted(pool_stats(data).set_names)
 
 
 def rarities(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of MtG card rarities in Scryfall data.
     """
-    data = data or bulk_data()
-    return sorted({card.rarity.value for card in data})
+    return sorted(pool_stats(data).rarities)
 
 
 def keywords(data: Iterable[Card] | None = None) -> list[str]:
     """Return list of MtG card keywords in Scryfall data.
     """
-    data = data or bulk_data()
-    result = set()
-    for card in data:
-        result.update(card.keywords)
-    return sorted(result)
+    return sorted(pool_stats(data).keywords)
 
 
 def find_cards(
@@ -1269,13 +1971,24 @@ def set_cards(*set_codes: str, data: Iterable[Card] | None = None) -> set[Card]:
 
 
 @lru_cache
-def arena_cards() -> set[Card]:
+def arena_cards(rebalanced=False) -> set[Card]:
     """Return Scryfall bulk data filtered for only cards available on Arena.
+
+    Optionally, return the pool as seen in formats with Alchemy rebalances (i.e. with cards
+    that got rebalanced replaced by their rebalances).
     """
-    return find_cards(lambda c: "arena" in c.games)
+    cards = find_cards(lambda c: "arena" in c.games)
+    if rebalanced:
+        return set(alchemy_rebalances().rebalanced(cards))
+    return cards
 
 
 @lru_cache
+def _format_cards(fmt: str) -> frozenset[Card]:
+    columns = card_columns()
+    return frozenset(columns.select(columns.legality_in(fmt)))
+
+
 def format_cards(fmt: str, data: Iterable[Card] | None = None) -> set[Card]:
     """Return card data for MtG format designated by ``fmt``.
 
@@ -1285,7 +1998,32 @@ def format_cards(fmt: str, data: Iterable[Card] | None = None) -> set[Card]:
     available = set(all_formats())
     if fmt not in available:
         raise ValueError(f"Invalid format: {fmt!r}. Can be only one of: '{all_formats()}'")
-    return find_cards(lambda c: c.is_legal_in(fmt), data)
+    if not data:
+        return set(_format_cards(fmt))
+    columns = card_columns()
+    legal = columns.legality_in(fmt)
+    # cards missing from the local bulk data (e.g. obtained from Scryfall API) are checked as is
+    return {
+        card for card in data
+        if (legal[row] if (row := columns.row(card)) is not None else card.is_legal_in(fmt))}
+
+
+def is_deck_legal_in(fmt: str, cards: Iterable[Card]) -> bool:
+    """Return `True` if all ``cards`` are allowed in MtG format designated by ``fmt``.
+
+    Repeated cards denote multiple copies (this matters for restricted cards). Cards missing
+    from the local bulk data (e.g. obtained from Scryfall API) are checked as is.
+    """
+    return card_columns().is_deck_legal_in(fmt, cards)
+
+
+def deck_legal_formats(cards: Iterable[Card]) -> list[str]:
+    """Return MtG formats that allow all ``cards``.
+
+    Repeated cards denote multiple copies (this matters for restricted cards). Cards missing
+    from the local bulk data (e.g. obtained from Scryfall API) are checked as is.
+    """
+    return card_columns().deck_legal_formats(cards)
 
 
 def find_card(
@@ -1296,137 +2034,1584 @@ def find_card(
     return from_iterable(data, predicate)
 
 
-# cached lookups
-_names_cache, _scryfall_ids_cache, _collector_numbers_cache = {}, {}, {}
-_oracle_ids_cache, _tcgplayer_ids_cache, _cardmarket_ids_cache, _mtgo_ids_cache = {}, {}, {}, {}
+COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+
+
+def color_bits(*letters: str) -> int:
+    """Return a bitmask encoding of MtG color letters (as used by `CardColumns`).
+    """
+    return sum(COLOR_BITS[l] for l in {*letters})
+
+
+def _color_from_bits(bits: int) -> Color:
+    return Color(tuple(sorted(l for l, bit in COLOR_BITS.items() if bits & bit)))
+
+
+class CardColumns:
+    """Columnar, memory-mapped companion store of card attributes.
+
+    Each column is a NumPy array saved as an .npy file and memory-mapped on load, so multiple
+    processes share one copy of the data through the OS page cache. Rows follow the order of
+    the cards snapshot records (including tokens and not-legal-anywhere cards that are masked
+    out by ``pool``).
+
+    Enum-like columns (rarity, set, layout) are coded as indices into vocabularies, colors as
+    bitmasks (see: `color_bits()`), type flags as bitmasks (see: ``TYPE_FLAGS``) and missing
+    numeric values as NaN.
+
+    Legalities form a cards x formats bit-matrix: for each legality status (legal, banned,
+    restricted) there's a column holding a bitmask of formats (see: ``vocabs["format"]``) with
+    that status. Formats with no bit set are 'not_legal'.
+    """
+    VERSION = 2
+    LEGALITY_STATUSES = ("legal", "banned", "restricted")
+    TYPE_FLAGS = (
+        "artifact", "battle", "creature", "enchantment", "instant", "land", "planeswalker",
+        "sorcery", "legendary", "basic", "token", "multifaced", "not_legal_anywhere")
+    COLUMNS = {
+        "cmc": np.float32,
+        "rarity": np.uint8,
+        "colors": np.uint8,
+        "color_identity": np.uint8,
+        "set": np.uint16,
+        "layout": np.uint8,
+        "price": np.float32,
+        "price_tix": np.float32,
+        "types": np.uint16,
+        "legal": np.uint64,
+        "banned": np.uint64,
+        "restricted": np.uint64,
+    }
+    MANIFEST_FILENAME = "manifest.json"
+
+    @property
+    def ids(self) -> list[str]:
+        return self._ids
+
+    @property
+    def vocabs(self) -> dict[str, list[str]]:
+        return self._vocabs
+
+    @property
+    def pool(self) -> np.ndarray:
+        """Return a mask of rows of legal non-token cards (as returned by `bulk_data()`).
+        """
+        return ~self.has_any_type("token", "not_legal_anywhere")
+
+    def __init__(self, root: Path) -> None:
+        manifest = json.loads((root / self.MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        self._version = manifest.get("version", 1)
+        self._key, self._ids, self._vocabs = manifest["key"], manifest["ids"], manifest["vocabs"]
+        self._rows = {id_: row for row, id_ in enumerate(self.ids)}
+        self._columns = {
+            name: np.load(root / f"{name}.npy", mmap_mode="r") for name in self.COLUMNS
+            if (root / f"{name}.npy").exists()}
+        self._cards: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    @classmethod
+    def _encode(
+            cls, columns: dict[str, np.ndarray], row: int, record: _SnapshotRecord,
+            codes: dict[str, dict[str, int]]) -> None:
+        data, not_legal_anywhere, _, parses = record
+        _register_parses(data, parses)
+        card = Card(data)
+        columns["cmc"][row] = data.get("cmc", np.nan)
+        columns["rarity"][row] = codes["rarity"][data["rarity"]]
+        columns["colors"][row] = color_bits(*card.colors)
+        columns["color_identity"][row] = color_bits(*data["color_identity"])
+        columns["set"][row] = codes["set"][data["set"]]
+        columns["layout"][row] = codes["layout"][data["layout"]]
+        columns["price"][row] = card.price if card.price is not None else np.nan
+        columns["price_tix"][row] = card.price_tix if card.price_tix is not None else np.nan
+        flags = [
+            card.is_artifact, card.is_battle, card.is_creature, card.is_enchantment,
+            card.is_instant, card.is_land, card.is_planeswalker, card.is_sorcery,
+            card.is_legendary, "Basic" in card.supertypes, card.is_token, card.is_multifaced,
+            not_legal_anywhere]
+        columns["types"][row] = sum(1 << i for i, flag in enumerate(flags) if flag)
+        for legality in cls.LEGALITY_STATUSES:
+            columns[legality][row] = 0
+        for fmt, legality in data["legalities"].items():
+            if legality in cls.LEGALITY_STATUSES:
+                columns[legality][row] |= np.uint64(1 << codes["format"][fmt])
+
+    @staticmethod
+    def _extend_vocabs(vocabs: dict[str, list[str]], records: list[_SnapshotRecord]) -> None:
+        # new values are appended, so that already assigned codes stay valid
+        for name, field in (("set", "set"), ("layout", "layout")):
+            known = set(vocabs[name])
+            vocabs[name] += sorted({data[field] for data, *_ in records} - known)
+        known = set(vocabs["format"])
+        vocabs["format"] += sorted(
+            {fmt for data, *_ in records for fmt in data["legalities"]} - known)
+        if len(vocabs["format"]) > 64:
+            raise ScryfallError(f"Too many formats to encode: {len(vocabs['format'])}")
+
+    @classmethod
+    def _save(
+            cls, root: Path, key: dict[str, int | str], ids: list[str],
+            vocabs: dict[str, list[str]], columns: dict[str, np.ndarray]) -> None:
+        root.mkdir(parents=True, exist_ok=True)
+        # files are replaced (not overwritten) so the processes that have them memory-mapped
+        # keep reading the old data undisturbed
+        for name, column in columns.items():
+            tmp = root / f"{name}.tmp.npy"
+            np.save(tmp, column)
+            os.replace(tmp, root / f"{name}.npy")
+        manifest = {"version": cls.VERSION, "key": key, "ids": ids, "vocabs": vocabs}
+        # manifest goes last so an interrupted build is never picked up as valid
+        tmp = root / f"{cls.MANIFEST_FILENAME}.tmp"
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, root / cls.MANIFEST_FILENAME)
+
+    @classmethod
+    def build(cls, root: Path, key: dict[str, int | str], records: list[_SnapshotRecord]) -> None:
+        """Build the columns from the snapshot ``records`` and save them at ``root``.
+        """
+        vocabs = {"rarity": [r.value for r in Rarity], "set": [], "layout": [], "format": []}
+        cls._extend_vocabs(vocabs, records)
+        codes = {name: {v: i for i, v in enumerate(vocab)} for name, vocab in vocabs.items()}
+        columns = {name: np.zeros(len(records), dtype=dtype) for name, dtype in cls.COLUMNS.items()}
+        for row, record in enumerate(records):
+            cls._encode(columns, row, record, codes)
+        cls._save(root, key, [data["id"] for data, *_ in records], vocabs, columns)
+
+    @classmethod
+    def update(
+            cls, root: Path, key: dict[str, int | str], upserted: list[_SnapshotRecord],
+            removed: Iterable[str],
+            prices: dict[str, tuple[float | None, float | None]] | None = None) -> None:
+        """Apply changes to the columns saved at ``root``: re-encode ``upserted`` records (
+        appending new ones) and drop rows of ``removed`` card IDs.
+
+        Optionally, refresh (USD, TIX) prices of all rows from ``prices`` mapping of card IDs.
+        """
+        current, removed = cls(root), {*removed}
+        if current._version != cls.VERSION:
+            raise ScryfallError(f"Cannot update columns of outdated version {current._version}")
+        keep = np.array([row for row, id_ in enumerate(current.ids) if id_ not in removed],
+                        dtype=np.int64)
+        ids = [current.ids[row] for row in keep]
+        rows = {id_: row for row, id_ in enumerate(ids)}
+        added = [r for r in upserted if r[0]["id"] not in rows]
+        columns = {
+            name: np.concatenate([current[name][keep], np.zeros(len(added), dtype=dtype)])
+            for name, dtype in cls.COLUMNS.items()}
+        for record in added:
+            rows[record[0]["id"]] = len(ids)
+            ids.append(record[0]["id"])
+        vocabs = {name: [*vocab] for name, vocab in current.vocabs.items()}
+        cls._extend_vocabs(vocabs, upserted)
+        codes = {name: {v: i for i, v in enumerate(vocab)} for name, vocab in vocabs.items()}
+        for record in upserted:
+            cls._encode(columns, rows[record[0]["id"]], record, codes)
+        if prices:
+            for id_, (usd, tix) in prices.items():
+                if (row := rows.get(id_)) is not None:
+                    columns["price"][row] = usd if usd is not None else np.nan
+                    columns["price_tix"][row] = tix if tix is not None else np.nan
+        del current  # release the memory-maps before replacing files
+        cls._save(root, key, ids, vocabs, columns)
+
+    def is_current(self, key: dict[str, int | str]) -> bool:
+        return self._version == self.VERSION and self._key.get("sha256") == key.get("sha256")
+
+    def row(self, card: Card) -> int | None:
+        return self._rows.get(card.id)
+
+    def rows(self, cards: Iterable[Card]) -> np.ndarray:
+        """Return row indices of ``cards`` (cards unknown to this store are skipped).
+        """
+        return np.fromiter(
+            (row for card in cards if (row := self._rows.get(card.id)) is not None),
+            dtype=np.int64)
+
+    def mask(self, cards: Iterable[Card]) -> np.ndarray:
+        """Return a boolean mask of rows of ``cards``.
+        """
+        result = np.zeros(len(self), dtype=bool)
+        result[self.rows(cards)] = True
+        return result
+
+    def _type_bits(self, *types: str) -> int:
+        return sum(1 << self.TYPE_FLAGS.index(t.lower()) for t in types)
+
+    def has_types(self, *types: str) -> np.ndarray:
+        """Return a mask of rows having all of ``types`` flags.
+        """
+        bits = self._type_bits(*types)
+        return (self["types"] & bits) == bits
+
+    def has_any_type(self, *types: str) -> np.ndarray:
+        """Return a mask of rows having at least one of ``types`` flags.
+        """
+        return (self["types"] & self._type_bits(*types)) != 0
+
+    def _coded_in(self, name: str, *values: str) -> np.ndarray:
+        vocab = self.vocabs[name]
+        codes = [vocab.index(v.lower()) for v in values if v.lower() in vocab]
+        return np.isin(self[name], codes)
+
+    def rarity_in(self, *rarities: Rarity | str) -> np.ndarray:
+        return self._coded_in(
+            "rarity", *[r.value if isinstance(r, Rarity) else r for r in rarities])
+
+    def set_in(self, *set_codes: str) -> np.ndarray:
+        return self._coded_in("set", *set_codes)
 
+    def layout_in(self, *layouts: str) -> np.ndarray:
+        return self._coded_in("layout", *layouts)
+
+    def cmc_between(self, low: float = 0, high: float = math.inf) -> np.ndarray:
+        cmc = np.nan_to_num(self["cmc"])
+        return (cmc >= low) & (cmc <= high)
+
+    def color_identity_is(self, color: Color) -> np.ndarray:
+        return self["color_identity"] == color_bits(*color.value)
+
+    def color_identity_within(self, color: Color) -> np.ndarray:
+        """Return a mask of rows with color identity fitting within ``color`` (e.g. for
+        commander decks).
+        """
+        return (self["color_identity"] & ~np.uint8(color_bits(*color.value))) == 0
+
+    def color_identity_counts(self, mask: np.ndarray | None = None) -> dict[Color, int]:
+        """Return count of rows per color identity (within ``mask``, if specified).
+        """
+        column = self["color_identity"] if mask is None else self["color_identity"][mask]
+        values, counts = np.unique(column, return_counts=True)
+        return {_color_from_bits(int(v)): int(c) for v, c in zip(values, counts)}
+
+    def _format_bit(self, fmt: str) -> np.uint64:
+        fmt = fmt.lower()
+        if fmt not in self.vocabs["format"]:
+            raise ValueError(
+                f"Invalid format: {fmt!r}. Can be only one of: '{self.vocabs['format']}'")
+        return np.uint64(1 << self.vocabs["format"].index(fmt))
+
+    def _bits_to_formats(self, bits: int) -> list[str]:
+        return [fmt for i, fmt in enumerate(self.vocabs["format"]) if bits & (1 << i)]
+
+    def legality_in(self, fmt: str, legality="legal") -> np.ndarray:
+        """Return a mask of rows with ``legality`` status in format designated by ``fmt``.
+        """
+        bit = self._format_bit(fmt)
+        if legality == "not_legal":
+            allowed = self["legal"] | self["banned"] | self["restricted"]
+            return (allowed & bit) == 0
+        if legality not in self.LEGALITY_STATUSES:
+            raise ValueError(f"Invalid legality: {legality!r}")
+        return (self[legality] & bit) != 0
+
+    def _legalities_to_bits(self, card: Card, copies: int) -> int:
+        bits = 0
+        for i, fmt in enumerate(self.vocabs["format"]):
+            legality = card.legalities.get(fmt)
+            if legality == "legal" or (legality == "restricted" and copies == 1):
+                bits |= 1 << i
+        return bits
+
+    def _deck_allowed_bits(self, cards: Iterable[Card]) -> int:
+        rows, unknown = [], PyCounter()
+        for card in cards:
+            if (row := self._rows.get(card.id)) is not None:
+                rows.append(row)
+            else:
+                unknown[card] += 1
+        allowed = (1 << len(self.vocabs["format"])) - 1
+        rows, counts = np.unique(np.array(rows, dtype=np.int64), return_counts=True)
+        if len(rows):
+            bits = self["legal"][rows] | self["restricted"][rows]
+            # restricted means at most one copy
+            bits[counts > 1] &= ~self["restricted"][rows[counts > 1]]
+            allowed &= int(np.bitwise_and.reduce(bits))
+        # cards missing from the local bulk data (e.g. obtained from Scryfall API) are checked
+        # against their own legalities
+        for card, copies in unknown.items():
+            allowed &= self._legalities_to_bits(card, copies)
+        return allowed
+
+    def is_deck_legal_in(self, fmt: str, cards: Iterable[Card]) -> bool:
+        """Return `True` if all ``cards`` (with repetitions denoting copies) are allowed in
+        format designated by ``fmt``.
+        """
+        return bool(self._deck_allowed_bits(cards) & int(self._format_bit(fmt)))
+
+    def deck_legal_formats(self, cards: Iterable[Card]) -> list[str]:
+        """Return formats that allow all ``cards`` (with repetitions denoting copies).
+        """
+        return self._bits_to_formats(self._deck_allowed_bits(cards))
 
-@timed("caching cards for fast lookups")
-def _cache_cards() -> None:
-    _log.info("Caching cards for fast lookups...")
-    for card in bulk_data():
-        _names_cache[unidecode(card.name).casefold()] = card
+    def select(self, mask: np.ndarray) -> set[Card]:
+        """Return `bulk_data()` cards for rows selected by ``mask``.
+        """
+        if self._cards is None:
+            self._cards = np.empty(len(self), dtype=object)
+            for card in bulk_data():
+                if (row := self._rows.get(card.id)) is not None:
+                    self._cards[row] = card
+        return {card for card in self._cards[mask & self.pool] if card is not None}
+
+
+@lru_cache
+def card_columns() -> CardColumns:
+    """Return the columnar card store, (re)building it if it's missing or outdated.
+    """
+    source = getdir(DATA_DIR) / CARDS_FILENAME
+    if not source.exists():
+        download_scryfall_bulk_data()
+    root = DATA_DIR / COLUMNS_DIRNAME
+    _ensure_cards_snapshot(source)
+    key = _read_snapshot_key()
+    if (root / CardColumns.MANIFEST_FILENAME).exists():
+        columns = CardColumns(root)
+        if columns.is_current(key):
+            return columns
+    _log.info("Building columnar card store...")
+    CardColumns.build(root, key, _load_cards_snapshot(source))
+    return CardColumns(root)
+
+
+def iter_bulk_lines(source: Path) -> Iterable[tuple[int, bytes]]:
+    """Yield (byte offset, raw JSON object) pairs from Scryfall bulk data file at ``source``.
+
+    Scryfall bulk data files are JSON arrays with each object on its own line.
+    """
+    with source.open("rb") as f:
+        offset = 0
+        for line in f:
+            stripped = line.strip().rstrip(b",")
+            if stripped.startswith(b"{"):
+                yield offset + line.index(b"{"), stripped
+            elif stripped not in (b"[", b"]", b""):
+                raise ScryfallError(f"Unexpected bulk data format at offset {offset}")
+            offset += len(line)
+
+
+class PrintingsIndex:
+    """On-disk index of Scryfall bulk data featuring all card printings ('Default Cards' or 'All
+    Cards').
+
+    The index is a SQLite database mapping printings' IDs (Scryfall, TCG Player, Cardmarket,
+    MTGO) and (set code, collector number) pairs to byte spans within the bulk data file. This
+    way the (big) file never has to sit in memory and each lookup only decodes the printing it
+    needs.
+    """
+    COLUMNS = ("id", "set_code", "collector_number", "tcgplayer_id", "cardmarket_id", "mtgo_id")
+
+    @property
+    def source(self) -> Path:
+        return self._source
+
+    def __init__(self, source: Path) -> None:
+        self._source = source
+        self._path = source.with_suffix(".db")
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # a per-instance cache (instead of decorating the method) so it doesn't pin the instance
+        self._decode = lru_cache(maxsize=4096)(self._decode_span)
+
+    def _stamp(self) -> str:
+        stat = self.source.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    @property
+    def is_current(self) -> bool:
+        if not self._path.exists():
+            return False
+        with closing(sqlite3.connect(self._path)) as conn:
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+            except sqlite3.OperationalError:
+                return False
+        return row is not None and row[0] == self._stamp()
+
+    @timed("indexing Scryfall printings data", precision=1)
+    def build(self) -> None:
+        _log.info(f"Indexing Scryfall printings data at '{self.source}'...")
+        tmp = self._path.with_suffix(".tmp")
+        tmp.unlink(missing_ok=True)
+        # closed (not only committed) before the file gets moved
+        with closing(sqlite3.connect(tmp)) as conn, conn:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE printings (offset INTEGER, length INTEGER, id TEXT, set_code TEXT, "
+                "collector_number TEXT, tcgplayer_id INTEGER, cardmarket_id INTEGER, "
+                "mtgo_id INTEGER)")
+            rows = []
+            for offset, raw in iter_bulk_lines(self.source):
+                data = json.loads(raw)
+                rows.append((
+                    offset, len(raw), data["id"], data["set"], data["collector_number"],
+                    data.get("tcgplayer_id"), data.get("cardmarket_id"), data.get("mtgo_id")))
+            conn.executemany("INSERT INTO printings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            for column in ("id", "tcgplayer_id", "cardmarket_id", "mtgo_id"):
+                conn.execute(f"CREATE INDEX idx_{column} ON printings ({column})")
+            conn.execute("CREATE INDEX idx_number ON printings (set_code, collector_number)")
+            conn.execute("INSERT INTO meta VALUES ('stamp', ?)", (self._stamp(),))
+        os.replace(tmp, self._path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if not self.is_current:
+                self.build()
+            self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection (if open). Next lookup opens it again.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _decode_span(self, offset: int, length: int) -> Card:
+        with self.source.open("rb") as f:
+            f.seek(offset)
+            return Card(json.loads(f.read(length)))
+
+    def _find(self, where: str, *params: str | int) -> Card | None:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT offset, length FROM printings WHERE {where} LIMIT 1", params).fetchone()
+        return self._decode(*row) if row else None
+
+    def find_by_scryfall_id(self, scryfall_id: str) -> Card | None:
+        return self._find("id = ?", scryfall_id)
+
+    def find_by_collector_number(self, set_code: str, collector_number: str) -> Card | None:
+        return self._find(
+            "set_code = ? AND collector_number = ?", set_code.lower(), str(collector_number))
+
+    def find_by_tcgplayer_id(self, tcgplayer_id: int) -> Card | None:
+        return self._find("tcgplayer_id = ?", tcgplayer_id)
+
+    def find_by_cardmarket_id(self, cardmarket_id: int) -> Card | None:
+        return self._find("cardmarket_id = ?", cardmarket_id)
+
+    def find_by_mtgo_id(self, mtgo_id: int) -> Card | None:
+        return self._find("mtgo_id = ?", mtgo_id)
+
+
+@lru_cache
+def printings_index() -> PrintingsIndex | None:
+    """Return the printings index or `None` if the printings data hasn't been downloaded (see:
+    `download_scryfall_printings_data()`).
+    """
+    source = DATA_DIR / PRINTINGS_FILENAME
+    return PrintingsIndex(source) if source.exists() else None
+
+
+def _invalidate_caches() -> None:
+    """Invalidate all in-process data derived from bulk data.
+    """
+    for cached in (
+            bulk_data, card_columns, all_set_codes, all_formats, arena_cards, _format_cards,
+            _bulk_data_stats, query_api_for_card):
+        cached.cache_clear()
+    _type_lines.clear()
+    _lord_sentences.clear()
+    _pool_stats_cache.clear()
+    card_index().invalidate()
+
+
+class NameNormalizer:
+    """Canonical card name normalizer (used for both indexing and lookups) with a bounded memo
+    of raw input to canonical key.
+
+    The memo is meant for lookups (the same names get looked up over and over again), indexing
+    should use the uncached `canonical()`. Tracks its hit rate (see: `log_stats()`).
+    """
+    DEFAULT_MAXSIZE = 16_384
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE) -> None:
+        self._maxsize = maxsize
+        self._memo: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._hits, self._misses = 0, 0
+
+    @staticmethod
+    def canonical(name: str) -> str:
+        """Return the canonical lookup key for ``name``: transliterated, casefolded and with
+        whitespace collapsed.
+        """
+        return " ".join(unidecode(name).casefold().split())
+
+    def __call__(self, name: str) -> str:
+        if (key := self._memo.get(name)) is not None:
+            self._hits += 1
+            return key
+        key = self.canonical(name)
+        with self._lock:
+            self._misses += 1
+            if len(self._memo) >= self.maxsize:  # evict the oldest entry
+                del self._memo[next(iter(self._memo))]
+            self._memo[name] = key
+        return key
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        if total:
+            _log.info(
+                f"Card name normalizer memo answered {self.hits}/{total} lookup(s) "
+                f"({self.hits * 100 / total:.2f}%) holding {len(self._memo)}/{self.maxsize} "
+                f"name(s)")
+
+    def reset_stats(self) -> None:
+        self._hits, self._misses = 0, 0
+
+
+_NAME_NORMALIZER = NameNormalizer()
+
+
+def normalize_card_name(name: str) -> str:
+    """Return the canonical lookup key for card ``name`` (memoized).
+    """
+    return _NAME_NORMALIZER(name)
+
+
+def log_name_normalizer_stats(reset=True) -> None:
+    """Log hit rate of the card name normalizer memo and, optionally, reset it (e.g. at the end
+    of a scraping session).
+    """
+    _NAME_NORMALIZER.log_stats()
+    if reset:
+        _NAME_NORMALIZER.reset_stats()
+
+
+class FuzzyNameIndex:
+    """Trigram-based fuzzy matching index over card and card faces' names.
+
+    Meant to resolve typos, stray punctuation and wrong face separators locally before any
+    Scryfall API call is made. Tracks its hit rate (see: `log_stats()`).
+    """
+    THRESHOLD = 0.85  # minimum similarity ratio of a confident match
+    MIN_CANDIDATE_SCORE = 0.5  # minimum trigrams Dice coefficient of a candidate
+    MAX_CANDIDATES = 10
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __init__(self, names: Iterable[tuple[str, Card]]) -> None:
+        self._keys: list[str] = []
+        self._cards: list[Card] = []
+        self._sizes: list[int] = []  # trigram set sizes
+        self._exact: dict[str, int] = {}
+        self._postings: defaultdict[str, list[int]] = defaultdict(list)
+        for name, card in names:
+            key = self.normalize(name)
+            if not key or key in self._exact:
+                continue
+            self._exact[key] = len(self._keys)
+            trigrams = self.trigrams(key)
+            for trigram in trigrams:
+                self._postings[trigram].append(len(self._keys))
+            self._keys.append(key)
+            self._sizes.append(len(trigrams))
+            self._cards.append(card)
+        self._hits, self._misses = 0, 0
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalize ``name`` for fuzzy matching: canonicalize (see: `NameNormalizer`), unify face
+        separators and drop any punctuation.
+        """
+        text = NameNormalizer.canonical(name)
+        text = re.sub(r"\s*/+\s*", " / ", text)
+        text = re.sub(r"[^\w/ ]+", "", text)
+        return " ".join(text.split())
+
+    @staticmethod
+    def trigrams(key: str) -> set[str]:
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _find(self, name: str) -> Card | None:
+        key = self.normalize(name)
+        if not key:
+            return None
+        if (idx := self._exact.get(key)) is not None:
+            return self._cards[idx]
+
+        trigrams = self.trigrams(key)
+        counts = defaultdict(int)
+        for trigram in trigrams:
+            for idx in self._postings.get(trigram, ()):
+                counts[idx] += 1
+        candidates = []
+        for idx, common in counts.items():
+            dice = 2 * common / (len(trigrams) + self._sizes[idx])
+            if dice >= self.MIN_CANDIDATE_SCORE:
+                candidates.append((dice, idx))
+        candidates.sort(reverse=True)
+
+        scored = sorted(
+            ((SequenceMatcher(None, key, self._keys[idx]).ratio(), idx)
+             for _, idx in candidates[:self.MAX_CANDIDATES]), reverse=True)
+        if not scored or scored[0][0] < self.THRESHOLD:
+            return None
+        best_ratio, best_idx = scored[0]
+        # two different cards matching equally well means no confident match
+        if any(ratio == best_ratio and self._cards[idx] != self._cards[best_idx]
+               for ratio, idx in scored[1:]):
+            return None
+        return self._cards[best_idx]
+
+    def find(self, name: str, track=True) -> Card | None:
+        """Return a card best matching ``name`` or `None` if there's no confident match.
+
+        Unless ``track`` is `False` the outcome is counted in the hit rate stats.
+        """
+        card = self._find(name)
+        if not track:
+            return card
+        if card:
+            self._hits += 1
+            _log.info(f"Fuzzy-matched {name!r} to {card.name!r}")
+        else:
+            self._misses += 1
+        return card
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        if total:
+            _log.info(
+                f"Fuzzy card name index resolved {self.hits}/{total} local lookup miss(es) "
+                f"({self.hits * 100 / total:.2f}%) saving as many Scryfall API queries")
+
+    def reset_stats(self) -> None:
+        self._hits, self._misses = 0, 0
+
+
+class WordIndex:
+    """Inverted index of words (tokens) in card and card faces' names.
+
+    Multi-word searches are intersections of (usually small) postings. Query words are matched
+    as prefixes of name words via a sorted vocabulary.
+    """
+    def __init__(self, names: Iterable[tuple[str, Card]]) -> None:
+        self._cards: list[Card] = []
+        rows: dict[Card, int] = {}
+        postings: defaultdict[str, set[int]] = defaultdict(set)
+        for name, card in names:
+            if (row := rows.get(card)) is None:
+                row = rows[card] = len(self._cards)
+                self._cards.append(card)
+            for token in self.tokenize(name):
+                postings[token].add(row)
+        self._postings = {token: frozenset(rows) for token, rows in postings.items()}
+        self._vocabulary = sorted(self._postings)
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        """Split ``text`` into normalized words (apostrophes are dropped, so that e.g. "urza's"
+        is the word "urzas").
+        """
+        text = NameNormalizer.canonical(text).replace("'", "")
+        return re.findall(r"\w+", text)
+
+    def _prefixed(self, prefix: str) -> set[int]:
+        rows = set()
+        for idx in range(bisect.bisect_left(self._vocabulary, prefix), len(self._vocabulary)):
+            token = self._vocabulary[idx]
+            if not token.startswith(prefix):
+                break
+            rows.update(self._postings[token])
+        return rows
+
+    def find(self, *words: str, prefix=True) -> set[Card]:
+        """Return cards having all of ``words`` in their name (or, by default, words starting
+        with them).
+        """
+        tokens = {token for word in words for token in self.tokenize(word)}
+        if not tokens:
+            return set()
+        matches = [
+            self._prefixed(token) if prefix else self._postings.get(token, frozenset())
+            for token in tokens]
+        matches.sort(key=len)
+        rows = set(matches[0])
+        for other in matches[1:]:
+            if not rows:
+                break
+            rows &= other
+        return {self._cards[row] for row in rows}
+
+
+def _alchemy_original_name(card_data: Json) -> str | None:
+    """Return the name of the card Alchemy rebalanced card designated by ``card_data`` is based
+    on, or `None` if it's not a rebalance.
+    """
+    if not card_data["name"].startswith(ALCHEMY_REBALANCE_INDICATOR):
+        return None
+    if card_data.get("card_faces"):
+        return MULTIFACE_SEPARATOR.join(
+            face["name"].removeprefix(ALCHEMY_REBALANCE_INDICATOR)
+            for face in card_data["card_faces"])
+    return card_data["name"].removeprefix(ALCHEMY_REBALANCE_INDICATOR)
+
+
+class AlchemyRebalanceMap:
+    """Bidirectional mapping between cards that got Alchemy rebalance treatment and their
+    rebalanced counterparts.
+
+    Both directions are keyed by canonical names (see: `NameNormalizer`), so the mapping works
+    for any printing of a card.
+    """
+    def __init__(self, pairs: Iterable[tuple[Card, Card]]) -> None:
+        self._rebalances: dict[str, Card] = {}  # original's name ==> rebalance
+        self._originals: dict[str, Card] = {}  # rebalance's name ==> original
+        for original, rebalance in pairs:
+            self._rebalances[NameNormalizer.canonical(original.name)] = rebalance
+            self._originals[NameNormalizer.canonical(rebalance.name)] = original
+
+    @classmethod
+    def from_names(cls, names: dict[str, Card]) -> Self:
+        """Build the map from a mapping of canonical card names to cards.
+        """
+        pairs = []
+        for rebalance in {card for card in names.values() if card.is_alchemy_rebalance}:
+            name = NameNormalizer.canonical(_alchemy_original_name(rebalance.json))
+            if original := names.get(name):
+                pairs.append((original, rebalance))
+        return cls(pairs)
+
+    def __len__(self) -> int:
+        return len(self._rebalances)
+
+    def rebalance(self, card: Card) -> Card | None:
+        """Return Alchemy rebalanced version of ``card`` or `None` if there's no such card.
+        """
+        return self._rebalances.get(NameNormalizer.canonical(card.name))
+
+    def original(self, card: Card) -> Card | None:
+        """Return the original of Alchemy rebalanced ``card`` or `None` if it's not a rebalance.
+        """
+        return self._originals.get(NameNormalizer.canonical(card.name))
+
+    def rebalanced(self, cards: Iterable[Card]) -> list[Card]:
+        """Return ``cards`` with those that got rebalanced replaced with their rebalances.
+        """
+        return [self.rebalance(card) or card for card in cards]
+
+    def originals(self, cards: Iterable[Card]) -> list[Card]:
+        """Return ``cards`` with Alchemy rebalances replaced with their originals.
+        """
+        return [self.original(card) or card for card in cards]
+
+    def normalize(
+            self, cards: Iterable[Card], fmt: str,
+            rebalanced_pool: Container[Card] | None = None) -> list[Card]:
+        """Return ``cards`` with those that aren't legal in ``fmt`` replaced with their original
+        or rebalanced counterparts that are (if there are any).
+
+        If ``rebalanced_pool`` is specified, only rebalances within it are swapped in.
+        """
+        normalized = []
+        for card in cards:
+            if fmt in card.legalities and not card.is_legal_in(fmt):
+                counterpart = (
+                    self.original(card) if card.is_alchemy_rebalance else self.rebalance(card))
+                if counterpart and not card.is_alchemy_rebalance and rebalanced_pool is not None:
+                    counterpart = counterpart if counterpart in rebalanced_pool else None
+                if counterpart and counterpart.is_legal_in(fmt):
+                    card = counterpart
+            normalized.append(card)
+        return normalized
+
+
+def alchemy_rebalances() -> AlchemyRebalanceMap:
+    """Return the Alchemy rebalance map (of the shared card index, if attached).
+    """
+    if _shared_card_index is not None:
+        return _shared_card_index.rebalances
+    return card_index().rebalances
+
+
+def normalize_alchemy_rebalances(cards: Iterable[Card], fmt: str) -> list[Card]:
+    """Return ``cards`` with those that aren't legal in ``fmt`` replaced with their original
+    or rebalanced counterparts that are (if there are any).
+    """
+    return alchemy_rebalances().normalize(cards, fmt)
+
+
+class CardIndex:
+    """Lookup indexes of bulk data cards by name and identifiers.
+
+    Built lazily, only once and under a lock, so it's safe to share between threads. Use
+    `warm()` to build it eagerly (e.g. before spawning workers) and `invalidate()` to drop it
+    when bulk data changes.
+
+    The indexes are filled while `bulk_data()` streams the default card pool, so building them
+    doesn't take another pass over the cards (unless the pool is already loaded).
+
+    The lock is reentrant as building may trigger the bulk data download (if there's no bulk
+    data file yet) that in turn invalidates this index from within the build.
+    """
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    @property
+    def names(self) -> dict[str, Card]:
+        """Return mapping of normalized card names (including faces' names) to cards.
+        """
+        return self.warm()._names
+
+    @property
+    def fuzzy(self) -> FuzzyNameIndex:
+        """Return the fuzzy card name index (building it on first use).
+        """
+        if self._fuzzy is None:
+            names = self.names
+            with self._lock:
+                if self._fuzzy is None:
+                    self._fuzzy = FuzzyNameIndex(names.items())
+        return self._fuzzy
+
+    @property
+    def words(self) -> WordIndex:
+        """Return the inverted index of words in card names (building it on first use).
+        """
+        if self._words is None:
+            names = self.names
+            with self._lock:
+                if self._words is None:
+                    self._words = WordIndex(names.items())
+        return self._words
+
+    @property
+    def rebalances(self) -> AlchemyRebalanceMap:
+        """Return the Alchemy rebalance map (building it on first use).
+        """
+        if self._rebalances is None:
+            names = self.names
+            with self._lock:
+                if self._rebalances is None:
+                    self._rebalances = AlchemyRebalanceMap.from_names(names)
+        return self._rebalances
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._built, self._building = False, False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._names: dict[str, Card] = {}
+        self._scryfall_ids: dict[str, Card] = {}
+        self._oracle_ids: dict[str, Card] = {}
+        self._tcgplayer_ids: dict[int, Card] = {}
+        self._cardmarket_ids: dict[int, Card] = {}
+        self._mtgo_ids: dict[int, Card] = {}
+        self._collector_numbers: dict[tuple[str, str], Card] = {}
+        self._fuzzy: FuzzyNameIndex | None = None
+        self._words: WordIndex | None = None
+        self._rebalances: AlchemyRebalanceMap | None = None
+
+    def _add(self, card: Card) -> None:
+        self._names[NameNormalizer.canonical(card.name)] = card
         if card.is_multifaced:
-            _names_cache[unidecode(card.first_face_name).casefold()] = card
-            _names_cache[unidecode(card.second_face_name).casefold()] = card
-        _scryfall_ids_cache[card.id] = card
-        _oracle_ids_cache[card.id] = card
+            self._names[NameNormalizer.canonical(card.first_face_name)] = card
+            self._names[NameNormalizer.canonical(card.second_face_name)] = card
+        self._scryfall_ids[card.id] = card
+        if oracle_id := card.json.get("oracle_id"):  # reversible cards have it only on faces
+            self._oracle_ids[oracle_id] = card
         if card.tcgplayer_id is not None:
-            _tcgplayer_ids_cache[card.tcgplayer_id] = card
+            self._tcgplayer_ids[card.tcgplayer_id] = card
         if card.cardmarket_id is not None:
-            _cardmarket_ids_cache[card.cardmarket_id] = card
+            self._cardmarket_ids[card.cardmarket_id] = card
         if card.mtgo_id is not None:
-            _mtgo_ids_cache[card.mtgo_id] = card
-        _collector_numbers_cache[(card.set, card.collector_number)] = card
+            self._mtgo_ids[card.mtgo_id] = card
+        self._collector_numbers[(card.set, card.collector_number)] = card
 
+    def ingest(self, cards: Iterable[Card]) -> Generator[Card, None, None]:
+        """Yield ``cards`` (the default bulk data pool streamed by `bulk_data()`) indexing them
+        on the way, unless the indexes are already built.
 
-@lru_cache(maxsize=None)
-def query_api_for_card(card_name: str, foreign=False) -> Card | None:
-    """Query Scryfall API for a card designated by provided name.
+        This way the indexes are built in the same pass as bulk data ingestion.
+        """
+        if self._built:
+            yield from cards
+            return
+        with self._lock:
+            if self._built:
+                yield from cards
+                return
+            _log.info("Building card lookup indexes...")
+            building, self._building = self._building, True
+            try:
+                for card in cards:
+                    self._add(card)
+                    yield card
+            except BaseException:
+                self._reset()
+                raise
+            finally:
+                self._building = building
+            self._built = True
+
+    def warm(self) -> Self:
+        """Build the indexes, unless already built. Concurrent callers wait for the first one to
+        finish.
+        """
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._building = True
+                    try:
+                        cards = bulk_data()  # builds the indexes, unless already loaded
+                        if not self._built:
+                            for card in cards:
+                                self._add(card)
+                    finally:
+                        self._building = False
+                    self._built = True
+        return self
+
+    def invalidate(self) -> None:
+        """Drop the indexes so they get rebuilt on next lookup. Lookups already in progress
+        finish on the old ones.
+
+        A no-op if called from within a build (that one reads the fresh bulk data anyway).
+        """
+        with self._lock:
+            if self._building:
+                return
+            self._built = False
+            self._reset()
+
+    def log_fuzzy_stats(self, reset=True) -> None:
+        """Log hit rate of the fuzzy name index (if it's been used) and, optionally, reset it.
+        """
+        if self._fuzzy is not None:
+            self._fuzzy.log_stats()
+            if reset:
+                self._fuzzy.reset_stats()
+
+    def find_by_name(self, card_name: str) -> Card | None:
+        return self.names.get(normalize_card_name(card_name))
+
+    def find_by_scryfall_id(self, scryfall_id: str) -> Card | None:
+        return self.warm()._scryfall_ids.get(scryfall_id)
+
+    def find_by_oracle_id(self, oracle_id: str) -> Card | None:
+        return self.warm()._oracle_ids.get(oracle_id)
+
+    def find_by_tcgplayer_id(self, tcgplayer_id: int) -> Card | None:
+        return self.warm()._tcgplayer_ids.get(tcgplayer_id)
+
+    def find_by_cardmarket_id(self, cardmarket_id: int) -> Card | None:
+        return self.warm()._cardmarket_ids.get(cardmarket_id)
+
+    def find_by_mtgo_id(self, mtgo_id: int) -> Card | None:
+        return self.warm()._mtgo_ids.get(mtgo_id)
+
+    def find_by_collector_number(
+            self, set_code: str, collector_number: str | int) -> Card | None:
+        return self.warm()._collector_numbers.get((set_code.lower(), str(collector_number)))
+
+
+_CARD_INDEX = CardIndex()
+
+
+def card_index() -> CardIndex:
+    """Return the card lookup indexes shared by the whole process.
     """
+    return _CARD_INDEX
+
+
+def fuzzy_index() -> FuzzyNameIndex:
+    """Return the fuzzy card name index (building it on first use).
+    """
+    return card_index().fuzzy
+
+
+def log_fuzzy_index_stats(reset=True) -> None:
+    """Log hit rate of the fuzzy card name index (if it's been used) and, optionally, reset it
+    (e.g. at the end of a scraping session).
+    """
+    card_index().log_fuzzy_stats(reset)
+
+
+class SharedCardIndex:
+    """Read-only card lookup index meant to be shared by a pool of worker processes.
+
+    The parent process publishes it once (see: `publish_shared_card_index()`) as a set of
+    memory-mapped NumPy arrays: sorted 64-bit hashes of lookup keys (normalized names, Scryfall
+    IDs and collector numbers) pointing at byte spans of records within the binary cards
+    snapshot (relative to the end of its key, so a re-stamped snapshot keeps the index valid).
+    Workers attach to it (see: `attach_shared_card_index()`), so the OS shares the pages between
+    them and each one decodes only the cards it actually looks up.
+
+    Rows of Alchemy rebalanced cards paired with their originals are stored too, so workers get
+    the Alchemy rebalance map without building the full in-process indexes.
+    """
+    VERSION = 3
+    KINDS = ("name", "scryfall_id", "collector_number")
+    MANIFEST_FILENAME = "manifest.json"
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def key(self) -> dict[str, int | str]:
+        return self._manifest["key"]
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._manifest = json.loads((root / self.MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        if self._manifest.get("version") != self.VERSION:
+            raise ScryfallError(f"Outdated shared card index at '{root}'")
+        self._spans = np.load(root / "spans.npy", mmap_mode="r")
+        self._hashes = {
+            kind: np.load(root / f"{kind}_hashes.npy", mmap_mode="r") for kind in self.KINDS}
+        self._rows = {
+            kind: np.load(root / f"{kind}_rows.npy", mmap_mode="r") for kind in self.KINDS}
+        self._rebalance_rows = np.load(root / "rebalances.npy")
+        self._rebalances: AlchemyRebalanceMap | None = None
+        with (DATA_DIR / SNAPSHOT_FILENAME).open("rb") as f:
+            if not self.is_current(pickle.load(f)):
+                raise ScryfallError(f"Shared card index at '{root}' doesn't match the snapshot")
+            self._data_offset = f.tell()
+            # a mapping stays valid even if the snapshot file gets replaced in the meantime
+            self._snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # a per-instance cache (instead of decorating the method) so it doesn't pin the instance
+        self._decode = lru_cache(maxsize=4096)(self._decode_row)
+
+    @property
+    def rebalances(self) -> AlchemyRebalanceMap:
+        """Return the Alchemy rebalance map (decoding the paired cards on first use).
+        """
+        if self._rebalances is None:
+            self._rebalances = AlchemyRebalanceMap(
+                (self._decode(int(original)), self._decode(int(rebalance)))
+                for original, rebalance in self._rebalance_rows)
+        return self._rebalances
+
+    def is_current(self, key: dict[str, int | str]) -> bool:
+        return _content_key(self.key) == _content_key(key)
+
+    @staticmethod
+    def hash(key: str) -> int:
+        # Python's built-in hash() is salted per process and so unusable here
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest())
+
+    @staticmethod
+    def _keys(card_data: Json) -> dict[str, list[str]]:
+        names = [card_data["name"]]
+        if card_data.get("card_faces"):
+            names += [face["name"] for face in card_data["card_faces"][:2]]
+        return {
+            "name": [NameNormalizer.canonical(name) for name in names],
+            "scryfall_id": [card_data["id"]],
+            "collector_number": [f"{card_data['set']}/{card_data['collector_number']}"],
+        }
+
+    @classmethod
+    @timed("publishing shared card index")
+    def build(cls, root: Path, key: dict[str, int | str]) -> None:
+        """Build the index over the default bulk data pool (legal, non-token cards) of the
+        current snapshot and save it at ``root``.
+        """
+        spans, entries = [], {kind: [] for kind in cls.KINDS}
+        name_rows, originals = {}, {}  # canonical name ==> row, rebalance's row ==> name
+        with (DATA_DIR / SNAPSHOT_FILENAME).open("rb") as f:
+            pickle.load(f)  # skip the key
+            data_offset = f.tell()
+            while True:
+                offset = f.tell()
+                try:
+                    card_data, not_legal_anywhere, is_token, _ = marshal.load(f)
+                except EOFError:
+                    break
+                if not_legal_anywhere or is_token:
+                    continue
+                row = len(spans)
+                spans.append((offset - data_offset, f.tell() - offset))
+                keys = cls._keys(card_data)
+                for kind, kind_keys in keys.items():
+                    entries[kind].extend((cls.hash(k), row) for k in dict.fromkeys(kind_keys))
+                name_rows.update((name, row) for name in keys["name"])
+                if original := _alchemy_original_name(card_data):
+                    originals[row] = NameNormalizer.canonical(original)
+
+        root.mkdir(parents=True, exist_ok=True)
+        (root / cls.MANIFEST_FILENAME).unlink(missing_ok=True)  # invalidate first
+        rebalances = [
+            (name_rows[name], row) for row, name in originals.items() if name in name_rows]
+        arrays = {
+            "spans": np.array(spans, dtype=np.int64).reshape(-1, 2),
+            "rebalances": np.array(rebalances, dtype=np.int32).reshape(-1, 2),
+        }
+        for kind, pairs in entries.items():
+            pairs.sort()
+            arrays[f"{kind}_hashes"] = np.array([h for h, _ in pairs], dtype=np.uint64)
+            arrays[f"{kind}_rows"] = np.array([r for _, r in pairs], dtype=np.int32)
+        for name, array in arrays.items():
+            tmp = root / f"{name}.tmp.npy"
+            np.save(tmp, array)
+            os.replace(tmp, root / f"{name}.npy")
+        tmp = root / f"{cls.MANIFEST_FILENAME}.tmp"
+        tmp.write_text(json.dumps({"version": cls.VERSION, "key": key}), encoding="utf-8")
+        os.replace(tmp, root / cls.MANIFEST_FILENAME)
+
+    def _decode_row(self, row: int) -> Card:
+        offset, length = self._spans[row]
+        offset += self._data_offset
+        card_data, _, _, parses = marshal.loads(self._snapshot[offset:offset + length])
+        _register_parses(card_data, parses)
+        return Card(card_data)
+
+    def close(self) -> None:
+        """Release the memory-mapped data. The index is unusable afterwards.
+        """
+        self._decode.cache_clear()
+        self._snapshot.close()
+        self._spans, self._hashes, self._rows = None, {}, {}
+
+    def _find(self, kind: str, key: str) -> Card | None:
+        hashes, rows, hash_ = self._hashes[kind], self._rows[kind], np.uint64(self.hash(key))
+        idx, found = int(np.searchsorted(hashes, hash_)), None
+        # entries of the same hash are ordered by row, so the last match is also the last one
+        # in the snapshot, i.e. the one `CardIndex` keeps for a key shared by several cards
+        while idx < len(hashes) and hashes[idx] == hash_:  # verify against hash collisions
+            card = self._decode(int(rows[idx]))
+            if key in self._keys(card.json)[kind]:
+                found = card
+            idx += 1
+        return found
+
+    def find_by_name(self, card_name: str) -> Card | None:
+        return self._find("name", normalize_card_name(card_name))
+
+    def find_by_scryfall_id(self, scryfall_id: str) -> Card | None:
+        return self._find("scryfall_id", scryfall_id)
+
+    def find_by_collector_number(
+            self, set_code: str, collector_number: str | int) -> Card | None:
+        return self._find("collector_number", f"{set_code.lower()}/{collector_number}")
+
+
+def publish_shared_card_index() -> Path:
+    """Ensure the shared card index is current and return its root directory (to be passed to
+    `attach_shared_card_index()` in worker processes).
+
+    Example:
+        >>> root = publish_shared_card_index()
+        >>> with ProcessPoolExecutor(
+        ...         initializer=attach_shared_card_index, initargs=(root,)) as executor:
+        ...     ...
+    """
+    source = getdir(DATA_DIR) / CARDS_FILENAME
+    if not source.exists():
+        download_scryfall_bulk_data()
+    _ensure_cards_snapshot(source)
+    key, root = _read_snapshot_key(), DATA_DIR / SHARED_INDEX_DIRNAME
+    if (root / SharedCardIndex.MANIFEST_FILENAME).exists():
+        try:
+            with closing(SharedCardIndex(root)) as index:
+                if index.is_current(key):
+                    return root
+        except (ScryfallError, OSError, ValueError) as err:
+            _log.warning(f"Unable to use shared card index: {err!r}")
+    _log.info("Publishing shared card index...")
+    SharedCardIndex.build(root, key)
+    return root
+
+
+_shared_card_index: SharedCardIndex | None = None
+_shared_fuzzy_fallback = False
+
+
+def attach_shared_card_index(root: Path | None = None, fuzzy_fallback=False) -> None:
+    """Make this process resolve `find_by_name()`, `find_by_scryfall_id()` and
+    `find_by_collector_number()` against the shared card index published at ``root`` instead
+    of loading bulk data.
+
+    Meant as a `ProcessPoolExecutor` initializer. Name lookups that miss go straight to
+    Scryfall API, unless ``fuzzy_fallback`` is set (that, as well as other lookups, builds the
+    regular in-process indexes on first use).
+    """
+    global _shared_card_index, _shared_fuzzy_fallback
+    _shared_card_index = SharedCardIndex(root or DATA_DIR / SHARED_INDEX_DIRNAME)
+    _shared_fuzzy_fallback = fuzzy_fallback
+
+
+class ApiCache:
+    """Persistent on-disk cache of Scryfall API card lookups.
+
+    Both hits and misses are stored, keyed on the canonical queried name (see:
+    `NameNormalizer`) and the ``foreign`` flag. Entries older than ``ttl`` seconds are
+    considered expired. The cache is meant to be cleared on each bulk data refresh as then the
+    locally unknown cards become known.
+    """
+    FILENAME = "scryfall_api_cache.db"
+    DEFAULT_TTL = 30 * 24 * 60 * 60  # 30 days
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value: float) -> None:
+        self._ttl = value
+
+    def __init__(self, path: Path | None = None, ttl: float = DEFAULT_TTL) -> None:
+        self._path = path or getdir(DATA_DIR) / self.FILENAME
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lookups (name TEXT NOT NULL, foreign_ INTEGER NOT "
+                "NULL, data TEXT, timestamp REAL NOT NULL, PRIMARY KEY (name, foreign_))")
+
+    def get(self, card_name: str, foreign=False) -> tuple[bool, Json | None]:
+        """Return a (found, card data) tuple for ``card_name``. Card data is `None` for cached
+        misses.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, timestamp FROM lookups WHERE name = ? AND foreign_ = ?",
+                (NameNormalizer.canonical(card_name), int(foreign))).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return False, None
+        return True, json.loads(row[0]) if row[0] is not None else None
+
+    def put(self, card_name: str, foreign: bool, data: Json | None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?)",
+                (NameNormalizer.canonical(card_name), int(foreign),
+                 json.dumps(data) if data is not None else None, time.time()))
+
+    def delete(self, *card_names: str) -> None:
+        """Delete entries for ``card_names`` (both foreign and not).
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM lookups WHERE name = ?",
+                [(NameNormalizer.canonical(n),) for n in card_names])
+
+    def purge_expired(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM lookups WHERE timestamp < ?", (time.time() - self.ttl,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM lookups")
+        _log.info("Scryfall API lookups cache cleared")
+
+
+@lru_cache
+def api_cache() -> ApiCache:
+    """Return the persistent Scryfall API lookups cache.
+
+    Set its ``ttl`` property to configure entries' expiration.
+    """
+    return ApiCache()
+
+
+def _raise_unless_not_found(err: scrython.foundation.ScryfallError) -> None:
+    # only Scryfall's 404 means there's no such card, anything else (e.g. 429 or 5xx) is
+    # transient and mustn't be taken for a miss
+    if err.error_details.get("status") != 404:
+        raise err
+
+
+def _query_api_for_card_data(card_name: str, foreign=False) -> Json | None:
     _log.info(f"Querying Scryfall for {card_name!r}...")
     try:
+        throttle(API_QUERY_THROTTLE)
+        result = scrython.cards.Search(q=f"!{card_name}", include_multilingual=foreign).data()
+    except scrython.foundation.ScryfallError as err:
+        _raise_unless_not_found(err)
+        result = None
+    if not result:
+        throttle(API_QUERY_THROTTLE)
         try:
-            throttle(API_QUERY_THROTTLE)
-            result = scrython.cards.Search(q=f"!{card_name}", include_multilingual=foreign).data()
-        except (scrython.foundation.ScryfallError, ContentTypeError):
+            result = scrython.cards.Search(q=card_name, include_multilingual=foreign).data()
+        except scrython.foundation.ScryfallError as err:
+            _raise_unless_not_found(err)
             result = None
         if not result:
             throttle(API_QUERY_THROTTLE)
             try:
-                result = scrython.cards.Search(q=card_name, include_multilingual=foreign).data()
-            except (scrython.foundation.ScryfallError, ContentTypeError):
+                result = scrython.cards.Named(fuzzy=card_name)
+                return dict(result.scryfallJson)
+            except scrython.foundation.ScryfallError as err:
+                _raise_unless_not_found(err)
                 result = None
-            if not result :
+            if not result:
                 throttle(API_QUERY_THROTTLE)
                 try:
-                    result = scrython.cards.Named(fuzzy=card_name)
-                    return Card(dict(result.scryfallJson))
-                except (scrython.foundation.ScryfallError, ContentTypeError):
-                    result = None
-                if not result:
-                    throttle(API_QUERY_THROTTLE)
-                    try:
-                        result = scrython.cards.Named(fuzzy=unidecode(card_name))
-                        return Card(dict(result.scryfallJson))
-                    except (scrython.foundation.ScryfallError, ContentTypeError):
-                        return None
-    except (ServerTimeoutError, AsyncIoTimeoutError):
-        _log.warning("Scryfall API timed out")
-        return None
+                    result = scrython.cards.Named(fuzzy=unidecode(card_name))
+                    return dict(result.scryfallJson)
+                except scrython.foundation.ScryfallError as err:
+                    _raise_unless_not_found(err)
+                    return None
 
     if len(result) > 1:
         result.sort(key=lambda card: date.fromisoformat(card["released_at"]), reverse=True)
-    return Card(dict(result[0]))
+    return dict(result[0])
+
+
+@lru_cache(maxsize=None)
+def query_api_for_card(card_name: str, foreign=False) -> Card | None:
+    """Query Scryfall API for a card designated by provided name.
+
+    Results (both hits and misses) are persisted across runs (see: `ApiCache`), so only names
+    not already resolved (or with expired entries) trigger actual API calls. Failed queries
+    (timeouts, error responses other than 404 and non-JSON responses) aren't persisted.
+    """
+    cache = api_cache()
+    found, data = cache.get(card_name, foreign)
+    if not found:
+        try:
+            data = _query_api_for_card_data(card_name, foreign)
+        except (ServerTimeoutError, AsyncIoTimeoutError):
+            _log.warning("Scryfall API timed out")
+            return None
+        except (scrython.foundation.ScryfallError, ContentTypeError) as err:
+            _log.warning(f"Scryfall API query for {card_name!r} failed: {err!r}")
+            return None
+        cache.put(card_name, foreign, data)
+    return Card(data) if data else None
+
+
+class CollectionClient(Protocol):
+    """Network client for Scryfall's `/cards/collection` endpoint.
+
+    See: https://scryfall.com/docs/api/cards/collection
+    """
+    def fetch_collection(self, identifiers: list[Json]) -> Json:
+        """Return the endpoint's response data for ``identifiers``.
+        """
+        ...
+
+
+class RequestsCollectionClient:
+    """Default `CollectionClient` implementation.
+
+    Pointing ``base_url`` at a local stand-in server enables offline tests and benchmarks.
+    """
+    HEADERS = API_HEADERS
+
+    def __init__(self, base_url=API_URL, timeout=REQUESTS_TIMEOUT) -> None:
+        self._url = f"{base_url.rstrip('/')}/cards/collection"
+        self._timeout = timeout
+        self._session = requests.Session()
+
+    def fetch_collection(self, identifiers: list[Json]) -> Json:
+        response = self._session.post(
+            self._url, json={"identifiers": identifiers}, headers=self.HEADERS,
+            timeout=self._timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class CollectionResolver:
+    """Resolve card names in bulk with Scryfall's `/cards/collection` endpoint.
+
+    Names are requested in batches of up to ``BATCH_SIZE`` identifiers. Batches are fetched
+    concurrently, but no more often than ``interval`` seconds apart.
+    """
+    BATCH_SIZE = 75  # Scryfall's limit
+    DEFAULT_INTERVAL = 0.1  # Scryfall asks for 50-100 ms between requests
+
+    def __init__(
+            self, client: CollectionClient | None = None, max_workers=4,
+            interval=DEFAULT_INTERVAL) -> None:
+        self._client = client or RequestsCollectionClient()
+        self._max_workers = max_workers
+        self._limiter = RateLimiter(interval)
+
+    def _fetch_batch(self, names: list[str]) -> Json | None:
+        self._limiter.wait()
+        _log.info(f"Querying Scryfall collection endpoint for {len(names)} card name(s)...")
+        try:
+            return self._client.fetch_collection([{"name": name} for name in names])
+        except (requests.RequestException, ValueError) as err:
+            _log.warning(f"Scryfall collection query failed with: {err!r}")
+            return None
+
+    @staticmethod
+    def _match(names: list[str], response: Json) -> dict[str, Card | None]:
+        found = {}
+        for data in response.get("data", []):
+            card = Card(data)
+            for name in {card.name, *(face.name for face in card.card_faces)}:
+                found.setdefault(NameNormalizer.canonical(name), card)
+        return {name: found.get(normalize_card_name(name)) for name in names}
+
+    def resolve(self, *names: str) -> dict[str, Card | None]:
+        """Return a mapping of ``names`` to resolved cards (or `None` for names not found).
+
+        Names from batches that failed altogether are absent from the result.
+        """
+        names = [*dict.fromkeys(names)]
+        batches = [
+            names[i:i + self.BATCH_SIZE] for i in range(0, len(names), self.BATCH_SIZE)]
+        result = {}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for batch, response in zip(batches, executor.map(self._fetch_batch, batches)):
+                if response is not None:
+                    result.update(self._match(batch, response))
+        return result
+
+
+def _find_fuzzy(card_name: str, track=True) -> Card | None:
+    if _shared_card_index is not None and not _shared_fuzzy_fallback:
+        return None
+    return fuzzy_index().find(card_name, track=track)
+
+
+def prefetch_card_names(*names: str, resolver: CollectionResolver | None = None) -> None:
+    """Resolve in bulk those of ``names`` that cannot be resolved locally (nor are already
+    cached) and store the results in the persistent API cache.
+
+    This way subsequent `find_by_name()` calls for those names don't need to make individual API
+    calls. Only hits are cached as the collection endpoint (unlike `query_api_for_card()`)
+    doesn't do any fuzzy matching. Pass names in the form they're going to be looked up in
+    (e.g. sanitized by a deck parser), so those lookups hit the cache.
+    """
+    cache, unique = api_cache(), {}
+    for name in names:
+        if name:  # names differing only in case or whitespace get looked up only once
+            unique.setdefault(normalize_card_name(name), name)
+    unresolved = [
+        name for name in unique.values()
+        if not find_by_name(name, query_api=False)
+        and not cache.get(name)[0] and not _find_fuzzy(name, track=False)]
+    if not unresolved:
+        return
+    resolver = resolver or CollectionResolver()
+    resolved = resolver.resolve(*unresolved)
+    for name, card in resolved.items():
+        if card:
+            cache.put(name, False, card.json)
+    hits = sum(1 for card in resolved.values() if card)
+    _log.info(f"Prefetched {hits}/{len(unresolved)} locally unresolved card name(s)")
 
 
 def find_by_name(card_name: str, query_api=True) -> Card | None:
     """Return a card designated by provided name or `None`.
 
-    Case-insensitive. Calls Scryfall API on failure to find card in the bulk data.
+    Case-insensitive. On failure to find card in the bulk data, tries a local fuzzy match and
+    only then calls Scryfall API. Processes attached to the shared card index skip the fuzzy
+    match unless they opted in (see: `attach_shared_card_index()`).
     """
-    if not _names_cache:
-        _cache_cards()
-    if card := _names_cache.get(unidecode(card_name).casefold()):
+    if _shared_card_index is not None:
+        card = _shared_card_index.find_by_name(card_name)
+    else:
+        card = card_index().find_by_name(card_name)
+    if card:
         return card
-    return query_api_for_card(card_name) if query_api else None
+    if not query_api:
+        return None
+    return _find_fuzzy(card_name) or query_api_for_card(card_name)
 
 
-def find_by_words(*words: str) -> set[Card]:
+def find_by_words(*words: str, substring=False) -> set[Card]:
     """Return a set of cards that contain all provided words in their name.
+
+    By default, words are matched as prefixes of words in card names (e.g. "bolt" matches
+    "Lightning Bolt", "light bol" too, but "ghtning" doesn't) using an inverted index.
+    Optionally, they can be matched as any substrings of names, which is much slower.
     """
-    if not _names_cache:
-        _cache_cards()
-    return {v for k, v in _names_cache.items() if all(w.lower() in k.lower() for w in words)}
+    if not substring:
+        return card_index().words.find(*words)
+    words = [NameNormalizer.canonical(w) for w in words]
+    return {v for k, v in card_index().names.items() if all(w in k for w in words)}
 
 
 def find_by_scryfall_id(scryfall_id: str) -> Card | None:
     """Return a card designated BY provided ``scryfall_id`` or `None`.
     """
-    if not _scryfall_ids_cache:
-        _cache_cards()
-    return _scryfall_ids_cache.get(scryfall_id)
+    if _shared_card_index is not None:
+        card = _shared_card_index.find_by_scryfall_id(scryfall_id)
+    else:
+        card = card_index().find_by_scryfall_id(scryfall_id)
+    if card:
+        return card
+    index = printings_index()
+    return index.find_by_scryfall_id(scryfall_id) if index else None
 
 
 def find_by_oracle_id(oracle_id: str) -> Card | None:
     """Return a card designated BY provided ``oracle_id`` or `None`.
     """
-    if not _oracle_ids_cache:
-        _cache_cards()
-    return _oracle_ids_cache.get(oracle_id)
+    return card_index().find_by_oracle_id(oracle_id)
 
 
 def find_by_tcgplayer_id(tcgplayer_id: int) -> Card | None:
     """Return a card designated BY provided ``tcgplayer_id`` or `None`.
     """
-    if not _tcgplayer_ids_cache:
-        _cache_cards()
-    return _tcgplayer_ids_cache.get(tcgplayer_id)
+    if card := card_index().find_by_tcgplayer_id(tcgplayer_id):
+        return card
+    index = printings_index()
+    return index.find_by_tcgplayer_id(tcgplayer_id) if index else None
 
 
 def find_by_cardmarket_id(cardmarket_id: int) -> Card | None:
     """Return a card designated BY provided ``cardmarket_id`` or `None`.
     """
-    if not _cardmarket_ids_cache:
-        _cache_cards()
-    return _cardmarket_ids_cache.get(cardmarket_id)
+    if card := card_index().find_by_cardmarket_id(cardmarket_id):
+        return card
+    index = printings_index()
+    return index.find_by_cardmarket_id(cardmarket_id) if index else None
 
 
 def find_by_mtgo_id(mtgo_id: int) -> Card | None:
     """Return a card designated BY provided ``mtgo_id`` or `None`.
     """
-    if not _mtgo_ids_cache:
-        _cache_cards()
-    return _mtgo_ids_cache.get(mtgo_id)
+    if card := card_index().find_by_mtgo_id(mtgo_id):
+        return card
+    index = printings_index()
+    return index.find_by_mtgo_id(mtgo_id) if index else None
 
 
 def find_by_collector_number(set_code: str, collector_number: str | int) -> Card | None:
     """Return a card designated by provided ``set_code`` and ``collector_number`` or `None` if it
     cannot be found.
+
+    Printings missing from 'Oracle Cards' data are looked up in the printings index (if
+    available).
     """
-    if not _collector_numbers_cache:
-        _cache_cards()
-    return _collector_numbers_cache.get((set_code.lower(), collector_number))
+    if _shared_card_index is not None:
+        card = _shared_card_index.find_by_collector_number(set_code, collector_number)
+    else:
+        card = card_index().find_by_collector_number(set_code, collector_number)
+    if card:
+        return card
+    index = printings_index()
+    return index.find_by_collector_number(set_code, collector_number) if index else None
 
 
 class ColorIdentityDistribution:
@@ -1448,8 +3633,15 @@ class ColorIdentityDistribution:
     def __init__(self, data: Iterable[Card] | None = None) -> None:
         self._data = bulk_data() if not data else data
         self._colorsmap = defaultdict(list)
-        for card in self._data:
-            self._colorsmap[card.color_identity].append(card)
+        if not data:
+            columns = card_columns()
+            pool, identities = columns.pool, columns["color_identity"]
+            for bits in np.unique(identities[pool]):
+                self._colorsmap[_color_from_bits(int(bits))] = sorted(
+                    columns.select(pool & (identities == bits)))
+        else:
+            for card in self._data:
+                self._colorsmap[card.color_identity].append(card)
         self._colors = sorted(
             [(k, v) for k, v in self._colorsmap.items()],
             key=lambda p: (len(p[0].value), p[0].value))
@@ -13,6 +13,7 @@ import hashlib
 import itertools
 import logging
 import re
+import sys
 from collections import Counter as PyCounter
 from datetime import date, timedelta
 from datetime import datetime
@@ -435,6 +436,29 @@ def getid(text: str) -> str:
     return "".join(id_)
 
 
+def deep_sizeof(*objects: Any) -> int:
+    """Return the total size in bytes of ``objects`` and everything they reference (as far as
+    builtin containers and instance dicts go).
+
+    Objects referenced many times (e.g. interned strings) are counted only once.
+    """
+    seen, total, stack = set(), 0, list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+    return total
+
+
 class Comparable(Protocol):
     """Protocol for annotating comparable types.
     """
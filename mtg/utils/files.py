@@ -7,12 +7,15 @@
     @author: mazz3rr
 
 """
+import json
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from pathlib import Path
 from time import sleep
+from typing import Any
 
 import requests
 from tqdm import tqdm
@@ -106,37 +109,173 @@ def remove_by_ext(ext: str, destdir: str, recursive=False, opposite=False) -> in
     return len(removed)
 
 
-def download_file(url: str, file_name="", dst_dir="") -> None:
+DOWNLOAD_CHUNK_SIZE = 1024 * 64
+DOWNLOAD_TIMEOUT = 15.0  # seconds (of waiting for a connection or a chunk of data)
+PARALLEL_DOWNLOAD_THRESHOLD = 1024 * 1024 * 32  # only bigger files are fetched in parallel
+
+
+def _read_download_manifest(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_download_manifest(path: Path, **data: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _validators(response: requests.Response) -> dict[str, str | None]:
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def _complete_download(part: Path, dst: Path, manifest_path: Path, **data: Any) -> None:
+    os.replace(part, dst)
+    _write_download_manifest(manifest_path, **{**data, "complete": True})
+
+
+def _download_range(url: str, part: Path, start: int, end: int, progress: tqdm) -> None:
+    headers = {"Range": f"bytes={start}-{end}"}
+    with requests.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise requests.HTTPError(f"Range request ignored by server for: {url!r}")
+        with part.open("r+b") as f:
+            f.seek(start)
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                progress.update(len(chunk))
+
+
+def _download_in_parallel(
+        url: str, part: Path, size: int, workers: int, description: str) -> None:
+    with part.open("wb") as f:
+        f.truncate(size)
+    step = -(-size // workers)  # ceiling division
+    ranges = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+    progress = tqdm(
+        desc=description, total=size, unit="B", unit_scale=True, unit_divisor=1024)
+    with progress, ThreadPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(_download_range, url, part, start, end, progress)
+            for start, end in ranges]
+        for future in futures:
+            future.result()
+
+
+def download_file(url: str, file_name="", dst_dir="", parallel=1) -> bool:
     """Download a file at ``url`` to destination specified by ``file_name`` and ``dst_dir``.
 
-    Mostly, as suggested by GPT3.
+    The download is:
+        * conditional - ETag/Last-Modified validators of the last download are kept in a sidecar
+          manifest (``<file name>.download.json``) and sent along, so a file that hasn't changed
+          upstream is not downloaded again
+        * resumable - an interrupted download is continued with a Range request (or started
+          over, if the server can't continue it)
+        * atomic - data is written to a temporary ``<file name>.part`` file that replaces the
+          destination only when complete
+        * optionally, parallel - big files can be fetched in ``parallel`` byte ranges (if the
+          server supports it)
 
     Args:
         url: URL of the file to be downloaded.
         file_name: Optional name for saved file. Default is the downloaded file's name.
         dst_dir: Optional destination directory for saving. Default is the CWD.
+        parallel: Optional number of concurrent range requests for big files. Default is 1.
+
+    Returns:
+        `True` if the file was downloaded, `False` if it hasn't changed upstream
     """
     if not file_name:
         file_name = Path(url).name
-    # send an HTTP request to the URL
-    response = requests.get(url, stream=True)
-    # get the total file size in bytes
-    file_size = int(response.headers.get("Content-Length", 0))
-    divisor = 1024
-
     dst = Path(file_name) if not dst_dir else getdir(dst_dir) / file_name
-    # create a progress bar object
-    progress = tqdm(response.iter_content(divisor), f"Downloading '{dst.resolve()}'...",
-                    total=file_size, unit="B", unit_scale=True, unit_divisor=divisor)
-
-    # open a file for writing
-    with open(dst, "wb") as f:
-        # iterate over the file content in chunks
-        for chunk in progress:
-            # write each chunk to the file
-            f.write(chunk)
-            # update the progress bar manually
-            progress.update(len(chunk))
+    part = dst.with_name(dst.name + ".part")
+    manifest_path = dst.with_name(dst.name + ".download.json")
+    manifest = _read_download_manifest(manifest_path)
+    same_url = manifest.get("url") == url
+    validator = manifest.get("etag") or manifest.get("last_modified")
+    description = f"Downloading '{dst.resolve()}'..."
+
+    headers = {}
+    if same_url and manifest.get("complete") and dst.exists():
+        if manifest.get("etag"):
+            headers["If-None-Match"] = manifest["etag"]
+        if manifest.get("last_modified"):
+            headers["If-Modified-Since"] = manifest["last_modified"]
+    offset = 0
+    if (same_url and not manifest.get("complete") and not manifest.get("parallel")
+            and validator and part.exists()):
+        offset, size = part.stat().st_size, manifest.get("size")
+        if size and offset == size:  # interrupted just before replacing the destination
+            _log.info(f"Download of '{dst.resolve()}' already complete")
+            _complete_download(part, dst, manifest_path, **manifest)
+            return True
+        if size and offset > size:
+            part.unlink()
+            offset = 0
+        if offset:
+            # If-Range makes the server send the whole file if it changed in the meantime
+            headers.update({"Range": f"bytes={offset}-", "If-Range": validator})
+
+    if parallel > 1 and not offset:
+        head = requests.head(url, headers=headers, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+        if head.status_code == 304:
+            _log.info(f"Not modified since the last download: '{dst.resolve()}'")
+            return False
+        size = int(head.headers.get("Content-Length", 0))
+        if (head.ok and head.headers.get("Accept-Ranges") == "bytes"
+                and size >= PARALLEL_DOWNLOAD_THRESHOLD):
+            _write_download_manifest(
+                manifest_path, url=url, **_validators(head), complete=False, parallel=True)
+            _download_in_parallel(url, part, size, parallel, description)
+            _complete_download(part, dst, manifest_path, url=url, **_validators(head))
+            return True
+
+    with requests.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        if response.status_code == 304:
+            _log.info(f"Not modified since the last download: '{dst.resolve()}'")
+            return False
+        restart = response.status_code == 416 and offset > 0
+        if restart:
+            if response.headers.get("Content-Range") == f"bytes */{offset}":
+                _log.info(f"Download of '{dst.resolve()}' already complete")
+                _complete_download(part, dst, manifest_path, **manifest)
+                return True
+        else:
+            response.raise_for_status()
+            if response.status_code == 206:
+                _log.info(f"Resuming download of '{dst.resolve()}' at byte {offset}...")
+                mode = "ab"
+            else:
+                offset, mode = 0, "wb"
+            # get the total file size in bytes
+            file_size = offset + int(response.headers.get("Content-Length", 0))
+            # a length of encoded content isn't the length of the (decoded) data written
+            size = file_size if (
+                "Content-Length" in response.headers
+                and "Content-Encoding" not in response.headers) else None
+            validators = _validators(response)
+            _write_download_manifest(
+                manifest_path, url=url, **validators, size=size, complete=False)
+            progress = tqdm(
+                desc=description, total=file_size, initial=offset, unit="B", unit_scale=True,
+                unit_divisor=1024)
+            with progress, part.open(mode) as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    progress.update(len(chunk))
+
+    if restart:
+        _log.warning(f"Unable to resume download of '{dst.resolve()}', starting over...")
+        part.unlink()
+        return download_file(url, file_name, dst_dir, parallel)
+    _complete_download(part, dst, manifest_path, url=url, **validators, size=size)
+    return True
 
 
 def sanitize_filename(text: str, replacement="_", remove_illegal=True) -> str:  # perplexity
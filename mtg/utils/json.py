@@ -8,6 +8,7 @@
 
 """
 import contextlib
+import hashlib
 import json
 import re
 from collections import OrderedDict
@@ -65,6 +66,14 @@ def to_json(data: Json, sort_dictionaries=False) -> str:
     return json.dumps(data, indent=4, ensure_ascii=False, default=serialize_dates)
 
 
+def json_digest(data: Json, digest_size=16) -> str:
+    """Return a hex digest of ``data`` that doesn't depend on the ordering of its dicts.
+    """
+    text = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=serialize_dates)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=digest_size).hexdigest()
+
+
 def from_json(json_text: str) -> Json:
     return json.loads(json_text, object_hook=deserialize_dates)
 
@@ -12,6 +12,7 @@ import json
 import logging
 import random
 import re
+import threading
 import time
 import urllib.parse
 from dataclasses import dataclass
@@ -197,6 +198,25 @@ def throttle(delay: float, offset=0.0) -> None:
     time.sleep(delay)
 
 
+class RateLimiter:
+    """Thread-safe limiter enforcing a minimal interval between consecutive operations.
+    """
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        """Block until the next operation is allowed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
 def throttle_with_countdown(delay_seconds: int) -> None:
     for i in range(delay_seconds, 0, -1):
         print(f"Waiting {i} seconds before next batch...", end="\r")
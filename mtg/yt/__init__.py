@@ -27,12 +27,12 @@ from youtube_comment_downloader import SORT_BY_POPULAR, YoutubeCommentDownloader
 
 from mtg import FILENAME_TIMESTAMP_FORMAT, Json, PathLike, SECRETS
 from mtg.deck import Deck
-from mtg.deck.arena import ArenaParser, LinesParser
+from mtg.deck.arena import ArenaParser, LinesParser, get_card_names
 from mtg.deck.scrapers import DeckParser, DeckScraper, DeckTagsContainerScraper, \
     DeckUrlsContainerScraper, DecksJsonContainerScraper, HybridContainerScraper, \
     get_throttled_deck_scrapers
 from mtg.gstate import CHANNELS_DIR, CoolOffManager, DecklistsStateManager, UrlsStateManager
-from mtg.scryfall import all_formats
+from mtg.scryfall import all_formats, prefetch_card_names
 from mtg.utils import extract_float, find_longest_seqs, from_iterable, logging_disabled, \
     multiply_by_symbol, timed
 from mtg.utils.files import getdir, sanitize_filename
@@ -321,7 +321,10 @@ class VideoScraper:
 
     def _process_lines(self, *lines: str) -> list[Deck]:
         decks, lp = [], LinesParser(*lines)
-        for decklist in lp.parse():
+        decklists = lp.parse()
+        # resolve names unknown locally across the whole video in bulk
+        prefetch_card_names(*get_card_names(*[l for d in decklists for l in d.splitlines()]))
+        for decklist in decklists:
             if deck := ArenaParser(decklist, self.deck_metadata).parse():
                 deck_name = f"{deck.name!r} deck" if deck.name else "Deck"
                 _log.info(f"{deck_name} scraped successfully")
@@ -7,6 +7,7 @@
     @author: mazz3rr
 
 """
+import contextlib
 import itertools
 import json
 import logging
@@ -21,7 +22,11 @@ from typing import Callable, Generator, Iterator, Self, Type
 from tqdm import tqdm
 
 from mtg import AVOIDED_DIR, FILENAME_TIMESTAMP_FORMAT, READABLE_TIMESTAMP_FORMAT, README
+from mtg.deck import (
+    CardResolver, alchemy_rebalance_normalization, log_card_name_sanitizer_stats)
+from mtg.deck.similarity import DeckSimilarityIndex
 from mtg.gstate import CHANNELS_DIR, CoolOffManager, DecklistsStateManager, UrlsStateManager
+from mtg.scryfall import log_fuzzy_index_stats, log_name_normalizer_stats
 from mtg.utils import Counter, get_ordinal_suffix, logging_disabled
 from mtg.utils.files import getdir
 from mtg.utils.gsheets import extend_gsheet_rows_with_cols, retrieve_from_gsheets_cols
@@ -31,6 +36,7 @@ from mtg.yt.data.structures import CHANNEL_URL_TEMPLATE, Channel, Video
 
 _log = logging.getLogger(__name__)
 _channels_cache: dict[str, Channel] = {}
+SIMILARITY_INDEX_FILE = CHANNELS_DIR / "decklists_similarity.npz"
 
 
 def get_channels_count() -> int:
@@ -189,10 +195,14 @@ class ScrapingSession:
     def __init__(self) -> None:
         self._urls_manager, self._decklists_manager = UrlsStateManager(), DecklistsStateManager()
         self._cooloff_manager = CoolOffManager()
+        self._card_resolver = CardResolver()
+        self._exit_stack = contextlib.ExitStack()
 
     def __enter__(self) -> Self:
         self._decklists_manager.load()
         self._urls_manager.load_failed()
+        self._exit_stack.enter_context(self._card_resolver)
+        self._exit_stack.enter_context(alchemy_rebalance_normalization())
         return self
 
     def __exit__(
@@ -202,6 +212,11 @@ class ScrapingSession:
             f"Session finished with: {self._cooloff_manager.total_decks} deck(s) from "
             f"{self._cooloff_manager.total_videos} video(s) from "
             f"{self._cooloff_manager.total_channels} channel(s) scraped in total")
+        log_fuzzy_index_stats()
+        log_name_normalizer_stats()
+        log_card_name_sanitizer_stats()
+        self._card_resolver.log_stats()
+        self._exit_stack.close()
         self._decklists_manager.dump()
         self._urls_manager.dump_failed()
         self._decklists_manager.reset()
@@ -351,9 +366,49 @@ def prune_dangling_decklists() -> None:
     manager.load()
     manager.prune(lambda did: did in dangling)
     manager.dump()
+    if SIMILARITY_INDEX_FILE.exists():
+        load_similarity_index()  # drops the pruned decklists from the index
     _log.info(f"Pruning done")
 
 
+def load_similarity_index() -> DeckSimilarityIndex:
+    """Load the similarity index of regular decklists from the global repository.
+
+    The index is loaded from its file and only decklists added to (or removed from) the
+    repository since it was last saved are indexed anew (or dropped) and the file updated.
+    """
+    index = DeckSimilarityIndex.load(
+        SIMILARITY_INDEX_FILE) if SIMILARITY_INDEX_FILE.exists() else DeckSimilarityIndex()
+    manager = DecklistsStateManager()
+    if not manager.is_loaded:
+        manager.load()
+    regular = manager.regular
+    removed = sum(index.remove(key) for key in index.keys if key not in regular)
+    if removed:
+        _log.info(
+            f"Dropped {removed:,} decklist(s) no longer in the repository from similarity index")
+    if added := index.update(regular):
+        _log.info(f"Indexed {added:,} new decklist(s) for similarity")
+    if removed or added:
+        index.save(SIMILARITY_INDEX_FILE)
+    return index
+
+
+def find_near_duplicate_decklists(
+        threshold=DeckSimilarityIndex.DEFAULT_THRESHOLD) -> list[list[str]]:
+    """Find clusters of near-duplicate regular decklists (e.g. the same list with a card or two
+    swapped) across the global repository.
+
+    Returns:
+        lists of decklist IDs sorted by cluster size (descending)
+    """
+    clusters = load_similarity_index().clusters(threshold)
+    _log.info(
+        f"Found {len(clusters):,} near-duplicate cluster(s) spanning "
+        f"{sum(len(c) for c in clusters):,} decklist(s)")
+    return clusters
+
+
 def fetch_channel_ids(*urls: str, only_new=True) -> list[str]:
     """Fetch channel IDs from the provided channels URLs. By default, return only the ones not
     already present in the private Google Sheet.
@@ -14,7 +14,9 @@ from typing import Generator, Literal
 from tqdm import tqdm
 
 from mtg import DECKS_DIR, FILENAME_TIMESTAMP_FORMAT, PathLike
+from mtg.deck import CardResolver
 from mtg.deck.export import Exporter, FORMATS as EXPORT_FORMATS
+from mtg.deck.similarity import DeckSimilarityIndex
 from mtg.utils import logging_disabled
 from mtg.utils.files import getdir, sanitize_filename
 from mtg.yt import retrieve_ids
@@ -23,9 +25,9 @@ from mtg.yt.data.structures import Channel
 
 
 def _dump_data_gen(
-        channels: list[Channel],
-        dstdir: Path) -> Generator[tuple[Exporter | None, Path], None, None]:
-    seen_decks = {}
+        channels: list[Channel], dstdir: Path, similarity_threshold: float | None = None
+        ) -> Generator[tuple[Exporter | None, Path], None, None]:
+    seen_decks, index = {}, DeckSimilarityIndex() if similarity_threshold is not None else None
     for channel in channels:
         if title := channel.title:
             channel_dir = dstdir / f"{sanitize_filename(title)}_({channel.id})"
@@ -34,18 +36,27 @@ def _dump_data_gen(
         for video in channel.videos:
             for serialized_deck in video.decks:
                 serialized_deck.metadata["video_url"] = video.url
-                # FIXME: improve decks' equivalence (#426)
-                deck = seen_decks.get(hash(serialized_deck), serialized_deck.deck())
+                key = serialized_deck.fingerprint
+                deck = seen_decks.get(key) or serialized_deck.deck()
+                if deck and index is not None:
+                    if index.similar(deck.decklist, similarity_threshold, limit=1):
+                        yield None, channel_dir  # a near-duplicate of an already dumped deck
+                        continue
+                    index.add(deck.decklist_id, deck.decklist)
                 if deck:
-                    seen_decks[hash(deck)] = deck
+                    seen_decks[key] = deck
                     yield Exporter(deck), channel_dir
                 else:
                     yield None, channel_dir
 
 
 def dump_decks(
-        dstdir: PathLike = "", fmt: Literal["arena", "forge", "json", "xmage"] = "forge") -> None:
+        dstdir: PathLike = "", fmt: Literal["arena", "forge", "json", "xmage"] = "forge",
+        similarity_threshold: float | None = None) -> None:
     """Export all decks from all channels to ```dstdir``` in the format provided.
+
+    If ``similarity_threshold`` is specified, decks at least that similar (in terms of estimated
+    Jaccard similarity of their decklists) to an already exported one are skipped.
     """
     if fmt not in EXPORT_FORMATS:
         raise ValueError(f"Invalid dump format: {fmt!r}. Must be one of: {EXPORT_FORMATS}")
@@ -55,9 +66,10 @@ def dump_decks(
     chids = retrieve_ids()
     channels = [*tqdm(load_channels(*chids), total=len(chids), desc="Loading channels data...")]
     total = sum(len(ch.decks) for ch in channels)
-    with logging_disabled():
+    with logging_disabled(), CardResolver():
         for exporter, channel_dir in tqdm(
-                _dump_data_gen(channels, dstdir), total=total, desc="Exporting YT decks..."):
+                _dump_data_gen(channels, dstdir, similarity_threshold), total=total,
+                desc="Exporting YT decks..."):
             if exporter:
                 try:
                     match fmt:
@@ -18,7 +18,7 @@ from mtg.deck import Deck
 from mtg.deck.arena import ArenaParser
 from mtg.gstate import DecklistsStateManager
 from mtg.utils import Counter, breadcrumbs
-from mtg.utils.json import to_json
+from mtg.utils.json import json_digest, to_json
 from mtg.utils.scrape import extract_url, get_netloc_domain
 
 VIDEO_URL_TEMPLATE = "https://www.youtube.com/watch?v={}"
@@ -38,15 +38,21 @@ class SerializedDeck:
     decklist_extended_id: str
 
     def __hash__(self) -> int:
-        return hash(self.json)
+        return hash(self.fingerprint)
 
     def __eq__(self, other: Self) -> bool:
-        return isinstance(other, type(self)) and self.json == other.json
+        return isinstance(other, type(self)) and self.fingerprint == other.fingerprint
 
     @cached_property
     def json(self) -> str:
         return to_json(asdict(self), sort_dictionaries=True)
 
+    @cached_property
+    def fingerprint(self) -> str:
+        """Return a canonical fingerprint of this deck (computed on first use).
+        """
+        return f"{self.decklist_extended_id}-{json_digest(self.metadata)}"
+
     @property
     def source(self) -> str:
         return Deck.url_to_source(self.metadata.get("url"))
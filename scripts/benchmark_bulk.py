@@ -0,0 +1,69 @@
+"""
+
+    scripts.benchmark_bulk.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Script to compare peak memory and wall time of loading Scryfall bulk data with a plain
+    `json.load` versus the actual ingestion path (building the binary snapshot once, then
+    streaming it with `bulk_data()`) and to report the resident footprint of the loaded card
+    pool.
+
+    @author: mazz3rr
+
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from mtg import DATA_DIR
+from mtg.scryfall import (
+    CARDS_FILENAME, Card, build_cards_snapshot, bulk_data, iter_cards_snapshot,
+    log_bulk_data_footprint)
+
+
+def _load_whole() -> int:
+    with (DATA_DIR / CARDS_FILENAME).open(encoding="utf-8") as f:
+        data = json.load(f)
+    cards = {Card(card_data) for card_data in data}
+    cards = {c for c in cards if not c.not_legal_anywhere}
+    cards = {c for c in cards if not c.is_token}
+    return len(cards)
+
+
+def _build_snapshot() -> int:
+    build_cards_snapshot()
+    return sum(1 for _ in iter_cards_snapshot())
+
+
+def _stream_snapshot() -> int:
+    return sum(1 for _ in iter_cards_snapshot())
+
+
+def _load_bulk_data() -> int:
+    return len(bulk_data())
+
+
+def _measure(name: str, func: Callable[[], int]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} cards={count:<7} peak={peak / 1024 ** 2:8.1f} MB  time={elapsed:6.2f} s")
+
+
+def _benchmark() -> None:
+    _measure("json.load", _load_whole)
+    _measure("snapshot", _build_snapshot)  # one-off, after each bulk data download
+    _measure("records", _stream_snapshot)
+    _measure("bulk_data", _load_bulk_data)
+    before, after = log_bulk_data_footprint()
+    print(f"footprint  plain={before / 1024 ** 2:.1f} MB  compact={after / 1024 ** 2:.1f} MB")
+
+
+if __name__ == '__main__':
+    sys.exit(_benchmark())
@@ -9,13 +9,13 @@
 """
 import sys
 
-from mtg.scryfall import download_scryfall_bulk_data, download_scryfall_set_data
+from mtg.scryfall import download_scryfall_set_data, refresh_scryfall_bulk_data
 from mtg.mtgwiki import download_page as download_wiki_page
 
 
 def _update():
     download_wiki_page()
-    download_scryfall_bulk_data()
+    refresh_scryfall_bulk_data()
     download_scryfall_set_data()
 
 
@@ -0,0 +1,132 @@
+"""
+
+    tests.conftest
+    ~~~~~~~~~~~~~~
+    Shared fixtures.
+
+    @author: mazz3rr
+
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# 'mtg' reads secrets and resolves its data dirs against CWD on import
+_WORKDIR = Path(tempfile.mkdtemp(prefix="mtg_tests_"))
+_SERVICES = (
+    "cardkingdom", "coolstuff", "flexslot", "google", "hareruya", "herald", "melee_gg", "mtgo",
+    "tcdecks", "tcgplayer", "zenrows")
+(_WORKDIR / "secrets.json").write_text(json.dumps(
+    {s: {"api_key": "", "cookie": ""} for s in _SERVICES}), encoding="utf-8")
+# a stand-in for MTG Wiki's "Species" page (parsed on import)
+_WIKI_PAGE = _WORKDIR / "var" / "data" / "creature_type.html"
+_WIKI_PAGE.parent.mkdir(parents=True)
+_WIKI_PAGE.write_text(
+    '<html><body><table class="nowraplinks navbox-subgroup"><tr><td><a>Iconic</a><ul>'
+    '<li><a title="Elf">Elf</a></li><li><a title="Human">Human</a></li></ul></td></tr></table>'
+    '<table class="nowraplinks navbox-subgroup"><tr><td><a>Spellcasters</a><ul>'
+    '<li><a title="Druid">Druid</a></li><li><a title="Child">Child</a></li></ul></td></tr>'
+    '</table></body></html>', encoding="utf-8")
+os.chdir(_WORKDIR)
+
+FORMATS = ("standard", "modern", "legacy", "vintage", "commander", "alchemy", "historic")
+
+
+def make_card(
+        name: str, type_line="Instant", cmc=1.0, colors=("R",), rarity="common", set_code="tst",
+        collector_number="1", price="0.50", legal=FORMATS, **extra) -> dict:
+    data = {
+        "id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"{set_code}/{collector_number}/{name}")),
+        "oracle_id": str(uuid.uuid5(uuid.NAMESPACE_OID, name)),
+        "name": name,
+        "layout": "normal",
+        "type_line": type_line,
+        "mana_cost": "{R}",
+        "oracle_text": "",
+        "cmc": cmc,
+        "colors": [*colors],
+        "color_identity": [*colors],
+        "keywords": [],
+        "games": ["paper", "arena"],
+        "legalities": {fmt: "legal" if fmt in legal else "not_legal" for fmt in FORMATS},
+        "set": set_code,
+        "set_name": f"Test Set {set_code.upper()}",
+        "set_type": "expansion",
+        "collector_number": collector_number,
+        "rarity": rarity,
+        "released_at": "2024-01-01",
+        "reprint": False,
+        "prices": {"usd": price, "tix": None},
+    }
+    data.update(extra)
+    return data
+
+
+def default_cards() -> list[dict]:
+    return [
+        make_card("Shock", collector_number="1"),
+        make_card("Lightning Bolt", collector_number="2", rarity="uncommon"),
+        make_card("Opt", collector_number="3", colors=("U",)),
+        make_card(
+            "Llanowar Elves", type_line="Creature — Elf Druid", collector_number="4",
+            colors=("G",), oracle_text="{T}: Add {G}."),
+        make_card(
+            "Elvish Archdruid", type_line="Creature — Elf Druid", cmc=3.0, collector_number="5",
+            colors=("G",), rarity="rare", oracle_text="Other Elf creatures you control get +1/+1."),
+        make_card(
+            "Little Girl", type_line="Creature — Human Child", cmc=0.5, collector_number="6",
+            colors=("W",), legal=()),
+        make_card(
+            "Forest", type_line="Basic Land — Forest", cmc=0.0, colors=(), collector_number="7",
+            price=None),
+    ]
+
+
+def write_bulk_data(data_dir: Path, cards: list[dict]) -> Path:
+    data_dir.mkdir(parents=True, exist_ok=True)
+    dst = data_dir / "scryfall_cards.json"
+    dst.write_text(
+        "[\n" + ",\n".join(json.dumps(card) for card in cards) + "\n]\n", encoding="utf-8")
+    return dst
+
+
+def write_sets_data(data_dir: Path, *set_codes: str) -> Path:
+    dst = data_dir / "scryfall_sets.json"
+    dst.write_text(json.dumps([{
+        "id": str(uuid.uuid5(uuid.NAMESPACE_OID, code)), "code": code,
+        "name": f"Test Set {code.upper()}", "set_type": "expansion",
+        "released_at": "2024-01-01", "card_count": 7} for code in set_codes]), encoding="utf-8")
+    return dst
+
+
+@pytest.fixture
+def data_dir():
+    """Provide a data dir with no Scryfall data and all in-process bulk data derived state
+    dropped.
+    """
+    from mtg import DATA_DIR
+    from mtg import scryfall
+
+    for path in DATA_DIR.iterdir():
+        if path.name in (_WIKI_PAGE.name, scryfall.ApiCache.FILENAME):
+            continue  # the API cache is held open by the process (and cleared below)
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    scryfall.api_cache().clear()
+    scryfall._invalidate_caches()
+    yield DATA_DIR
+    scryfall._invalidate_caches()
+
+
+@pytest.fixture
+def bulk_data_file(data_dir):
+    return write_bulk_data(data_dir, default_cards())
@@ -0,0 +1,226 @@
+"""
+
+    tests.test_deck
+    ~~~~~~~~~~~~~~~
+    Tests of deck parsing and statistics.
+
+    @author: mazz3rr
+
+"""
+import threading
+
+import pytest
+
+
+def test_card_resolver_sessions_nest_and_stay_context_local():
+    from mtg.deck import CardResolver, card_resolution_session, current_card_resolver
+
+    assert current_card_resolver() is None
+    with CardResolver() as outer:
+        with card_resolution_session():
+            assert current_card_resolver() is outer
+        with CardResolver() as inner:
+            assert current_card_resolver() is inner
+            seen = []
+            worker = threading.Thread(target=lambda: seen.append(current_card_resolver()))
+            worker.start()
+            worker.join()
+            assert seen == [None]
+        assert current_card_resolver() is outer
+    assert current_card_resolver() is None
+
+
+DECKLIST = """Deck
+4 Shock
+4 Lightning Bolt
+3 Opt
+4 Llanowar Elves
+4 Elvish Archdruid
+41 Forest
+
+Sideboard
+1 Opt
+"""
+
+
+def test_arena_decklist_parsed_within_card_resolution_session(bulk_data_file):
+    from mtg.deck import CardResolver
+    from mtg.deck.arena import ArenaParser
+
+    with CardResolver() as resolver:
+        deck = ArenaParser(DECKLIST).parse()
+        assert deck is not None and len(deck.maindeck) == 60 and len(deck.sideboard) == 1
+        assert resolver.misses == 6
+        assert ArenaParser(DECKLIST).parse() == deck
+        assert resolver.misses == 6
+
+
+def test_arena_decklist_pre_parse_prefetches_only_misses_within_session(
+        bulk_data_file, monkeypatch):
+    import mtg.deck
+    from mtg import scryfall
+    from mtg.deck import CardResolver
+    from mtg.deck.arena import ArenaParser
+
+    prefetched = []
+    monkeypatch.setattr(mtg.deck, "prefetch_card_names", lambda *names: prefetched.extend(names))
+    monkeypatch.setattr(scryfall, "query_api_for_card", lambda name, foreign=False: None)
+    decklist = DECKLIST + "1 Unknown Card\n"
+    ArenaParser(decklist)._pre_parse()
+    assert prefetched == []
+    with CardResolver() as resolver:
+        ArenaParser(DECKLIST)._pre_parse()
+        assert prefetched == [] and resolver.misses == 6
+        ArenaParser(decklist)._pre_parse()
+    assert prefetched == ["Unknown Card"]
+
+
+def test_alchemy_rebalances_normalized_only_on_demand(data_dir):
+    from conftest import FORMATS, default_cards, make_card, write_bulk_data
+    from mtg.deck import alchemy_rebalance_normalization
+    from mtg.deck.arena import ArenaParser
+
+    not_alchemy = tuple(fmt for fmt in FORMATS if fmt not in ("alchemy", "historic"))
+    write_bulk_data(data_dir, [
+        *default_cards(),
+        make_card("Divide by Zero", collector_number="8", colors=("U",), legal=not_alchemy),
+        make_card(
+            "A-Divide by Zero", set_code="yon", collector_number="A-8", colors=("U",),
+            legal=("alchemy", "historic")),
+    ])
+    decklist = DECKLIST.replace("4 Shock", "4 Divide by Zero")
+
+    deck = ArenaParser(decklist, {"format": "alchemy"}).parse()
+    assert "Divide by Zero" in {card.name for card in deck.maindeck}
+    with alchemy_rebalance_normalization():
+        deck = ArenaParser(decklist, {"format": "alchemy"}).parse()
+    names = {card.name for card in deck.maindeck}
+    assert "A-Divide by Zero" in names and "Divide by Zero" not in names
+
+
+
+def test_scraped_alchemy_deck_gets_rebalances_normalized(data_dir):
+    from conftest import FORMATS, default_cards, make_card, write_bulk_data
+    from mtg.deck.scrapers import DeckScraper
+
+    class StubScraper(DeckScraper):
+        @staticmethod
+        def is_valid_url(url: str) -> bool:
+            return True
+
+        def _pre_parse(self) -> None:
+            self._decklist = DECKLIST.replace("4 Shock", "4 Divide by Zero")
+
+        def _parse_metadata(self) -> None:
+            pass
+
+        def _parse_deck(self) -> None:
+            pass
+
+    not_alchemy = tuple(fmt for fmt in FORMATS if fmt not in ("alchemy", "historic"))
+    write_bulk_data(data_dir, [
+        *default_cards(),
+        make_card("Divide by Zero", collector_number="8", colors=("U",), legal=not_alchemy),
+        make_card(
+            "A-Divide by Zero", set_code="yon", collector_number="A-8", colors=("U",),
+            legal=("alchemy", "historic"), games=["arena"]),
+    ])
+
+    deck = StubScraper("https://example.com/deck", {"format": "alchemy"}).scrape()
+    names = {card.name for card in deck.maindeck}
+    assert "A-Divide by Zero" in names and "Divide by Zero" not in names
+
+def test_prefetched_names_are_the_looked_up_ones(bulk_data_file):
+    from conftest import make_card
+    from mtg import scryfall
+    from mtg.deck.arena import get_card_names
+
+    wear_tear = scryfall.Card(make_card("Wear // Tear", collector_number="9"))
+    requested = []
+
+    class Resolver:
+        def resolve(self, *names):
+            requested.extend(names)
+            return {name: wear_tear for name in names}
+
+    names = get_card_names("2 Wear/Tear", "4 Shock")
+    assert names == ["Wear // Tear", "Shock"]
+    scryfall.prefetch_card_names(*names, "wear // tear", resolver=Resolver())
+    assert requested == ["Wear // Tear"]
+    assert scryfall.api_cache().get("WEAR // TEAR") == (True, wear_tear.json)
+
+
+def test_batch_deck_stats_match_single_pass_ones(data_dir):
+    from conftest import default_cards, make_card, write_bulk_data
+    from mtg import scryfall
+    from mtg.deck import Deck, DeckStats, deck_stats
+
+    write_bulk_data(data_dir, [
+        *default_cards(),
+        make_card(
+            "Half-Cost Sorcery", type_line="Sorcery", cmc=2.5, collector_number="8", price="1.99"),
+        make_card("Zero Cost", type_line="Artifact", cmc=0.0, collector_number="9", colors=()),
+    ])
+    find = scryfall.find_by_name
+    maindeck = [
+        *[find("Shock")] * 4, *[find("Lightning Bolt")] * 4, *[find("Opt")] * 3,
+        *[find("Llanowar Elves")] * 4, *[find("Elvish Archdruid")] * 4,
+        *[find("Half-Cost Sorcery")] * 3, *[find("Zero Cost")] * 2, *[find("Forest")] * 36]
+    decks = [
+        Deck(maindeck, [find("Opt")]),
+        Deck(maindeck[4:] + [find("Forest")] * 4),
+    ]
+
+    batch = deck_stats(decks)
+    for deck, stats in zip(decks, batch):
+        single = DeckStats.from_playsets(deck.playsets)
+        assert stats.cmc_histogram == single.cmc_histogram
+        assert stats.avg_cmc == single.avg_cmc
+        assert stats == single
+
+
+def test_deck_playsets_split_between_maindeck_and_sideboard(bulk_data_file):
+    from mtg.deck import Deck, InvalidDeck
+    from mtg.deck.arena import ArenaParser
+    from mtg.scryfall import find_by_name
+
+    deck = ArenaParser(DECKLIST).parse()
+    opt, forest = find_by_name("Opt"), find_by_name("Forest")
+
+    assert [card.name for card, _ in deck.maindeck_playsets] == [
+        "Elvish Archdruid", "Forest", "Lightning Bolt", "Llanowar Elves", "Opt", "Shock"]
+    assert deck.sideboard_playsets == ((opt, 1),)
+    assert len(deck.maindeck) == deck.maindeck_size == 60
+    assert deck.maindeck.count(opt) == 3 and deck.sideboard == [opt]
+    assert deck.cards.count(opt) == 4 and len(deck.cards) == 61
+    with pytest.raises(InvalidDeck):  # 3 + 2 copies
+        Deck(deck.maindeck, [opt, opt])
+
+    assert deck.is_bo1
+    assert not Deck(deck.maindeck, [opt, *[forest] * 6]).is_bo3
+    assert Deck(deck.maindeck, [opt, *[forest] * 7]).is_bo3
+
+
+def test_deck_exports_unchanged_by_playset_storage(bulk_data_file):
+    from conftest import write_sets_data
+    from mtg.deck.arena import ArenaParser
+    from mtg.deck.export import Exporter
+
+    write_sets_data(bulk_data_file.parent, "tst")
+    deck = ArenaParser(DECKLIST, {"name": "Elves", "format": "standard"}).parse()
+    exporter = Exporter(deck)
+
+    assert deck.decklist == (
+        "Deck\n4 Elvish Archdruid\n41 Forest\n4 Lightning Bolt\n4 Llanowar Elves\n3 Opt\n"
+        "4 Shock\n\nSideboard\n1 Opt")
+    assert deck.decklist_extended == (
+        "Deck\n4 Elvish Archdruid (TST) 5\n41 Forest (TST) 7\n4 Lightning Bolt (TST) 2\n"
+        "4 Llanowar Elves (TST) 4\n3 Opt (TST) 3\n4 Shock (TST) 1\n\nSideboard\n1 Opt (TST) 3")
+    assert exporter._build_forge() == (
+        "[metadata]\nName=Elves\nFormat=standard\nSource=arena.decklist\n[Main]\n"
+        "4 Elvish Archdruid|TST\n41 Forest|TST\n4 Lightning Bolt|TST\n4 Llanowar Elves|TST\n"
+        "3 Opt|TST\n4 Shock|TST\n[Sideboard]\n1 Opt|TST")
+    assert exporter._build_xmage() == (
+        "NAME:Elves\nFORMAT:standard\nSOURCE:arena.decklist\n4 [TST:5] Elvish Archdruid\n"
+        "41 [TST:7] Forest\n4 [TST:2] Lightning Bolt\n4 [TST:4] Llanowar Elves\n"
+        "3 [TST:3] Opt\n4 [TST:1] Shock\nSB: 1 [TST:3] Opt")
@@ -0,0 +1,138 @@
+"""
+
+    tests.test_files
+    ~~~~~~~~~~~~~~~~
+    Tests of conditional, resumable and parallel file downloads.
+
+    @author: mazz3rr
+
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mtg.utils import files
+
+CONTENT = bytes(range(256)) * 400
+ETAG = '"v1"'
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves the server's ``content`` honoring ETag validators and (If-)Range requests.
+    """
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_headers(self) -> bytes:
+        content, etag = self.server.content, self.server.etag
+        self.server.requests.append((self.command, dict(self.headers)))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return b""
+        range_ = self.headers.get("Range")
+        if range_ and self.headers.get("If-Range", etag) == etag:
+            start, _, end = range_.removeprefix("bytes=").partition("-")
+            start, end = int(start), int(end) if end else len(content) - 1
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return b""
+            body = content[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        else:
+            body = content
+            self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_HEAD(self) -> None:
+        self._send_headers()
+
+    def do_GET(self) -> None:
+        self.wfile.write(self._send_headers())
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    httpd.content, httpd.etag, httpd.requests = CONTENT, ETAG, []
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/cards.json"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _interrupted(tmp_path, url: str, data: bytes, **manifest) -> None:
+    (tmp_path / "cards.json.part").write_bytes(data)
+    (tmp_path / "cards.json.download.json").write_text(
+        json.dumps({"url": url, "complete": False, **manifest}), encoding="utf-8")
+
+
+def test_first_and_repeated_download(server, tmp_path):
+    assert files.download_file(server.url, dst_dir=tmp_path)
+    assert (tmp_path / "cards.json").read_bytes() == CONTENT
+    assert not (tmp_path / "cards.json.part").exists()
+    manifest = json.loads((tmp_path / "cards.json.download.json").read_text(encoding="utf-8"))
+    assert manifest["etag"] == ETAG and manifest["complete"]
+
+    assert not files.download_file(server.url, dst_dir=tmp_path)
+    assert server.requests[-1][1]["If-None-Match"] == ETAG
+    assert (tmp_path / "cards.json").read_bytes() == CONTENT
+
+
+def test_truncated_download_resumed(server, tmp_path):
+    _interrupted(tmp_path, server.url, CONTENT[:1000], etag=ETAG, size=len(CONTENT))
+
+    assert files.download_file(server.url, dst_dir=tmp_path)
+    headers = server.requests[-1][1]
+    assert headers["Range"] == "bytes=1000-" and headers["If-Range"] == ETAG
+    assert (tmp_path / "cards.json").read_bytes() == CONTENT
+
+
+def test_changed_upstream_download_fetched_anew(server, tmp_path):
+    _interrupted(tmp_path, server.url, b"x" * 1000, etag='"v0"', size=len(CONTENT))
+
+    assert files.download_file(server.url, dst_dir=tmp_path)
+    assert server.requests[-1][1]["If-Range"] == '"v0"'
+    assert (tmp_path / "cards.json").read_bytes() == CONTENT
+
+
+def test_unsatisfiable_range_download_started_over(server, tmp_path):
+    _interrupted(tmp_path, server.url, b"x" * (len(CONTENT) + 10), etag=ETAG)
+
+    assert files.download_file(server.url, dst_dir=tmp_path)
+    assert [headers.get("Range") for _, headers in server.requests] == [
+        f"bytes={len(CONTENT) + 10}-", None]
+    assert (tmp_path / "cards.json").read_bytes() == CONTENT
+
+
+def test_unsatisfiable_range_of_whole_file_completes_download(server, tmp_path):
+    _interrupted(tmp_path, server.url, CONTENT, etag=ETAG)
+
+    assert files.download_file(server.url, dst_dir=tmp_path)
+    assert len(server.requests) == 1
+    assert (tmp_path / "cards.json").read_bytes() == CONTENT
+
+
+def test_parallel_download_identical_to_serial(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "PARALLEL_DOWNLOAD_THRESHOLD", 1024)
+    files.download_file(server.url, "serial.json", tmp_path)
+    server.requests.clear()
+
+    assert files.download_file(server.url, "parallel.json", tmp_path, parallel=4)
+    ranges = [headers["Range"] for method, headers in server.requests if method == "GET"]
+    assert len(ranges) == 4
+    assert (tmp_path / "parallel.json").read_bytes() == (tmp_path / "serial.json").read_bytes()
+    manifest = json.loads((tmp_path / "parallel.json.download.json").read_text(encoding="utf-8"))
+    assert manifest["complete"] and not manifest.get("parallel")
@@ -0,0 +1,321 @@
+"""
+
+    tests.test_scryfall
+    ~~~~~~~~~~~~~~~~~~~
+    Tests of Scryfall data handling.
+
+    @author: mazz3rr
+
+"""
+import threading
+
+from conftest import FORMATS, default_cards, make_card, write_bulk_data
+
+
+def test_card_index_builds_with_no_bulk_data_file(data_dir, monkeypatch):
+    from mtg import scryfall
+
+    # downloading invalidates the card index, from within its build in this case
+    monkeypatch.setattr(
+        scryfall, "_download_oracle_cards", lambda: write_bulk_data(data_dir, default_cards()))
+    index = scryfall.CardIndex()
+    monkeypatch.setattr(scryfall, "_CARD_INDEX", index)
+    found = []
+    worker = threading.Thread(
+        target=lambda: found.append(index.find_by_name("Lightning Bolt")), daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+    assert not worker.is_alive(), "card index build deadlocked"
+    assert found[0] is not None and found[0].name == "Lightning Bolt"
+    assert index.is_built
+
+
+def test_card_index_built_while_bulk_data_streamed(bulk_data_file, monkeypatch):
+    from mtg import scryfall
+
+    index = scryfall.CardIndex()
+    monkeypatch.setattr(scryfall, "_CARD_INDEX", index)
+    cards = scryfall.bulk_data()
+    assert index.is_built
+    assert index.find_by_name("Shock") in cards
+    assert len({*index.names.values()}) == len(cards)
+
+
+def test_snapshot_retains_all_card_data_read(bulk_data_file):
+    from mtg import scryfall
+
+    card = next(c for c in scryfall.bulk_data() if c.name == "Shock")
+    assert card.released_at.isoformat() == card.json["released_at"]
+    assert card.set_type == "expansion"
+
+
+def test_restamped_snapshot_keeps_shared_index_valid(bulk_data_file, monkeypatch):
+    import os
+
+    from mtg import scryfall
+
+    root = scryfall.publish_shared_card_index()
+    monkeypatch.setattr(scryfall, "_shared_card_index", None)
+    scryfall.attach_shared_card_index(root)
+    key = scryfall._read_snapshot_key()
+    stat = bulk_data_file.stat()
+    os.utime(bulk_data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    scryfall._ensure_cards_snapshot(bulk_data_file)
+
+    assert scryfall._read_snapshot_key()["mtime_ns"] != key["mtime_ns"]
+    assert [p.name for p in bulk_data_file.parent.glob("*.snapshot.*")] == []
+    assert scryfall.find_by_name("Lightning Bolt").name == "Lightning Bolt"
+    assert scryfall.publish_shared_card_index() == root
+    scryfall.attach_shared_card_index(root)
+    assert scryfall.find_by_name("Opt").name == "Opt"
+
+
+def test_alchemy_rebalances_normalized_by_format(data_dir):
+    from mtg import scryfall
+
+    not_alchemy = tuple(fmt for fmt in FORMATS if fmt not in ("alchemy", "historic"))
+    write_bulk_data(data_dir, [
+        *default_cards(),
+        make_card("Divide by Zero", collector_number="8", colors=("U",), legal=not_alchemy),
+        make_card(
+            "A-Divide by Zero", set_code="yon", collector_number="A-8", colors=("U",),
+            legal=("alchemy", "historic")),
+    ])
+    original, rebalance = (
+        scryfall.find_by_name(name) for name in ("Divide by Zero", "A-Divide by Zero"))
+    bolt = scryfall.find_by_name("Lightning Bolt")
+
+    assert scryfall.normalize_alchemy_rebalances(
+        [original, bolt], "alchemy") == [rebalance, bolt]
+    assert scryfall.normalize_alchemy_rebalances([rebalance, bolt], "modern") == [original, bolt]
+    assert scryfall.normalize_alchemy_rebalances([rebalance], "historic") == [rebalance]
+
+
+def test_shared_index_lookups_dont_build_card_index(bulk_data_file, monkeypatch):
+    from mtg import scryfall
+
+    root = scryfall.publish_shared_card_index()
+    index = scryfall.CardIndex()
+    monkeypatch.setattr(scryfall, "_CARD_INDEX", index)
+    monkeypatch.setattr(scryfall, "_shared_card_index", None)
+    monkeypatch.setattr(scryfall, "_shared_fuzzy_fallback", False)
+    monkeypatch.setattr(scryfall, "query_api_for_card", lambda name: None)
+    scryfall.attach_shared_card_index(root)
+
+    assert scryfall.find_by_name("lightning bolt").name == "Lightning Bolt"
+    assert scryfall.find_by_name("Lightnin Bolt") is None
+    assert not index.is_built
+    scryfall.attach_shared_card_index(root, fuzzy_fallback=True)
+    assert scryfall.find_by_name("Lightnin Bolt").name == "Lightning Bolt"
+    assert index.is_built
+
+
+def test_shared_index_and_card_index_agree_on_duplicate_names(data_dir, monkeypatch):
+    from mtg import scryfall
+
+    faces = [
+        {"name": name, "mana_cost": "{R}", "type_line": "Instant", "oracle_text": ""}
+        for name in ("Fire", "Ice")]
+    write_bulk_data(data_dir, [
+        *default_cards(),
+        make_card("Pick Your Poison", collector_number="8"),
+        make_card("Pick Your Poison", set_code="alt", collector_number="9"),
+        make_card("Fire", collector_number="10"),
+        make_card("Fire // Ice", collector_number="11", layout="split", card_faces=faces),
+    ])
+    root = scryfall.publish_shared_card_index()
+    shared = scryfall.SharedCardIndex(root)
+    index = scryfall.CardIndex()
+    monkeypatch.setattr(scryfall, "_CARD_INDEX", index)
+
+    for name in ("Pick Your Poison", "Fire", "Ice", "Fire // Ice", "Shock"):
+        assert shared.find_by_name(name).id == index.find_by_name(name).id
+    shared.close()
+
+
+def test_shared_index_rebalances_dont_build_card_index(data_dir, monkeypatch):
+    from mtg import scryfall
+
+    not_alchemy = tuple(fmt for fmt in FORMATS if fmt not in ("alchemy", "historic"))
+    write_bulk_data(data_dir, [
+        *default_cards(),
+        make_card("Divide by Zero", collector_number="8", colors=("U",), legal=not_alchemy),
+        make_card(
+            "A-Divide by Zero", set_code="yon", collector_number="A-8", colors=("U",),
+            legal=("alchemy", "historic")),
+    ])
+    root = scryfall.publish_shared_card_index()
+    index = scryfall.CardIndex()
+    monkeypatch.setattr(scryfall, "_CARD_INDEX", index)
+    monkeypatch.setattr(scryfall, "_shared_card_index", None)
+    scryfall.attach_shared_card_index(root)
+
+    original = scryfall.find_by_name("Divide by Zero")
+    assert original.alchemy_rebalance.name == "A-Divide by Zero"
+    assert original.alchemy_rebalance.alchemy_rebalance_original == original
+    assert scryfall.normalize_alchemy_rebalances([original], "alchemy") == [
+        original.alchemy_rebalance]
+    assert not index.is_built
+
+
+def test_printings_index_builds_and_finds(data_dir):
+    from mtg import scryfall
+
+    source = write_bulk_data(data_dir, default_cards())
+    index = scryfall.PrintingsIndex(source)
+    assert not index.is_current
+    index.build()
+    assert index.is_current
+    assert not source.with_suffix(".tmp").exists()
+    assert index.find_by_collector_number("TST", "2").name == "Lightning Bolt"
+    index.close()
+
+
+def test_format_cards_checks_cards_unknown_locally(bulk_data_file):
+    from mtg import scryfall
+
+    bolt = scryfall.find_by_name("Lightning Bolt")
+    api_card = scryfall.Card(make_card("Counterspell", collector_number="9", colors=("U",)))
+    illegal_api_card = scryfall.Card(make_card("Shahrazad", collector_number="10", legal=()))
+    assert scryfall.format_cards(
+        "modern", [bolt, api_card, illegal_api_card]) == {bolt, api_card}
+
+
+def test_deck_legal_formats_checks_cards_unknown_locally(bulk_data_file):
+    from mtg import scryfall
+
+    bolt = scryfall.find_by_name("Lightning Bolt")
+    api_card = scryfall.Card(make_card(
+        "Counterspell", collector_number="9", colors=("U",), legal=("legacy", "vintage")))
+    banned_api_card = scryfall.Card(make_card(
+        "Mind Twist", collector_number="10",
+        legalities={**{fmt: "not_legal" for fmt in FORMATS}, "vintage": "restricted",
+                    "modern": "banned", "legacy": "legal"}))
+    assert sorted(scryfall.deck_legal_formats([api_card])) == ["legacy", "vintage"]
+    assert not scryfall.is_deck_legal_in("modern", [api_card])
+    assert sorted(scryfall.deck_legal_formats([bolt, api_card, banned_api_card])) == [
+        "legacy", "vintage"]
+    assert scryfall.deck_legal_formats([bolt, banned_api_card, banned_api_card]) == ["legacy"]
+    assert not scryfall.is_deck_legal_in("modern", [bolt, banned_api_card])
+
+
+def test_name_lookups_agree_on_canonical_names(bulk_data_file):
+    from mtg import scryfall
+
+    assert scryfall.find_by_name("  lightning   BOLT ").name == "Lightning Bolt"
+    assert scryfall.find_by_words("LIGHTNING", "bol") == {scryfall.find_by_name("Lightning Bolt")}
+    cache = scryfall.api_cache()
+    cache.put("Æther  Vial", False, None)
+    assert cache.get("aether vial") == (True, None)
+
+
+def test_only_not_found_api_responses_cached_as_misses(data_dir, monkeypatch):
+    from mtg import scryfall
+
+    status = 429
+
+    def search(*args, **kwargs):
+        raise scryfall.scrython.foundation.ScryfallError(
+            {"object": "error", "status": status}, "error")
+
+    monkeypatch.setattr(scryfall, "throttle", lambda *args: None)
+    monkeypatch.setattr(scryfall.scrython.cards, "Search", search)
+    monkeypatch.setattr(scryfall.scrython.cards, "Named", search)
+    assert scryfall.query_api_for_card("Black Lotus") is None
+    assert scryfall.api_cache().get("Black Lotus") == (False, None)
+    status = 404
+    assert scryfall.query_api_for_card("Mox Pearl") is None
+    assert scryfall.api_cache().get("Mox Pearl") == (True, None)
+
+
+def test_pool_stats_memoized_per_exact_pool(bulk_data_file):
+    from mtg import scryfall
+
+    shock, bolt = scryfall.find_by_name("Shock"), scryfall.find_by_name("Lightning Bolt")
+    assert scryfall.pool_stats([shock, bolt]) is scryfall.pool_stats([bolt, shock])
+    assert scryfall.pool_stats([shock, shock]).size == 2
+    assert scryfall.pool_stats([shock]).size == 1
+    assert scryfall.pool_stats([bolt]).rarities != scryfall.pool_stats([shock]).rarities
+
+
+def test_bulk_data_pool_stats_memoized_until_invalidated(bulk_data_file, monkeypatch):
+    from mtg import scryfall
+
+    stats = scryfall.pool_stats()
+    assert stats.size == len(scryfall.bulk_data())
+    monkeypatch.setattr(scryfall, "_fingerprint", lambda cards: 1 / 0)  # no digest pass
+    assert scryfall.pool_stats() is stats
+    scryfall._invalidate_caches()
+    assert scryfall.pool_stats() is not stats
+
+
+def test_lord_sentences_restored_from_snapshot_with_their_text(bulk_data_file, monkeypatch):
+    from mtg import scryfall
+
+    monkeypatch.setattr(scryfall, "_lord_sentences", {})
+    card = next(c for c in scryfall.bulk_data() if c.name == "Elvish Archdruid")
+    assert card.oracle_text in scryfall._lord_sentences  # registered, not parsed anew
+    [sentence] = card.lord_sentences
+    assert sentence.text == "Other Elf creatures you control get +1/+1"
+    assert (sentence.prefix, sentence.buff, sentence.suffix) == (
+        "Other Elf creatures you control", "get +1/+1", "")
+
+
+def test_shared_type_line_parses_are_immutable_and_invalidated(bulk_data_file):
+    from mtg import scryfall
+
+    elves, archdruid = (
+        scryfall.find_by_name(name) for name in ("Llanowar Elves", "Elvish Archdruid"))
+    assert elves.parse_types() is archdruid.parse_types()
+    elves.subtypes.append("Goblin")
+    assert archdruid.subtypes == ["Elf", "Druid"]
+    assert isinstance(elves.parse_types().subtypes, tuple)
+    scryfall._invalidate_caches()
+    assert not scryfall._type_lines and not scryfall._lord_sentences
+
+
+def test_interrupted_set_data_download_resumes_skipping_finished_sets(data_dir, monkeypatch):
+    from mtg import scryfall
+
+    codes = ["aaa", "bbb", "ccc", "ddd"]
+    write_bulk_data(data_dir, [
+        make_card(f"Card {code.upper()}", set_code=code, collector_number=str(i))
+        for i, code in enumerate(codes, 1)])
+    listing = {
+        code: {"code": code, "card_count": 1, "released_at": f"2024-01-0{i}"}
+        for i, code in enumerate(codes, 1)}
+
+    class Interrupted(Exception):
+        pass
+
+    fetched, interrupt_at = [], "ccc"
+
+    def api_get(url: str) -> dict:
+        if url == f"{scryfall.API_URL}/sets":
+            return {"data": [*listing.values()], "has_more": False}
+        code = url.rsplit("/", 1)[-1]
+        if code == interrupt_at:
+            raise Interrupted
+        fetched.append(code)
+        return {**listing[code], "name": f"Set {code.upper()}"}
+
+    monkeypatch.setattr(scryfall, "_api_get", api_get)
+    dst = data_dir / scryfall.SETS_FILENAME
+    try:
+        scryfall.download_scryfall_set_data(max_workers=1, interval=0)
+    except Interrupted:
+        pass
+    assert not dst.exists()
+    assert sorted(scryfall._read_sets_checkpoint(
+        data_dir / scryfall.SETS_CHECKPOINT_FILENAME)) == ["aaa", "bbb"]
+
+    fetched.clear()
+    interrupt_at = None
+    scryfall.download_scryfall_set_data(max_workers=1, interval=0)
+    assert fetched == ["ccc", "ddd"]
+    assert not (data_dir / scryfall.SETS_CHECKPOINT_FILENAME).exists()
+    resumed = dst.read_text(encoding="utf-8")
+
+    dst.unlink()
+    scryfall.download_scryfall_set_data(max_workers=1, interval=0)
+    assert dst.read_text(encoding="utf-8") == resumed
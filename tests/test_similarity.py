@@ -0,0 +1,125 @@
+"""
+
+    tests.test_similarity
+    ~~~~~~~~~~~~~~~~~~~~~
+    Tests of near-duplicate decklists detection.
+
+    @author: mazz3rr
+
+"""
+import itertools
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from mtg.deck.similarity import DeckSimilarityIndex, decklist_shingles
+
+BASE = ["4 Shock", "4 Lightning Bolt", "4 Opt", "4 Llanowar Elves", "20 Forest", "20 Mountain"]
+CONTROL = ["4 Counterspell", "4 Brainstorm", "52 Island"]
+DECKLISTS = {
+    "a": "\n".join(["Deck", *BASE]),
+    "b": "\n".join(["Deck", *BASE[:-1], "19 Mountain", "1 Island"]),
+    "c": "\n".join(["Deck", *CONTROL]),
+    "d": "\n".join(["Deck", *BASE, "", "Sideboard", "2 Opt"]),
+}
+MORE_DECKLISTS = {
+    "e": "\n".join(["Deck", *CONTROL[:-1], "50 Island", "2 Opt"]),
+    "f": "\n".join(["Deck", *BASE[:-1], "20 Island"]),
+}
+# exact Jaccard similarities of shingles (as counted by hand)
+JACCARD = {
+    ("a", "b"): 55 / 57, ("a", "d"): 56 / 58, ("b", "d"): 55 / 59, ("c", "e"): 58 / 62,
+    ("a", "f"): 36 / 76, ("a", "c"): 0.0,
+}
+
+
+def test_removal_leaves_the_index_as_if_never_added(tmp_path):
+    index = DeckSimilarityIndex()
+    index.update(DECKLISTS)
+
+    assert index.remove("a")
+    assert not index.remove("a")
+    fresh = DeckSimilarityIndex()
+    fresh.update({k: v for k, v in DECKLISTS.items() if k != "a"})
+    assert len(index) == 3 and "a" not in index
+    assert sorted(index.keys) == sorted(fresh.keys)
+    assert index.clusters() == fresh.clusters()
+    assert index.similar(DECKLISTS["a"]) == fresh.similar(DECKLISTS["a"])
+    assert index.similarity("b", "d") == fresh.similarity("b", "d")
+
+    index.save(tmp_path / "index.npz")
+    loaded = DeckSimilarityIndex.load(tmp_path / "index.npz")
+    assert loaded.clusters() == fresh.clusters()
+    for key in [*DECKLISTS]:
+        index.remove(key)
+    assert len(index) == 0 and index.similar(DECKLISTS["b"], threshold=0) == []
+
+
+def _jaccard(decklist: str, other: str) -> float:
+    shingles, other_shingles = decklist_shingles(decklist), decklist_shingles(other)
+    return len(shingles & other_shingles) / len(shingles | other_shingles)
+
+
+def test_estimates_follow_exact_jaccard_similarity():
+    decklists = {**DECKLISTS, **MORE_DECKLISTS}
+    index = DeckSimilarityIndex()
+    index.update(decklists)
+
+    for (key, other), expected in JACCARD.items():
+        assert _jaccard(decklists[key], decklists[other]) == pytest.approx(expected)
+    for key, other in itertools.combinations(decklists, 2):
+        expected = _jaccard(decklists[key], decklists[other])
+        assert index.similarity(key, other) == pytest.approx(expected, abs=0.1)
+
+
+def test_similar_filters_by_threshold():
+    index = DeckSimilarityIndex()
+    index.update({**DECKLISTS, **MORE_DECKLISTS})
+
+    results = index.similar("a", threshold=0.9)
+    assert [key for key, _ in results] == ["d", "b"]
+    assert all(sim >= 0.9 for _, sim in results)
+    assert [key for key, _ in index.similar("a", threshold=0.4)] == ["d", "b", "f"]
+    assert index.similar(DECKLISTS["a"], threshold=0.9) == [("a", 1.0), *results]
+    assert index.similar("a", threshold=0.9, limit=1) == results[:1]
+    assert index.similar("c", threshold=0.99) == []
+
+
+def test_clusters_merge_near_duplicates_across_buckets():
+    index = DeckSimilarityIndex()
+    index.update({**DECKLISTS, **MORE_DECKLISTS})
+
+    assert index.clusters() == [["a", "b", "d"], ["c", "e"]]
+    assert index.clusters(min_size=3) == [["a", "b", "d"]]
+    assert index.clusters(min_size=1) == [["a", "b", "d"], ["c", "e"], ["f"]]
+    assert index.clusters(threshold=0.95) == [["a", "b", "d"]]
+    assert index.clusters(threshold=0.99) == []
+
+
+def test_dump_skips_near_duplicates_above_threshold(bulk_data_file):
+    pytest.importorskip("pytubefix")
+    from conftest import write_sets_data
+    from mtg.deck.arena import ArenaParser
+    from mtg.yt.data.dump import _dump_data_gen
+
+    write_sets_data(bulk_data_file.parent, "tst")
+    decklist = (
+        "Deck\n4 Shock\n4 Lightning Bolt\n3 Opt\n4 Llanowar Elves\n4 Elvish Archdruid\n"
+        "41 Forest\n\nSideboard\n1 Opt\n")
+    decklists = [
+        decklist,
+        decklist.replace("4 Shock", "3 Shock").replace("41 Forest", "42 Forest"),  # ~0.97
+        "Deck\n4 Shock\n1 Lightning Bolt\n1 Opt\n1 Llanowar Elves\n3 Elvish Archdruid\n"
+        "50 Forest\n",  # ~0.73
+    ]
+    decks = [ArenaParser(d).parse() for d in decklists]
+    video = SimpleNamespace(url="https://www.youtube.com/watch?v=test", decks=[
+        SimpleNamespace(metadata={}, fingerprint=str(i), deck=lambda deck=deck: deck)
+        for i, deck in enumerate(decks)])
+    channels = [SimpleNamespace(title="Test", id="test", videos=[video])]
+
+    dumped = [exporter is not None for exporter, _ in _dump_data_gen(channels, Path("."), 0.9)]
+    assert dumped == [True, False, True]
+    dumped = [exporter is not None for exporter, _ in _dump_data_gen(channels, Path("."))]
+    assert dumped == [True, True, True]